@@ -0,0 +1,68 @@
+# ==============================================================================
+# BAŞLIK AYRIŞTIRICI MİKRO KIYASLAMASI
+# Eski (desen başına bir `re.finditer`) ayrıştırıcı ile derlenmiş tek geçişli
+# HeaderMatcher'ı büyük sentetik metinler üzerinde karşılaştırır.
+#
+#   python benchmarks/bench_headers.py --sizes 20 80 200 --repeat 5
+# ==============================================================================
+import argparse
+import os
+import re
+import sys
+import timeit
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator import TubitakFormValidator
+
+def legacy_parse_document_sections(validator: TubitakFormValidator, text: str) -> Dict[str, str]:
+    """Değişiklik öncesi ayrıştırıcının birebir kopyası (normalize edilmiş metindeki konumlarla özgün metni keser)."""
+    normalized_text = validator._normalize_text(text)
+    sections = {key: "" for key in validator.MAIN_PATTERNS.keys()}
+    found_headers = []
+    for key, pattern in validator.MAIN_PATTERNS.items():
+        for match in re.finditer(r"^\s*" + pattern, normalized_text, re.IGNORECASE | re.MULTILINE):
+            found_headers.append({'key': key, 'start': match.start(), 'end': match.end()})
+    if not found_headers: return sections
+    found_headers.sort(key=lambda x: x['start'])
+    for i, header in enumerate(found_headers):
+        content_start = header['end']
+        content_end = found_headers[i + 1]['start'] if i + 1 < len(found_headers) else len(text)
+        sections[header['key']] = text[content_start:content_end].strip()
+    return sections
+
+HEADERS = [
+    "A. GENEL BİLGİLER", "ÖZET", "1. ÖZGÜN DEĞER", "1.2. Amaç ve Hedefler", "2. YÖNTEM", "İŞ-ZAMAN ÇİZELGESİ",
+    "RİSK YÖNETİMİ TABLOSU", "3.3. Araştırma Olanakları", "4. YAYGIN ETKİ", "5. BÜTÇE TALEP ÇİZELGESİ",
+    "6. BELİRTMEK İSTEDİĞİNİZ DİĞER KONULAR", "EK-1: KAYNAKLAR", "7. EKLER",
+]
+BODY_LINE = "Bu  çalışmada   deneysel ve sayısal yöntemler birlikte kullanılacaktır [1, 2] ve sonuçlar karşılaştırılacaktır."
+
+def synthetic_text(pages: int, lines_per_page: int = 45) -> str:
+    lines_per_section = max(1, pages * lines_per_page // len(HEADERS))
+    parts = []
+    for header in HEADERS:
+        parts.append(header)
+        parts.extend([BODY_LINE] * lines_per_section)
+        parts.append("")
+    return "\n".join(parts)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eski ve derlenmiş başlık ayrıştırıcılarını karşılaştırır.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 80, 200], help="Sayfa cinsinden metin boyutları")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    validator = TubitakFormValidator()
+    print(f"{'sayfa':>6} {'karakter':>10} {'eski (ms)':>10} {'yeni (ms)':>10} {'hızlanma':>9}")
+    for pages in args.sizes:
+        text = synthetic_text(pages)
+        legacy = min(timeit.repeat(lambda: legacy_parse_document_sections(validator, text), number=1, repeat=args.repeat))
+        current = min(timeit.repeat(lambda: validator.parse_document_sections(text), number=1, repeat=args.repeat))
+        found_legacy = {k for k, v in legacy_parse_document_sections(validator, text).items() if v}
+        found_current = {k for k, v in validator.parse_document_sections(text).items() if v}
+        assert found_legacy == found_current, (found_legacy ^ found_current)
+        print(f"{pages:>6} {len(text):>10} {legacy * 1000:>10.2f} {current * 1000:>10.2f} {legacy / current:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# ==============================================================================
+# DOĞRULAMA HATTI KIYASLAMASI
+# Sentetik önerilerde (benchmarks/synthetic.py) her aşamayı ve uçtan uca doğrulamayı
+# ölçer, sonuçları makinece okunabilir bir JSON taban çizgisine yazar veya mevcut
+# taban çizgisiyle karşılaştırıp gerilemeleri raporlar.
+#
+#   python benchmarks/bench_pipeline.py --output benchmarks/baseline.json
+#   python benchmarks/bench_pipeline.py --compare benchmarks/baseline.json --tolerance 0.25
+#
+# Taban çizgisi başka bir RULESET_VERSION ile kaydedildiyse karşılaştırma yapılmaz (çıkış kodu 2).
+# Süreler makineye bağlıdır: depodaki baseline.json yalnızca kaydedildiği ortamı (environment alanı)
+# gösterir. Gerileme ölçmeden önce taban çizgisini aynı makinede --output ile yeniden üretin;
+# farklı bir makinede kaydedilmiş taban çizgisiyle karşılaştırma anlamlı değildir (uyarı verilir).
+# ==============================================================================
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fitz  # PyMuPDF
+from validator import (TubitakFormValidator, DocumentIndex, PageExtractionCache, RULESET_VERSION, format_results_for_download,
+                       format_results_as_json, format_results_as_csv)
+from synthetic import ProposalSpec, generate_proposal
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = [5, 20, 50, 100, 200]
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Bir çağrının süresini ölçer. Kısa süren aşamalarda tur başına çağrı sayısı `timeit` ile otomatik seçilir."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = [total / number * 1000 for total in timer.repeat(repeat=repeat, number=number)]
+    return {"median_ms": round(statistics.median(per_call), 4), "min_ms": round(min(per_call), 4), "number": number, "repeat": repeat}
+
+def bench_document(validator: TubitakFormValidator, pdf_bytes: bytes, repeat: int, revised_bytes: Optional[bytes] = None) -> Dict[str, Dict[str, float]]:
+    document = validator.extract_document(pdf_bytes)
+    sections = validator.parse_document_sections(document.text, document.spans)
+    results = validator.validate_extracted(document)
+    stages = {
+        "extract_text_from_pdf_bytes": lambda: validator.extract_text_from_pdf_bytes(pdf_bytes),
+        "extract_document": lambda: validator.extract_document(pdf_bytes),
+        "parse_document_sections": lambda: validator.parse_document_sections(document.text, document.spans),
+        "validate_formatting": lambda: validator.validate_formatting(document),
+    }
+    # Bölüm indeksi tembel hesaplandığı için her çağrıda yeniden kurulur; ölçülen süre ilk çağrının maliyetidir.
+    for key, validate in validator._section_validators().items():
+        stages[f"validate_{key}"] = lambda validate=validate, key=key: validate(sections[key], DocumentIndex(sections))
+    stages["format_results_for_download"] = lambda: format_results_for_download(results)
+    stages["format_results_as_json"] = lambda: format_results_as_json(results)
+    stages["format_results_as_csv"] = lambda: format_results_as_csv(results)
+    stages["end_to_end"] = lambda: validator.validate_document(pdf_bytes)
+    stages["end_to_end_streaming"] = lambda: list(validator.iter_validate_document(pdf_bytes))
+    if revised_bytes is not None:
+        # Tek bölümü değişmiş revizyon: sayfa önbelleği ve önceki sürüm hazırken artımlı doğrulama.
+        incremental = TubitakFormValidator(page_cache=PageExtractionCache())
+        revisions = []
+        list(incremental.iter_validate_revision(pdf_bytes, None, revisions.append))
+        stages["end_to_end_revision"] = lambda: list(incremental.iter_validate_revision(revised_bytes, revisions[0]))
+    return {name: measure(fn, repeat) for name, fn in stages.items()}
+
+# Taban çizgisinin hangi makinede kaydedildiğini gösteren, karşılaştırmada eşleşmesi beklenen alanlar.
+MACHINE_KEYS = ("python_implementation", "python", "machine", "cpu_model", "cpu_count", "pymupdf")
+
+def cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"): return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "bilinmiyor"
+
+def environment() -> Dict[str, object]:
+    return {"python_implementation": platform.python_implementation(), "python": platform.python_version(),
+            "platform": platform.platform(), "machine": platform.machine(), "cpu_model": cpu_model(), "cpu_count": os.cpu_count(),
+            "pymupdf": fitz.VersionBind, "ruleset_version": RULESET_VERSION}
+
+def run(sizes: List[int], spec: ProposalSpec, repeat: int) -> Dict[str, object]:
+    validator = TubitakFormValidator()  # Sonuç önbelleği yok; her ölçüm gerçek işi yapar.
+    documents = {}
+    for pages in sizes:
+        pdf_bytes = generate_proposal(ProposalSpec(pages, spec.spans_per_page, spec.citations, spec.budget_rows, spec.malformed, spec.seed))
+        revised_bytes = generate_proposal(ProposalSpec(pages, spec.spans_per_page, spec.citations, spec.budget_rows, (*spec.malformed, "butce"), spec.seed))
+        stages = bench_document(validator, pdf_bytes, repeat, revised_bytes)
+        documents[str(pages)] = {"pages": validator.extract_page_count(pdf_bytes), "bytes": len(pdf_bytes), "stages": stages}
+        print(f"{pages:>4} sayfa: uçtan uca {stages['end_to_end']['median_ms']:.1f} ms", file=sys.stderr)
+    return {"schema": SCHEMA_VERSION, "created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "environment": environment(),
+            "spec": {"spans_per_page": spec.spans_per_page, "citations": spec.citations, "budget_rows": spec.budget_rows,
+                     "malformed": list(spec.malformed), "seed": spec.seed},
+            "documents": documents}
+
+def compare(current: Dict, baseline: Dict, tolerance: float, min_ms: float) -> List[str]:
+    """Medyanı taban çizgisinden `tolerance` oranından ve `min_ms`'ten fazla yavaşlayan aşamaları döndürür."""
+    regressions = []
+    for size, document in current["documents"].items():
+        old_document = baseline.get("documents", {}).get(size)
+        if old_document is None: continue
+        for stage, timing in document["stages"].items():
+            old = old_document["stages"].get(stage)
+            if old is None: continue
+            new_ms, old_ms = timing["median_ms"], old["median_ms"]
+            if new_ms > old_ms * (1 + tolerance) and new_ms - old_ms > min_ms:
+                regressions.append(f"{size} sayfa / {stage}: {old_ms:.3f} ms -> {new_ms:.3f} ms (+%{(new_ms / old_ms - 1) * 100:.0f})")
+    return regressions
+
+def print_table(report: Dict, baseline: Optional[Dict] = None):
+    for size, document in report["documents"].items():
+        old_stages = (baseline or {}).get("documents", {}).get(size, {}).get("stages", {})
+        print(f"\n{size} sayfa ({document['pages']} sayfa, {document['bytes']} bayt)")
+        print(f"  {'aşama':<34} {'medyan (ms)':>12} {'en iyi (ms)':>12} {'taban (ms)':>11}")
+        for stage, timing in document["stages"].items():
+            old = old_stages.get(stage, {}).get("median_ms")
+            print(f"  {stage:<34} {timing['median_ms']:>12.3f} {timing['min_ms']:>12.3f} {'' if old is None else f'{old:.3f}':>11}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Doğrulama hattını sentetik önerilerle ölçer ve taban çizgisiyle karşılaştırır.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Sayfa sayıları")
+    parser.add_argument("--repeat", type=int, default=5, help="Her aşama için tekrar sayısı (medyan alınır)")
+    parser.add_argument("--spans-per-page", type=int, default=ProposalSpec.spans_per_page)
+    parser.add_argument("--citations", type=int, default=ProposalSpec.citations)
+    parser.add_argument("--budget-rows", type=int, default=ProposalSpec.budget_rows)
+    parser.add_argument("--malformed", nargs="*", default=[], help="İçeriği kuralları ihlal edecek bölüm anahtarları")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası (yeni taban çizgisi)")
+    parser.add_argument("--compare", help="Karşılaştırılacak taban çizgisi JSON dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="İzin verilen göreli yavaşlama (0.25 = %%25)")
+    parser.add_argument("--min-ms", type=float, default=0.5, help="Bundan küçük mutlak farklar gerileme sayılmaz")
+    parser.add_argument("--allow-ruleset-mismatch", action="store_true",
+                        help="Taban çizgisi başka bir kural sürümünde kaydedildiyse yine de karşılaştır (yalnızca uyarı ver)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f: baseline = json.load(f)
+        # Kurallar değişince aşamaların yaptığı iş de değişir; eski sürümde kaydedilmiş süreler gerileme ölçütü olamaz.
+        baseline_ruleset = baseline.get("environment", {}).get("ruleset_version")
+        if baseline_ruleset != RULESET_VERSION:
+            print(f"Taban çizgisi {baseline_ruleset} kural sürümünde kaydedilmiş, ağaç {RULESET_VERSION} sürümünde. "
+                  f"Taban çizgisini --output ile yeniden üretin.", file=sys.stderr)
+            if not args.allow_ruleset_mismatch: return 2
+        recorded, current = baseline.get("environment", {}), environment()
+        differing = [key for key in MACHINE_KEYS if recorded.get(key) != current[key]]
+        if differing:
+            print("Uyarı: taban çizgisi başka bir ortamda kaydedilmiş (" + ", ".join(f"{key}: {recorded.get(key)} → {current[key]}" for key in differing)
+                  + "). Süreler karşılaştırılabilir değil; taban çizgisini bu makinede --output ile yeniden üretin.", file=sys.stderr)
+
+    spec = ProposalSpec(spans_per_page=args.spans_per_page, citations=args.citations, budget_rows=args.budget_rows, malformed=tuple(args.malformed))
+    started = time.perf_counter()
+    report = run(args.sizes, spec, max(args.repeat, 1))
+    print_table(report, baseline)
+    print(f"\nToplam süre: {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2); f.write("\n")
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance, args.min_ms)
+        if regressions:
+            print("\nGerileme tespit edildi:", file=sys.stderr)
+            for line in regressions: print(f"  {line}", file=sys.stderr)
+            return 1
+        print("\nTaban çizgisine göre gerileme yok.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
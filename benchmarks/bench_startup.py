@@ -0,0 +1,93 @@
+# ==============================================================================
+# SOĞUK BAŞLANGIÇ KIYASLAMASI
+# Her ölçüm yeni bir yorumlayıcıda yapılır: modüllerin içe aktarma süreleri, validator/app
+# yüklenirken ağır PDF kütüphanelerinin çekilip çekilmediği ve yalıtılmış yürütücüde ilk
+# belgenin ısınmalı/ısınmasız ilk sonuç süresi.
+#
+#   python benchmarks/bench_startup.py --repeat 5 --output startup.json
+# ==============================================================================
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODULES = ["fitz", "pdfplumber", "PIL.Image", "streamlit", "validator", "app"]
+HEAVY = ["fitz", "pdfplumber", "PIL.Image"]
+
+_IMPORT_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_FIRST_RESULT_PROBE = """
+import sys, time, json
+sys.path.insert(0, {benchmarks!r})
+from validator import TubitakFormValidator, ValidationExecutor
+from synthetic import ProposalSpec, generate_proposal
+pdf_bytes = generate_proposal(ProposalSpec(pages={pages}))
+executor = ValidationExecutor(TubitakFormValidator(), max_concurrent=1)
+if {warm}:
+    executor.warm_up()
+    time.sleep({settle})  # Kullanıcının dosya seçip yüklediği süre.
+started = time.perf_counter()
+next(iter(executor.iter_validate(pdf_bytes)))
+first = time.perf_counter() - started
+executor.shutdown()
+print(json.dumps({{"seconds": first}}))
+"""
+
+def _probe(code: str) -> Dict:
+    # Ölçülen süreçte uyarılar (ör. fitz kullanımdan kaldırma uyarısı) stderr'e gider; son stdout satırı sonuçtur.
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def measure_import(module: str, repeat: int) -> Optional[Dict[str, object]]:
+    runs = []
+    for _ in range(repeat):
+        try: runs.append(_probe(_IMPORT_PROBE.format(module=module, heavy=HEAVY)))
+        except subprocess.CalledProcessError: return None  # Kurulu değil.
+    seconds = [run["seconds"] * 1000 for run in runs]
+    return {"median_ms": round(statistics.median(seconds), 1), "min_ms": round(min(seconds), 1), "heavy_loaded": runs[0]["loaded"]}
+
+def measure_first_result(warm: bool, repeat: int, pages: int, settle: float) -> Dict[str, float]:
+    code = _FIRST_RESULT_PROBE.format(benchmarks=os.path.join(ROOT, "benchmarks"), pages=pages, warm=warm, settle=settle)
+    seconds = [_probe(code)["seconds"] * 1000 for _ in range(repeat)]
+    return {"median_ms": round(statistics.median(seconds), 1), "min_ms": round(min(seconds), 1)}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="İçe aktarma sürelerini ve ısınmalı/ısınmasız ilk sonuç süresini ölçer.")
+    parser.add_argument("--repeat", type=int, default=5, help="Her ölçüm için yeni yorumlayıcı sayısı (medyan alınır)")
+    parser.add_argument("--pages", type=int, default=5, help="İlk sonuç ölçümündeki sentetik önerinin sayfa sayısı")
+    parser.add_argument("--settle", type=float, default=3.0, help="Isınmadan sonra ilk belgeye kadar beklenen süre (saniye)")
+    parser.add_argument("-o", "--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+    repeat = max(args.repeat, 1)
+
+    report = {"python": sys.version.split()[0], "imports": {}, "first_result": {}}
+    print(f"{'modül':<12} {'medyan (ms)':>12} {'en iyi (ms)':>12}  yüklenen ağır kütüphaneler")
+    for module in MODULES:
+        timing = measure_import(module, repeat)
+        report["imports"][module] = timing
+        if timing is None: print(f"{module:<12} {'kurulu değil':>12}"); continue
+        print(f"{module:<12} {timing['median_ms']:>12.1f} {timing['min_ms']:>12.1f}  {', '.join(timing['heavy_loaded']) or '-'}")
+    for label, warm in (("cold", False), ("warm", True)):
+        timing = measure_first_result(warm, repeat, args.pages, args.settle)
+        report["first_result"][label] = timing
+        print(f"ilk sonuç ({'ısınmalı' if warm else 'ısınmasız'}): {timing['median_ms']:.1f} ms (en iyi {timing['min_ms']:.1f} ms)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2); f.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
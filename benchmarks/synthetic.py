@@ -0,0 +1,199 @@
+# ==============================================================================
+# SENTETİK 2209-A PROJE ÖNERİSİ ÜRETECİ
+# PyMuPDF ile `MAIN_PATTERNS` başlıklarını izleyen, boyutu ve kusurları ayarlanabilir
+# PDF'ler üretir. Kıyaslamalar ve elle deneme için ağ bağlantısı gerektirmez.
+#
+#   python benchmarks/synthetic.py --pages 40 --spans-per-page 50 --citations 30 -o oneri.pdf
+#   python benchmarks/synthetic.py --pages 10 --malformed butce ozet -o kusurlu.pdf
+# ==============================================================================
+import argparse
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import fitz  # PyMuPDF
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 (pt)
+MARGIN_X, MARGIN_TOP, MARGIN_BOTTOM = 50, 50, 50
+BODY_FONT_SIZE, HEADER_FONT_SIZE = 9, 11
+# Tablo satırlarında hücreler "\t" ile ayrılır; sütun genişlikleri bu ağırlıklarla paylaştırılır.
+TABLE_COLUMN_WEIGHTS = (0.7, 3.0, 1.4, 1.4)
+
+# Kurallarla uyumlu bölümlerde kullanılan başlıklar (belgedeki sırayla). "ekler" dolgu metni taşır ve
+# "kaynaklar" belgenin son bölümüdür; böylece kaynak listesi belge sonuna kadar uzanır.
+SECTION_HEADERS: List[Tuple[str, str]] = [
+    ("genel_bilgiler", "A. GENEL BİLGİLER"), ("ozet", "ÖZET"), ("ozgun_deger", "1. ÖZGÜN DEĞER"),
+    ("amac_ve_hedefler", "1.2. Amaç ve Hedefler"), ("yontem", "2. YÖNTEM"), ("is_zaman_cizelgesi", "İŞ-ZAMAN ÇİZELGESİ"),
+    ("risk_yonetimi", "RİSK YÖNETİMİ TABLOSU"), ("arastirma_olanaklari", "3.3. Araştırma Olanakları"),
+    ("yaygin_etki", "4. YAYGIN ETKİ"), ("butce", "5. BÜTÇE TALEP ÇİZELGESİ"),
+    ("diger_konular", "6. BELİRTMEK İSTEDİĞİNİZ DİĞER KONULAR"), ("ekler", "7. EKLER"), ("kaynaklar", "EK-1: KAYNAKLAR"),
+]
+# Sayfa sayısını tutturmak için eklenen dolgu satırlarının bölümlere dağılım ağırlıkları.
+FILLER_WEIGHTS = {"ozgun_deger": 4, "yontem": 4, "arastirma_olanaklari": 1, "ekler": 1}
+
+VOCABULARY = (
+    "çalışma deney simülasyon malzeme yöntem analiz ölçüm örnek sıcaklık yüzey kırılma gerilme veri model "
+    "algoritma yazılım doğrulama karşılaştırma literatür eksiklik özgün katkı performans güvenilirlik çözüm "
+    "ağ öğrenme istatistik örneklem anket deneyimsel sayısal değişken parametre hipotez sonuç değerlendirme "
+    "geliştirme tasarım üretim karakterizasyon spektroskopi mikroskop kalibrasyon hata belirsizlik süreç"
+).split()
+
+@dataclass
+class ProposalSpec:
+    """Üretilecek belgenin boyut ve içerik ayarları.
+
+    `pages` hedef sayfa sayısıdır; zorunlu içerik hedefi aşarsa belge daha uzun olur. `spans_per_page` her sayfadaki
+    satır (dolayısıyla PyMuPDF span) sayısıdır. `malformed`, içeriği kuralları ihlal edecek şekilde yazılan bölüm
+    anahtarlarıdır (ör. "butce": limit aşımı ve yasaklı kalemler, "ozet": kısa ve anahtar kelimesiz). `tables` açıksa
+    bütçe ve iş-zaman çizelgesi, Word çıktılarındaki gibi çizgili tablo olarak yazılır.
+    """
+    pages: int = 10
+    spans_per_page: int = 45
+    citations: int = 20
+    budget_rows: int = 6
+    malformed: Tuple[str, ...] = ()
+    seed: int = 2209
+    tables: bool = False
+
+def _sentence(rng: random.Random, words: int = 10) -> str:
+    text = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+def _amount(value: float) -> str:
+    whole, frac = f"{value:.2f}".split(".")
+    groups = []
+    while whole:
+        groups.insert(0, whole[-3:]); whole = whole[:-3]
+    return f"{'.'.join(groups)},{frac} TL"
+
+def _section_body(key: str, spec: ProposalSpec, rng: random.Random) -> List[str]:
+    """Bölümün dolgu dışındaki zorunlu satırları."""
+    bad = key in spec.malformed
+    reference_count = max(3, (spec.citations + 1) // 2)
+    if key == "genel_bilgiler":
+        return ["Başvuru Sahibinin Adı Soyadı: Elif Yıldırım",
+                "Araştırma Önerisinin Başlığı: Gözenekli malzemelerde ısıl iletkenliğin sayısal ve deneysel incelenmesi",
+                "Danışmanın Adı Soyadı: " + ("Prof. Dr. Ahmet Çelik ve Doç. Dr. Ayşe Şahin" if bad else "Ahmet Çelik"),
+                "Araştırmanın Yürütüleceği Kurum/Kuruluş: " + ("Mühendislik Fakültesi Makine Bölümü" if bad else "Orta Doğu Teknik Üniversitesi")]
+    if key == "ozet":
+        if bad: return [_sentence(rng, 8), _sentence(rng, 8)]
+        return [_sentence(rng, 12) for _ in range(12)] + ["Anahtar Kelimeler: ısıl iletkenlik, gözenekli malzeme, sonlu elemanlar, deney"]
+    if key == "ozgun_deger":
+        if bad: return [_sentence(rng) for _ in range(3)]
+        # Atıflar satırlara dağıtılır; numaralar kaynak listesindeki girdilere karşılık gelir.
+        lines, number = [], 0
+        for i in range(spec.citations):
+            number = number % reference_count + 1
+            lines.append(_sentence(rng, 9)[:-1] + (f" [{number}, {number % reference_count + 1}]." if i % 4 == 3 else f" [{number}]."))
+        return lines
+    if key == "amac_ve_hedefler":
+        if bad: return [_sentence(rng), "● " + _sentence(rng, 6)]
+        return ["Projenin amacı gözenekli yapıların ısıl davranışını öngören doğrulanmış bir model geliştirmektir."] + \
+               ["● " + _sentence(rng, 7) for _ in range(4)]
+    if key == "yontem":
+        return [_sentence(rng) for _ in range(3)] if bad else [_sentence(rng, 12) + " [1]" for _ in range(18)]
+    if key == "is_zaman_cizelgesi" and spec.tables:
+        header = "İP No\tİş Paketinin Adı\tZaman Aralığı (Ay)\tSorumlu"
+        if bad: return [header, "İP1\tLiteratür tarama\t1-2\tBursiyer", "İP2\tMalzeme temini\t3\tBursiyer", "İP3\tRapor yazımı\t11-14\tBursiyer"]
+        return [header, "İP1\tNumune üretimi ve karakterizasyon\t1-3\tBursiyer", "İP2\tSonlu elemanlar modelinin kurulması\t3-6\tBursiyer",
+                "İP3\tDeneysel doğrulama ve ölçüm\t6-10\tBursiyer ve danışman", "İP4\tBulguların karşılaştırılması\t10-12\tBursiyer"]
+    if key == "is_zaman_cizelgesi":
+        if bad: return ["İP1 Literatür tarama 1-2 ay", "İP2 Malzeme temini 3 ay", "İP3 Rapor yazımı 12 ay"]
+        return ["İP1 Numune üretimi ve karakterizasyon 1-3 ay", "İP2 Sonlu elemanlar modelinin kurulması 3-6 ay",
+                "İP3 Deneysel doğrulama ve ölçüm 6-10 ay", "İP4 Bulguların karşılaştırılması 10-12 ay"]
+    if key == "risk_yonetimi":
+        if bad: return ["Cihaz arızası olabilir."]
+        return ["İP1 riski: numune üretiminde gecikme. B planı: hazır ticari numuneler kullanılır ve takvim iki hafta kaydırılır.",
+                "İP3 riski: ölçüm cihazına erişim kısıtı. B planı: ortak laboratuvardaki eşdeğer cihaz kullanılır."]
+    if key == "arastirma_olanaklari":
+        return ["Bölüm laboratuvarında ısıl analiz düzeneği ve hesaplama sunucusu mevcuttur."]
+    if key == "yaygin_etki":
+        if bad: return ["Sonuçlar paylaşılacaktır."]
+        return ["Proje sonunda ulusal bir konferansta bildiri sunulması ve hakemli bir dergide makale yayımlanması hedeflenmektedir.",
+                "Bulgular danışmanın yürüttüğü yüksek lisans tez çalışmalarına da girdi sağlayacaktır."]
+    if key == "butce":
+        rows = max(spec.budget_rows, 1)
+        per_row = (12000.0 if bad else 8400.0) / rows
+        lines = [f"Sarf malzeme kalemi {i + 1} {_amount(per_row)}" for i in range(rows)]
+        if bad: lines[:2] = [f"Dizüstü bilgisayar {_amount(per_row)}", f"Tablet {_amount(per_row)}"][:rows]
+        if spec.tables:
+            # Birim fiyat sütunu da tutar içerir; toplam yalnızca "Toplam (TL)" sütunundan okunmalıdır.
+            lines = [f"{i + 1}\t{line.rsplit(' ', 2)[0]}\t{_amount(per_row / 2)}\t{_amount(per_row)}" for i, line in enumerate(lines)]
+            return ["No\tBütçe Kalemi (2 adet)\tBirim Fiyat (TL)\tToplam (TL)"] + lines + [f"\tTOPLAM\t\t{_amount(per_row * rows)}"]
+        return ["Kalem Adı Tutar"] + lines + [f"TOPLAM {_amount(per_row * rows)}"]
+    if key == "diger_konular":
+        return ["Belirtilecek başka bir konu bulunmamaktadır."]
+    if key == "ekler":
+        return []
+    if key == "kaynaklar":
+        count = 2 if bad else reference_count
+        return [f"[{n}] Yazar {n}, A. ({2010 + n % 15}). {_sentence(rng, 6)} Dergi Adı, {n}(2), {n * 10}-{n * 10 + 9}."
+                for n in range(1, count + 1)]
+    return []
+
+def build_lines(spec: ProposalSpec) -> List[Tuple[str, bool]]:
+    """Belgenin tüm satırlarını `(metin, başlık_mı)` olarak döndürür."""
+    rng = random.Random(spec.seed)
+    bodies = {key: _section_body(key, spec, rng) for key, _ in SECTION_HEADERS}
+    fixed = sum(len(body) + 1 for body in bodies.values())
+    filler = max(0, spec.pages * spec.spans_per_page - fixed)
+    weight_total = sum(FILLER_WEIGHTS.values())
+    # Kusurlu (kısa tutulması gereken) bölümlerin dolgu payı eklere aktarılır.
+    shares = {key: filler * weight // weight_total for key, weight in FILLER_WEIGHTS.items()}
+    for key in ("ozgun_deger", "yontem"):
+        if key in spec.malformed: shares["ekler"] += shares.pop(key)
+    lines: List[Tuple[str, bool]] = []
+    for key, header in SECTION_HEADERS:
+        lines.append((header, True))
+        lines.extend((text, False) for text in bodies[key])
+        lines.extend((_sentence(rng, 11), False) for _ in range(shares.get(key, 0)))
+    return lines
+
+def generate_proposal(spec: ProposalSpec = ProposalSpec()) -> bytes:
+    """`spec` ayarlarıyla bir 2209-A proje önerisi PDF'i üretir. Başlıklar kalın ve büyük, gövde Helvetica 9 puntodur."""
+    body_font, header_font = fitz.Font("helv"), fitz.Font("hebo")
+    spans_per_page = max(spec.spans_per_page, 1)
+    leading = min(12.0, (PAGE_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM) / spans_per_page)
+    lines = build_lines(spec)
+    with fitz.open() as doc:
+        for first in range(0, len(lines), spans_per_page):
+            page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            writer = fitz.TextWriter(page.rect)
+            cells = []
+            y = MARGIN_TOP
+            for text, is_header in lines[first:first + spans_per_page]:
+                font, size = (header_font, HEADER_FONT_SIZE) if is_header else (body_font, BODY_FONT_SIZE)
+                if "\t" in text:
+                    x = MARGIN_X
+                    for cell, weight in zip(text.split("\t"), TABLE_COLUMN_WEIGHTS):
+                        width = (PAGE_WIDTH - 2 * MARGIN_X) * weight / sum(TABLE_COLUMN_WEIGHTS)
+                        if cell: writer.append((x + 3, y), cell, font=font, fontsize=size)
+                        cells.append(fitz.Rect(x, y - leading + 3, x + width, y + 3))
+                        x += width
+                else:
+                    writer.append((MARGIN_X, y), text, font=font, fontsize=size)
+                y += leading
+            writer.write_text(page)
+            for rect in cells: page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+        doc.subset_fonts()
+        return doc.tobytes(garbage=3, deflate=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik TÜBİTAK 2209-A proje önerisi PDF'i üretir.")
+    parser.add_argument("-o", "--output", required=True, help="Yazılacak PDF dosyası")
+    parser.add_argument("--pages", type=int, default=ProposalSpec.pages)
+    parser.add_argument("--spans-per-page", type=int, default=ProposalSpec.spans_per_page)
+    parser.add_argument("--citations", type=int, default=ProposalSpec.citations)
+    parser.add_argument("--budget-rows", type=int, default=ProposalSpec.budget_rows)
+    parser.add_argument("--malformed", nargs="*", default=[], help="İçeriği kuralları ihlal edecek bölüm anahtarları")
+    parser.add_argument("--seed", type=int, default=ProposalSpec.seed)
+    parser.add_argument("--tables", action="store_true", help="Bütçe ve iş-zaman çizelgesini çizgili tablo olarak yaz")
+    args = parser.parse_args(argv)
+    spec = ProposalSpec(args.pages, args.spans_per_page, args.citations, args.budget_rows, tuple(args.malformed), args.seed, args.tables)
+    pdf_bytes = generate_proposal(spec)
+    with open(args.output, "wb") as f: f.write(pdf_bytes)
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        print(f"{args.output}: {doc.page_count} sayfa, {len(pdf_bytes)} bayt")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# ==============================================================================
+# TOPLU DOĞRULAMA KOMUT SATIRI ARACI
+# Streamlit olmadan bir klasördeki PDF'leri süreç havuzunda doğrular ve her belge
+# bittiği anda bir JSON satırı (JSONL) yazar.
+#
+#   python cli.py basvurular/ --workers 8 --timeout 60 --output sonuclar.jsonl
+# ==============================================================================
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from validator import FormatSampling, StageTimer, init_pool_worker, kill_process_pool, validate_record
+
+# ==============================================================================
+# İŞÇİ SÜREÇ TARAFI
+# İşçi başlatıcısı ve belge doğrulaması HTTP servisiyle ortaktır (validator.init_pool_worker / validate_record).
+# ==============================================================================
+def validate_file(path: str, timeout: Optional[float] = None, extraction_engine: str = "pymupdf") -> Dict:
+    """Tek bir PDF'i doğrular; her durumda (hata ve zaman aşımı dahil) bir kayıt sözlüğü döndürür."""
+    return {"file": path, **validate_record(path, timeout, extraction_engine)}
+
+# ==============================================================================
+# YÖNETİCİ SÜREÇ TARAFI
+# ==============================================================================
+def find_pdfs(paths: Iterable[str], recursive: bool = False) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                for root, _, files in os.walk(path):
+                    found.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+            else:
+                found.extend(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(".pdf"))
+        elif os.path.isfile(path):
+            found.append(path)
+    return sorted(found)
+
+# İşçideki süre sınırı (SIGALRM) devreye girmezse yönetici süreç bu kadar ek süre bekledikten sonra işçiyi öldürür.
+DEADLINE_GRACE = 5.0
+
+def _crashed_record(path: str) -> Dict:
+    return {"file": path, "status": "crashed", "error": "İşçi süreç bu belge işlenirken beklenmedik şekilde sonlandı.",
+            "pages": None, "bytes": None, "results": None, "timings": {}}
+
+def _stuck_record(path: str, timeout: float) -> Dict:
+    return {"file": path, "status": "timeout", "error": f"Belge {timeout} saniyelik süre sınırını aştı; yanıt vermeyen işçi süreç durduruldu.",
+            "pages": None, "bytes": None, "results": None, "timings": {}}
+
+def _run_pool(paths: List[str], workers: int, timeout: Optional[float], extraction_engine: str, format_sampling: Optional[FormatSampling],
+              suspects: List[str], unstarted: List[str], collect_stages: bool = False) -> Iterator[Dict]:
+    # Her işçiye bir iş verilir; böylece gönderilen her belge hemen başlar ve gönderim anından itibaren süre tutulabilir.
+    # Havuz çökerse o anda işlenen belgeler `suspects`, henüz gönderilmemiş olanlar `unstarted` listesine eklenir. Süre
+    # sınırını `DEADLINE_GRACE` kadar aşan belge zaman aşımı sayılır, havuz öldürülür ve diğer belgeler `unstarted`a döner.
+    queue = list(reversed(paths))
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_pool_worker, initargs=(extraction_engine, format_sampling, collect_stages))
+    in_flight, deadlines = {}, {}
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < workers:
+                path = queue.pop()
+                future = pool.submit(validate_file, path, timeout, extraction_engine)
+                in_flight[future] = path
+                if timeout: deadlines[future] = time.monotonic() + timeout + DEADLINE_GRACE
+            wait_for = max(min(deadlines.values()) - time.monotonic(), 0) if deadlines else None
+            done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                path = in_flight.pop(future); deadlines.pop(future, None)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    suspects.append(path); broken = True
+            if broken:
+                suspects.extend(in_flight.values())
+                unstarted.extend(reversed(queue))
+                return
+            now = time.monotonic()
+            expired = [future for future, deadline in deadlines.items() if deadline <= now]
+            if expired:
+                for future in expired: yield _stuck_record(in_flight.pop(future), timeout)
+                unstarted.extend(in_flight.values())
+                unstarted.extend(reversed(queue))
+                kill_process_pool(pool)
+                return
+    finally:
+        # Bitmemiş iş kalmadıysa havuz düzgünce kapatılır; yarıda bırakılan (çökme, süre aşımı, okuyucunun vazgeçmesi)
+        # havuzun işçileri öldürülür.
+        if in_flight: kill_process_pool(pool)
+        else: pool.shutdown(wait=True)
+
+def run_batch(paths: List[str], workers: int = 4, timeout: Optional[float] = None, extraction_engine: str = "pymupdf",
+              format_sampling: Optional[FormatSampling] = None, collect_stages: bool = False) -> Iterator[Dict]:
+    """Belgeleri süreç havuzunda doğrular ve kayıtları tamamlandıkça üretir.
+
+    Bir işçi çökerse o anda işlenmekte olan belgeler tek tek, yalıtılmış havuzlarda yeniden denenir;
+    böylece sorunlu belge tespit edilir ve toplu işin geri kalanı yeni bir havuzda devam eder. Süre sınırına
+    rağmen yanıt vermeyen bir belgede de havuz öldürülür ve kalan belgeler yeni bir havuzda işlenir.
+    """
+    remaining = list(paths)
+    while remaining:
+        suspects: List[str] = []
+        unstarted: List[str] = []
+        yield from _run_pool(remaining, workers, timeout, extraction_engine, format_sampling, suspects, unstarted, collect_stages)
+        for path in suspects:
+            isolated: List[str] = []
+            yield from _run_pool([path], 1, timeout, extraction_engine, format_sampling, isolated, [], collect_stages)
+            if isolated: yield _crashed_record(path)
+        remaining = unstarted
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TÜBİTAK 2209-A proje önerilerini toplu olarak doğrular ve JSONL çıktısı üretir.")
+    parser.add_argument("paths", nargs="+", help="PDF dosyaları veya PDF içeren klasörler")
+    parser.add_argument("-o", "--output", help="JSONL çıktı dosyası (varsayılan: standart çıktı)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="İşçi süreç sayısı")
+    parser.add_argument("-t", "--timeout", type=float, default=120.0, help="Belge başına süre sınırı (saniye, 0 = sınırsız)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Alt klasörleri de tara")
+    parser.add_argument("--engine", choices=["pymupdf", "pdfplumber"], default="pymupdf", help="Metin çıkarma motoru")
+    parser.add_argument("--format-stride", type=int, default=1, help="20 sayfadan uzun belgelerin format analizinde her N. sayfayı incele")
+    parser.add_argument("--format-max-pages", type=int, default=0, help="20 sayfadan uzun belgelerin format analizinde incelenecek en fazla sayfa (0 = sınırsız)")
+    parser.add_argument("--metrics", help="Aşama sürelerinin (p50/p95) yazılacağı dosya; .prom uzantısı Prometheus metni, diğerleri JSON")
+    args = parser.parse_args(argv)
+
+    paths = find_pdfs(args.paths, args.recursive)
+    if not paths:
+        print("Doğrulanacak PDF bulunamadı.", file=sys.stderr)
+        return 1
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    counts = {"ok": 0, "error": 0, "timeout": 0, "crashed": 0}
+    total_pages = 0
+    timer = StageTimer() if args.metrics else None
+    started = time.perf_counter()
+    try:
+        format_sampling = FormatSampling(page_stride=max(args.format_stride, 1), max_pages=args.format_max_pages or None)
+        for record in run_batch(paths, max(args.workers, 1), args.timeout or None, args.engine, format_sampling, timer is not None):
+            counts[record["status"]] += 1
+            if timer is not None:
+                for sample in record["timings"].get("stages", ()): timer.record(*sample)
+            total_pages += record["pages"] or 0
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout: out.close()
+
+    elapsed = time.perf_counter() - started
+    if timer is not None: timer.export(args.metrics)
+    summary = {"files": len(paths), **counts, "pages": total_pages, "seconds": round(elapsed, 3),
+               "files_per_second": round(len(paths) / elapsed, 3) if elapsed else None,
+               "pages_per_second": round(total_pages / elapsed, 3) if elapsed else None}
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return 0 if counts["ok"] == len(paths) else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+# ==============================================================================
+# HTTP DOĞRULAMA SERVİSİ
+# Streamlit arayüzünden bağımsız, asyncio tabanlı bir HTTP servisi. PDF'ler süreç
+# havuzunda doğrulanır; havuz ve kuyruk doluysa istek 429 + Retry-After ile reddedilir.
+# Yalnızca standart kütüphaneyi kullanır; yük dengeleyici arkasında yatay ölçeklenebilir.
+#
+#   python service.py serve --port 8080 --workers 4 --queue 8 --deadline 60 --warm-up
+#   python service.py post oneri.pdf --url http://127.0.0.1:8080 --concurrency 16
+#
+# Uç noktalar:
+#   POST /validate  gövde: ham PDF (application/pdf) veya multipart/form-data ("file" alanı)
+#                   isteğe bağlı başlık: X-Deadline-Seconds (sunucu sınırını aşamaz)
+#   GET  /healthz   doluluk bilgisiyle sağlık kontrolü
+#   GET  /metrics   Prometheus metin biçiminde istek sayaçları ve aşama süreleri
+# ==============================================================================
+import argparse
+import asyncio
+import http.client
+import json
+import math
+import os
+import signal
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from validator import (
+    ValidationResult, FormatSampling, ResultCache, StageTimer, document_cache_key, init_pool_worker, kill_process_pool, preload_pdf_libraries,
+    validate_record, RULESET_VERSION,
+)
+
+# ==============================================================================
+# İŞÇİ SÜREÇ TARAFI
+# İşçi başlatıcısı ve belge doğrulaması komut satırı aracıyla ortaktır (validator.init_pool_worker / validate_record).
+# ==============================================================================
+def _validate_bytes(pdf_bytes: bytes, submitted_at: float, deadline: float) -> Dict:
+    """Belgeyi doğrular. Süre sınırı, isteğin kuyrukta beklediği süre düşülerek işçi içinde SIGALRM ile uygulanır."""
+    remaining = deadline - (time.time() - submitted_at)
+    if remaining <= 0:
+        return {"status": "timeout", "error": "İstek işlenmeye başlamadan süre sınırı doldu.", "pages": None, "bytes": len(pdf_bytes),
+                "results": None, "timings": {}}
+    record = validate_record(pdf_bytes, remaining)
+    if record["status"] == "timeout": record["error"] = f"Belge {deadline:g} saniyelik süre sınırını aştı."
+    return record
+
+# ==============================================================================
+# HTTP YARDIMCILARI
+# ==============================================================================
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status, self.message, self.headers = status, message, headers or {}
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+HEADER_TIMEOUT = 10.0
+BODY_TIMEOUT = 60.0
+# İşçideki süre sınırı (SIGALRM) devreye girmezse servis bu kadar ek süre bekledikten sonra havuzu öldürüp yeniler.
+DEADLINE_GRACE = 5.0
+
+async def read_request(reader: asyncio.StreamReader, max_body: int) -> Request:
+    """Tek bir HTTP/1.1 isteğini okur. Gövde boyutu, gövde okunmadan önce Content-Length ile denetlenir."""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+    except asyncio.LimitOverrunError:
+        raise HttpError(431, "İstek başlıkları çok büyük.")
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+        raise HttpError(400, "İstek başlıkları okunamadı.")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Geçersiz istek satırı.")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    body = b""
+    if method == "POST":
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(411, "Parçalı gövde desteklenmiyor; Content-Length gönderin.")
+        try:
+            length = int(headers.get("content-length", ""))
+        except ValueError:
+            raise HttpError(411, "Content-Length başlığı gerekli.")
+        if length > max_body:
+            raise HttpError(413, f"Yüklenen dosya {max_body} bayt sınırını aşıyor.")
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), BODY_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            raise HttpError(400, "İstek gövdesi eksik veya zamanında gelmedi.")
+    return Request(method.upper(), urlsplit(target).path, headers, body)
+
+def extract_pdf(request: Request) -> bytes:
+    """Gövdeden PDF baytlarını alır: ham PDF veya multipart/form-data içindeki "file" (ya da ilk dosya) alanı."""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + request.body)
+        parts = [part for part in message.iter_parts() if part.get_filename() or part.get_param("name", header="content-disposition") == "file"] \
+            if message.is_multipart() else []
+        if not parts: raise HttpError(400, "Çok parçalı gövdede 'file' alanı bulunamadı.")
+        pdf_bytes = parts[0].get_payload(decode=True) or b""
+    else:
+        pdf_bytes = request.body
+    if not pdf_bytes.startswith(b"%PDF"):
+        raise HttpError(415, "Gövde bir PDF dosyası değil.")
+    return pdf_bytes
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large",
+           415: "Unsupported Media Type", 422: "Unprocessable Entity", 429: "Too Many Requests", 431: "Request Header Fields Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+def render_response(status: int, payload, headers: Optional[Dict[str, str]] = None) -> bytes:
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+# ==============================================================================
+# SERVİS
+# ==============================================================================
+class ValidationService:
+    """Doğrulama isteklerini sınırlı bir kuyrukla süreç havuzuna dağıtan asyncio servisi.
+
+    Aynı anda en fazla `workers + queue_size` istek kabul edilir; fazlası kuyruğa alınmadan 429 ile reddedilir.
+    Retry-After, son isteklerin ortalama süresi ve mevcut doluluktan tahmin edilir. Süre sınırına rağmen yanıt vermeyen
+    (C kodunda takılı) bir işçi varsa havuz öldürülüp yenilenir; istek yuvası işçi durdurulmadan bırakılmaz. Aynı havuzda
+    işlenirken bu yüzden yarıda kalan diğer istekler yeni havuzda bir kez yeniden denenir.
+    """
+    def __init__(self, workers: int = 2, queue_size: int = 8, deadline: float = 60.0, max_upload_bytes: int = 20 * 1024 * 1024,
+                 extraction_engine: str = "pymupdf", format_sampling: Optional[FormatSampling] = None, cache_entries: int = 256,
+                 warm_up: bool = False):
+        self.workers = max(workers, 1)
+        self.capacity = self.workers + max(queue_size, 0)
+        self.deadline = deadline
+        self.max_upload_bytes = max_upload_bytes
+        self.extraction_engine = extraction_engine
+        self.format_sampling = format_sampling
+        self.cache = ResultCache(max_entries=cache_entries) if cache_entries else None
+        self.timer = StageTimer()
+        self.in_flight = 0
+        self.responses: Counter = Counter()
+        self._durations: deque = deque(maxlen=64)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._generation = 0  # Havuz her öldürülüp yenilendiğinde artar.
+        self._started_at = time.time()
+        self.warm_up = warm_up
+        self.import_seconds: Dict[str, float] = {}
+
+    def start(self):
+        if self._pool is None:
+            # Isınma: kütüphaneler havuzdan önce bu süreçte yüklenir (fork ile başlayan işçiler devralır) ve tüm işçiler
+            # ilk istek beklenmeden başlatılır; ölçek büyütmeden sonraki ilk istek içe aktarma maliyetini ödemez.
+            if self.warm_up: self.import_seconds = preload_pdf_libraries(self.extraction_engine)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_pool_worker,
+                                             initargs=(self.extraction_engine, self.format_sampling, True))
+            if self.warm_up:
+                for _ in range(self.workers): self._pool.submit(preload_pdf_libraries, self.extraction_engine)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _recycle(self, generation: int):
+        # Aynı havuz yalnızca bir kez yenilenir; başka bir istek onu zaten yenilediyse dokunulmaz.
+        if generation == self._generation and self._pool is not None:
+            kill_process_pool(self._pool)
+            self._pool = None
+            self._generation += 1
+
+    def retry_after(self) -> int:
+        average = sum(self._durations) / len(self._durations) if self._durations else 1.0
+        return max(1, math.ceil(average * self.in_flight / self.workers))
+
+    async def validate(self, pdf_bytes: bytes, deadline: float) -> Tuple[int, Dict, Dict[str, str]]:
+        cache_key = document_cache_key(pdf_bytes, RULESET_VERSION, self.extraction_engine)
+        cached = self.cache.get(cache_key) if self.cache is not None else None
+        if cached is not None:
+            return 200, {"status": "ok", "cached": True, "results": {key: result.to_dict() for key, result in cached.items()}}, {}
+        if self.in_flight >= self.capacity:
+            retry = self.retry_after()
+            return 429, {"status": "rejected", "error": "Servis dolu; lütfen daha sonra tekrar deneyin.", "retry_after": retry}, {"Retry-After": str(retry)}
+
+        self.in_flight += 1
+        started, submitted_at = time.perf_counter(), time.time()
+        try:
+            for attempt in range(2):
+                self.start()
+                generation = self._generation
+                future = asyncio.get_running_loop().run_in_executor(self._pool, _validate_bytes, pdf_bytes, submitted_at, deadline)
+                try:
+                    # İşçi kendi süre sınırını uygular; buradaki pay yalnızca işçi C kodunda takılı kalırsa devreye girer.
+                    record = await asyncio.wait_for(future, max(deadline - (time.time() - submitted_at), 0) + DEADLINE_GRACE)
+                    break
+                except asyncio.TimeoutError:
+                    self._recycle(generation)
+                    return 504, {"status": "timeout", "error": f"Belge {deadline:g} saniyelik süre sınırını aştı; yanıt vermeyen işçi durduruldu."}, {}
+                except BrokenProcessPool:
+                    # Havuz başka bir istek yüzünden yenilendiyse bu belge suçsuzdur ve bir kez daha denenir.
+                    retry = generation != self._generation and attempt == 0
+                    self._recycle(generation)
+                    if not retry:
+                        return 500, {"status": "crashed", "error": "İşçi süreç bu belge işlenirken beklenmedik şekilde sonlandı."}, {}
+        finally:
+            self.in_flight -= 1
+        seconds = time.perf_counter() - started
+        self._durations.append(seconds)
+        for sample in record.pop("timings").get("stages", ()): self.timer.record(*sample)
+
+        if record["status"] == "timeout": return 504, record, {}
+        if record["status"] == "error": return 422, record, {}
+        if self.cache is not None:
+            self.cache.put(cache_key, {key: ValidationResult.from_dict(data) for key, data in record["results"].items()})
+        record.update(cached=False, seconds=round(seconds, 4))
+        return 200, record, {}
+
+    def health(self) -> Dict:
+        return {"status": "ok" if self.in_flight < self.capacity else "saturated", "workers": self.workers, "in_flight": self.in_flight,
+                "capacity": self.capacity, "uptime_seconds": round(time.time() - self._started_at, 1), "ruleset_version": RULESET_VERSION}
+
+    def metrics(self) -> str:
+        lines = ["# HELP tubitak_service_responses_total HTTP yanıtları (durum koduna göre).", "# TYPE tubitak_service_responses_total counter"]
+        lines += [f'tubitak_service_responses_total{{code="{code}"}} {count}' for code, count in sorted(self.responses.items())]
+        lines += ["# HELP tubitak_service_in_flight İşlenen veya kuyrukta bekleyen istek sayısı.", "# TYPE tubitak_service_in_flight gauge",
+                  f"tubitak_service_in_flight {self.in_flight}",
+                  "# HELP tubitak_service_capacity Aynı anda kabul edilen en fazla istek.", "# TYPE tubitak_service_capacity gauge",
+                  f"tubitak_service_capacity {self.capacity}"]
+        if self.cache is not None:
+            lines += ["# HELP tubitak_service_cache_hits_total Sonuç önbelleği isabetleri.", "# TYPE tubitak_service_cache_hits_total counter",
+                      f"tubitak_service_cache_hits_total {self.cache.hits}"]
+        return "\n".join(lines) + "\n" + self.timer.to_prometheus()
+
+    async def dispatch(self, request: Request) -> Tuple[int, object, Dict[str, str]]:
+        if request.path == "/healthz":
+            if request.method != "GET": raise HttpError(405, "Yalnızca GET desteklenir.", {"Allow": "GET"})
+            health = self.health()
+            return (200 if health["status"] == "ok" else 503), health, {}
+        if request.path == "/metrics":
+            if request.method != "GET": raise HttpError(405, "Yalnızca GET desteklenir.", {"Allow": "GET"})
+            return 200, self.metrics(), {}
+        if request.path == "/validate":
+            if request.method != "POST": raise HttpError(405, "Yalnızca POST desteklenir.", {"Allow": "POST"})
+            deadline = self.deadline
+            if "x-deadline-seconds" in request.headers:
+                try:
+                    deadline = min(deadline, max(float(request.headers["x-deadline-seconds"]), 0.1))
+                except ValueError:
+                    raise HttpError(400, "X-Deadline-Seconds sayı olmalıdır.")
+            return await self.validate(extract_pdf(request), deadline)
+        raise HttpError(404, "Bulunamadı.")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                status, payload, headers = await self.dispatch(await read_request(reader, self.max_upload_bytes))
+            except HttpError as e:
+                status, payload, headers = e.status, {"status": "error", "error": e.message}, e.headers
+            except Exception as e:
+                status, payload, headers = 500, {"status": "error", "error": f"{type(e).__name__}: {e}"}, {}
+            self.responses[status] += 1
+            writer.write(render_response(status, payload, headers))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        self.start()
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=64 * 1024)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try: loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError): pass
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Doğrulama servisi dinleniyor: {addresses} (işçi: {self.workers}, kapasite: {self.capacity})", file=sys.stderr)
+        if self.import_seconds:
+            print("Önceden yüklenen kütüphaneler: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.import_seconds.items()), file=sys.stderr)
+        async with server:
+            await stop.wait()
+        self.shutdown()
+
+# ==============================================================================
+# YEREL TEST İSTEMCİSİ
+# ==============================================================================
+def post_pdf(url: str, pdf_bytes: bytes, deadline: Optional[float] = None, timeout: float = 120.0) -> Tuple[int, Dict[str, str], Dict]:
+    """`/validate` uç noktasına ham PDF gönderir; (durum kodu, başlıklar, JSON gövde) döndürür."""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    headers = {"Content-Type": "application/pdf"}
+    if deadline: headers["X-Deadline-Seconds"] = str(deadline)
+    try:
+        connection.request("POST", "/validate", body=pdf_bytes, headers=headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+def run_client(url: str, paths: List[str], concurrency: int, repeat: int, deadline: Optional[float]) -> int:
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f: documents.append((path, f.read()))
+    jobs = [document for _ in range(max(repeat, 1)) for document in documents]
+    statuses: Counter = Counter()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = [(path, pool.submit(post_pdf, url, data, deadline)) for path, data in jobs]
+        for path, future in futures:
+            try:
+                status, headers, body = future.result()
+            except (OSError, ValueError) as e:
+                status, headers, body = 0, {}, {"error": str(e)}
+            statuses[status] += 1
+            summary = {"file": path, "http": status, "status": body.get("status"), "cached": body.get("cached"),
+                       "retry_after": headers.get("Retry-After"), "error": body.get("error")}
+            if body.get("results"):
+                summary["errors"] = sum(len(r["errors"]) for r in body["results"].values())
+                summary["warnings"] = sum(len(r["warnings"]) for r in body["results"].values())
+            print(json.dumps(summary, ensure_ascii=False))
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"requests": len(jobs), "seconds": round(elapsed, 3), "by_status": {str(k): v for k, v in sorted(statuses.items())}}), file=sys.stderr)
+    return 0 if set(statuses) <= {200} else 2
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TÜBİTAK 2209-A doğrulama HTTP servisi ve yerel test istemcisi.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Servisi başlat")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="İşçi süreç sayısı")
+    serve.add_argument("-q", "--queue", type=int, default=8, help="İşçiler doluyken bekletilebilecek istek sayısı")
+    serve.add_argument("-t", "--deadline", type=float, default=60.0, help="İstek başına süre sınırı (saniye, kuyruk dahil)")
+    serve.add_argument("--max-upload-mb", type=float, default=20.0)
+    serve.add_argument("--engine", choices=["pymupdf", "pdfplumber"], default="pymupdf")
+    serve.add_argument("--cache-entries", type=int, default=256, help="Sonuç önbelleği boyutu (0 = kapalı)")
+    serve.add_argument("--warm-up", action="store_true", help="PDF kütüphanelerini ve işçi süreçleri açılışta hazırla")
+    post = commands.add_parser("post", help="Servise PDF gönder (yerel deneme ve yük testi)")
+    post.add_argument("paths", nargs="+")
+    post.add_argument("--url", default="http://127.0.0.1:8080")
+    post.add_argument("-c", "--concurrency", type=int, default=1)
+    post.add_argument("-n", "--repeat", type=int, default=1, help="Her dosya kaç kez gönderilsin")
+    post.add_argument("--deadline", type=float, help="X-Deadline-Seconds başlığı")
+    args = parser.parse_args(argv)
+
+    if args.command == "post":
+        return run_client(args.url, args.paths, args.concurrency, args.repeat, args.deadline)
+    service = ValidationService(workers=args.workers, queue_size=args.queue, deadline=args.deadline,
+                                max_upload_bytes=int(args.max_upload_mb * 1024 * 1024), extraction_engine=args.engine,
+                                cache_entries=args.cache_entries, warm_up=args.warm_up)
+    asyncio.run(service.serve(args.host, args.port))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# ==============================================================================
+# ORTAK TEST AYARLARI
+# Depo kökü (validator) ve benchmarks/ (sentetik öneri üreteci) içe aktarma yoluna eklenir.
+# Sentetik PDF'ler oturum başına bir kez üretilir.
+# ==============================================================================
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from synthetic import ProposalSpec, generate_proposal  # noqa: E402
+
+@pytest.fixture(scope="session")
+def proposal():
+    """`ProposalSpec` ayarlarıyla üretilen PDF'leri önbelleğe alan üretici."""
+    generated = {}
+    def make(**spec) -> bytes:
+        key = tuple(sorted(spec.items()))
+        if key not in generated: generated[key] = generate_proposal(ProposalSpec(**spec))
+        return generated[key]
+    return make
@@ -0,0 +1,45 @@
+import pytest
+
+from validator import TubitakFormValidator, extract_budget_total, format_turkish_amount, parse_turkish_amount
+
+@pytest.mark.parametrize("raw, expected", [
+    ("9.000,00", 9000.0), ("9 000", 9000.0), ("9 000,50", 9000.5), ("9000", 9000.0), ("9,5", 9.5),
+    ("1.234.567", 1234567.0), ("1,234,567", 1234567.0), ("9.000", 9000.0), ("9.50", 9.5), ("9,000.00", 9000.0),
+    ("₺9.000", 9000.0), ("9000 TL", 9000.0), ("9.000,00 tl", 9000.0),
+])
+def test_parse_turkish_amount(raw, expected):
+    assert parse_turkish_amount(raw) == expected
+
+@pytest.mark.parametrize("raw", ["abc", "", "TL", "₺"])
+def test_parse_turkish_amount_rejects(raw):
+    with pytest.raises(ValueError):
+        parse_turkish_amount(raw)
+
+def test_format_turkish_amount():
+    assert format_turkish_amount(9000) == "9.000,00 TL"
+    assert format_turkish_amount(1234567.5, "") == "1.234.567,50"
+
+def test_budget_total_prefers_explicit_total():
+    text = "Kalem Birim Fiyat Toplam\nSarf 1.000,00 TL 2.000,00 TL\nSarf 500,00 TL 1.000,00 TL\nGENEL TOPLAM 3.000,00 TL"
+    total = extract_budget_total(text)
+    assert (total.total, total.source, total.line_items) == (3000.0, "toplam_satiri", (2000.0, 1000.0))
+
+def test_budget_total_sums_line_items():
+    total = extract_budget_total("Sarf 1.000,00 TL\nSeyahat ₺ 2.500")
+    assert (total.total, total.source) == (3500.0, "kalem_toplami")
+    assert extract_budget_total("Bütçe talep edilmemektedir.").source == "yok"
+
+def test_quantity_next_to_amount_is_not_grouped():
+    # "3 200 TL": 3 adet, 200 TL. Miktar tutara yapıştırılırsa kalemler şişer ve yanlış limit aşımı çıkar.
+    total = extract_budget_total("Kimyasal 3 200 TL\nSarf malzeme 2 150 TL")
+    assert (total.total, total.line_items) == (350.0, (200.0, 150.0))
+    assert extract_budget_total("Sarf malzeme 9 000 TL").total == 9000.0
+    assert extract_budget_total("Sarf malzeme ₺ 3 200").total == 3200.0
+    assert extract_budget_total("Sarf malzeme 3 200,00 TL").total == 3200.0
+    assert extract_budget_total("3 200 TL").total == 3200.0
+    assert extract_budget_total("Kimyasal 3 adet\nTOPLAM 3 200 TL").total == 3200.0
+
+def test_quantity_next_to_amount_does_not_exceed_limit():
+    validator = TubitakFormValidator()
+    result = validator.validate_butce("Kalem Adı Tutar\nKimyasal 5 800 TL\nSarf malzeme 9 950 TL")
+    assert not result.has("error")
@@ -0,0 +1,21 @@
+import signal
+import time
+
+import cli
+
+def _fake_validate(path, timeout=None, extraction_engine="pymupdf"):
+    # "takili" belgesi, süre sınırı sinyali engellenmiş (C kodunda takılı kalmış gibi) bir işçiyi taklit eder.
+    if path == "takili.pdf":
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(60)
+    return {"file": path, "status": "ok", "error": None, "pages": 1, "bytes": 1, "results": {}, "timings": {}}
+
+def test_stuck_worker_is_killed_and_batch_continues(monkeypatch):
+    monkeypatch.setattr(cli, "validate_file", _fake_validate)
+    monkeypatch.setattr(cli, "DEADLINE_GRACE", 0.2)
+    started = time.monotonic()
+    records = list(cli.run_batch(["a.pdf", "takili.pdf", "b.pdf", "c.pdf"], workers=2, timeout=0.5))
+    assert time.monotonic() - started < 20
+    statuses = {record["file"]: record["status"] for record in records}
+    assert statuses == {"a.pdf": "ok", "takili.pdf": "timeout", "b.pdf": "ok", "c.pdf": "ok"}
+    assert len(records) == 4
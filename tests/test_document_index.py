@@ -0,0 +1,25 @@
+from validator import DocumentIndex, SectionIndex, TubitakFormValidator
+
+KAYNAKLAR = "[1] Yılmaz, A. (2020). Makale.\n[2] Demir, B. (2021). Kitap.\n[3] Kaya, C. (2022). Bildiri."
+
+def test_section_index():
+    index = SectionIndex("Giriş [1, 3] metni\n● ilk madde\n- ikinci madde [2]")
+    assert index.word_count == 11
+    assert [c.numbers for c in index.citations] == [(1, 3), (2,)] and index.cited_numbers == {1, 2, 3}
+    assert len(index.bullet_offsets) == 2 and index.line_starts == [0, 19, 31]
+
+def test_section_index_is_built_once():
+    index = DocumentIndex({"kaynaklar": KAYNAKLAR})
+    assert index.section("kaynaklar") is index.section("kaynaklar")
+    assert index.section("kaynaklar").reference_numbers == [1, 2, 3]
+    assert index.section("ozet").word_count == 0
+
+def test_citation_missing_from_references_is_reported():
+    validator = TubitakFormValidator()
+    index = DocumentIndex({"ozgun_deger": "Önceki çalışmalar [1, 2] ve [5] ile [7].", "kaynaklar": KAYNAKLAR})
+    result = validator.validate_kaynaklar(KAYNAKLAR, index)
+    assert any("[5]" in warning and "[7]" in warning and "[1]" not in warning and "Kaynaklar listesinde bulunamadı" in warning for warning in result.warnings)
+    index = DocumentIndex({"ozgun_deger": "Önceki çalışmalar [1, 2].", "kaynaklar": KAYNAKLAR})
+    assert not any("bulunamadı" in warning for warning in validator.validate_kaynaklar(KAYNAKLAR, index).warnings)
+    # Dizin verilmezse (tek bölümün doğrulanması) çapraz kontrol yapılmaz.
+    assert not any("bulunamadı" in warning for warning in validator.validate_kaynaklar(KAYNAKLAR).warnings)
@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from validator import AdmissionQueue, DocumentLimitExceeded, TubitakFormValidator, ValidationExecutor
+
+def test_admission_queue_is_fifo_and_reports_position():
+    queue = AdmissionQueue(1)
+    release, order, positions, threads = threading.Event(), [], {}, []
+    def run(name):
+        with queue.slot(lambda position: positions.setdefault(name, []).append(position), poll=0.01):
+            order.append(name)
+            release.wait(5)
+    with queue.slot():
+        for name in ("a", "b", "c"):
+            thread = threading.Thread(target=run, args=(name,)); thread.start(); threads.append(thread)
+            while queue.waiting < len(threads): threading.Event().wait(0.01)
+        assert queue.active == 1 and queue.waiting == 3
+    # Yer tutan iş bitince bekleyenler birer basamak ilerler.
+    for _ in range(500):
+        if order == ["a"] and positions.get("c", [])[-1:] == [2]: break
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads: thread.join(5)
+    assert order == ["a", "b", "c"]
+    assert positions == {"a": [1], "b": [2, 1], "c": [3, 2]}
+    assert queue.active == 0 and queue.waiting == 0
+
+def test_time_limit_kills_worker(proposal):
+    executor = ValidationExecutor(TubitakFormValidator(), max_concurrent=1, time_limit=0.01, memory_limit_mb=None)
+    try:
+        with pytest.raises(DocumentLimitExceeded, match="süre sınırını"):
+            list(executor.iter_validate(proposal(pages=12)))
+        assert executor._idle == [] and executor.admission.active == 0
+    finally:
+        executor.shutdown()
+
+def test_memory_limit_is_polled(proposal):
+    executor = ValidationExecutor(TubitakFormValidator(), max_concurrent=1, time_limit=None, memory_limit_mb=1)
+    executor.MEMORY_POLL_SECONDS = 0.05
+    try:
+        with pytest.raises(DocumentLimitExceeded, match=r"yaklaşık 1 MB bellek sınırını.*0.05 saniyede bir"):
+            list(executor.iter_validate(proposal(pages=12)))
+        assert executor._idle == []
+    finally:
+        executor.shutdown()
+    assert "bellek yetersiz" in ValidationExecutor(TubitakFormValidator(), memory_limit_mb=None)._memory_message()
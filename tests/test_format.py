@@ -0,0 +1,45 @@
+import math
+
+from validator import ExtractedDocument, FormatSampling, TextSpan, TubitakFormValidator, build_format_histogram
+
+def _document(pages: int, body: int = 18, other: int = 2) -> ExtractedDocument:
+    """Her sayfasında `body` adet Helvetica 9 ve `other` adet Times 11 span bulunan belge."""
+    texts, spans, offsets, pos = [], [], [], 0
+    for page_no in range(pages):
+        offsets.append(pos)
+        for i in range(body + other):
+            font, size = ("Helvetica", 9.0) if i < body else ("Times-Roman", 11.0)
+            spans.append(TextSpan(page_no, font, size, 0, pos + i * 6, pos + i * 6 + 5))
+        texts.append("metin " * (body + other))
+        pos += len(texts[-1]) + 1
+    text = "\n".join(texts)
+    return ExtractedDocument(text=text, spans=spans, page_offsets=offsets + [len(text)])
+
+def _sign_test(c1: int, c2: int) -> float:
+    return 0.5 * (1 + math.erf((c1 - c2) / math.sqrt(2 * (c1 + c2))))
+
+def _dominant_format(result) -> str:
+    return next(message for message in result.suggestions if message.startswith("Algılanan dominant format"))
+
+def test_short_document_is_scanned_completely():
+    document = _document(12)
+    histogram = build_format_histogram(document, FormatSampling(page_stride=3, max_pages=2))
+    assert histogram.pages_seen == 12 and histogram.span_count == 12 * 20
+    assert "(12/12 sayfa incelendi" in _dominant_format(TubitakFormValidator().validate_formatting(document))
+
+def test_long_document_stops_early_with_reported_confidence():
+    document = _document(60)
+    sampling = FormatSampling()
+    histogram = build_format_histogram(document, sampling)
+    # 20 span'lik sayfalarla `min_spans` (400) 20. sayfada dolar; güven o anda hedefin üzerindedir.
+    assert histogram.pages_seen == sampling.min_spans // 20 < 60
+    assert histogram.confidence() == _sign_test(18 * histogram.pages_seen, 2 * histogram.pages_seen) >= sampling.target_confidence
+    message = _dominant_format(TubitakFormValidator(format_sampling=sampling).validate_formatting(document))
+    assert f"({histogram.pages_seen}/60 sayfa incelendi, güven: %{histogram.confidence() * 100:.1f})" in message
+
+def test_unsettled_format_is_scanned_to_the_budget():
+    # Baskın punto ikinciden ayrışmadığında güven hedefe ulaşmaz; tüm örnekleme bütçesi taranır.
+    document = _document(40, body=10, other=10)
+    histogram = build_format_histogram(document, FormatSampling(page_stride=2))
+    assert histogram.pages_seen == 20 and histogram.confidence() == 0.5
+    assert build_format_histogram(document, FormatSampling(target_confidence=None)).pages_seen == 40
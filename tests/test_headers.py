@@ -0,0 +1,34 @@
+from validator import HeaderMatcher, TextSpan, span_size_histogram
+
+PATTERNS = {"ozet": r"ÖZET", "yontem": r"\d*\.?\s*YÖNTEM", "kaynaklar": r"KAYNAKLAR"}
+TEXT = "ÖZET\nKısa bir özet.\n2. YÖNTEM\nKaynaklar bölümünde verilen çalışmalar izlenir.\nKAYNAKLAR:\n[1] Yazar"
+
+def test_find_returns_headers_in_text_order():
+    found = HeaderMatcher(PATTERNS).find(TEXT)
+    assert [key for key, *_ in found] == ["ozet", "yontem", "kaynaklar"]
+    for key, start, end in found:
+        assert TEXT[start:end].strip() in ("ÖZET", "2. YÖNTEM", "KAYNAKLAR")
+
+def test_standalone_line_preferred_over_body_text():
+    # Gövde metnindeki "Kaynaklar ..." satırı, başlığın kendi satırında duran adayı varken sınır sayılmaz.
+    found = dict((key, start) for key, start, _ in HeaderMatcher(PATTERNS).find(TEXT))
+    assert found["kaynaklar"] == TEXT.index("KAYNAKLAR")
+
+def test_single_unconfirmed_candidate_is_kept():
+    text = "ÖZET\nmetin\nKaynaklar listesi aşağıdadır"
+    assert [key for key, *_ in HeaderMatcher(PATTERNS).find(text)] == ["ozet", "kaynaklar"]
+
+def test_styled_span_confirms_candidate():
+    text = "ÖZET\nmetin\nKaynaklar listesi\ngövde\nKaynaklar bölümü"
+    bold_at = text.rindex("Kaynaklar")
+    spans = [TextSpan(0, "Helvetica", 9, 0, 0, bold_at), TextSpan(0, "Helvetica-Bold", 9, 16, bold_at, len(text))]
+    found = [(key, start) for key, start, _ in HeaderMatcher(PATTERNS).find(text, spans)]
+    assert found == [("ozet", 0), ("kaynaklar", bold_at)]
+    assert span_size_histogram(spans) == {9: len(text)}
+
+def test_windowed_candidates_match_full_scan():
+    matcher = HeaderMatcher(PATTERNS)
+    cut = TEXT.index("2. YÖNTEM") - 1
+    windowed = matcher.candidates(TEXT[:cut]) + matcher.candidates(TEXT[cut - 5:], 5, cut - 5)
+    assert windowed == matcher.candidates(TEXT)
+    assert matcher.select(windowed) == matcher.find(TEXT)
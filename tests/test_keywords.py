@@ -0,0 +1,24 @@
+from validator import KeywordScanner, turkish_casefold
+
+def test_overlapping_matches_are_counted():
+    matches = KeywordScanner(["aa"]).scan("aaa")
+    assert matches.count("aa") == 2
+    assert matches.positions["aa"] == [0, 1]
+
+def test_nested_keywords():
+    matches = KeywordScanner(["analiz", "nali", "z"]).scan("analiz analizi")
+    assert (matches.count("analiz"), matches.count("nali"), matches.count("z")) == (2, 2, 2)
+    assert matches.total(["analiz", "nali"]) == 4
+    assert not matches.contains("yöntem")
+
+def test_turkish_casefold():
+    assert turkish_casefold("IŞIK İLAÇ") == "ışık ilaç"
+    matches = KeywordScanner(["ışık", "İlaç"]).scan("IŞIK ve İLAÇ")
+    assert matches.count("ışık") == 1 and matches.count("İlaç") == 1
+    assert KeywordScanner(["ilaç"]).scan("ILAÇ").count("ilaç") == 0  # "I" → "ı"
+
+def test_contains_word_boundaries():
+    matches = KeywordScanner(["tablet", "bilgisayar"]).scan("Tabletler ve dizüstü bilgisayar_x, Tablet.")
+    assert matches.contains_word("tablet")
+    assert matches.contains("bilgisayar") and not matches.contains_word("bilgisayar")
+    assert not KeywordScanner(["tablet"]).scan("tabletler").contains_word("tablet")
@@ -0,0 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from validator import TubitakFormValidator, extract_document_pymupdf
+
+def test_parallel_extraction_equals_serial(proposal):
+    pdf_bytes = proposal(pages=12)
+    serial = extract_document_pymupdf(pdf_bytes)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for workers in (2, 3, 5):
+            assert extract_document_pymupdf(pdf_bytes, executor, workers, page_threshold=1) == serial
+
+def test_parallel_validator_matches_serial(proposal):
+    pdf_bytes = proposal(pages=12, malformed=("butce",))
+    validator = TubitakFormValidator(parallel_workers=2, parallel_page_threshold=4)
+    try:
+        parallel = {key: result.to_dict() for key, result in validator.validate_document(pdf_bytes).items()}
+        assert validator._extraction_pool is not None
+    finally:
+        validator.shutdown()
+    assert validator._extraction_pool is None
+    assert parallel == {key: result.to_dict() for key, result in TubitakFormValidator().validate_document(pdf_bytes).items()}
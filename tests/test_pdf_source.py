@@ -0,0 +1,56 @@
+import io
+import pickle
+
+import pytest
+
+from validator import PdfSource, TubitakFormValidator, UploadTooLarge, pdf_digest
+
+class _Upload(io.BytesIO):
+    """Okunan bayt sayısını sayan yükleme akışı (Streamlit'in UploadedFile nesnesi gibi BytesIO tabanlı)."""
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.read_bytes = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.read_bytes += len(chunk)
+        return chunk
+
+def test_small_upload_is_kept_in_memory(tmp_path):
+    upload = _Upload(b"%PDF-kucuk")
+    with PdfSource.spool(upload, 10, spool_threshold=1024, tmp_dir=str(tmp_path)) as source:
+        assert source.path is None and source.data == upload.getvalue()
+        assert bytes(source.view()) == b"%PDF-kucuk" and len(source) == 10
+    assert list(tmp_path.iterdir()) == []
+
+def test_large_upload_is_spooled_and_removed_on_close(tmp_path):
+    data = b"%PDF-" + bytes(range(256)) * 40
+    source = PdfSource.spool(_Upload(data), len(data), spool_threshold=1024, tmp_dir=str(tmp_path))
+    assert source.data is None and [p.name for p in tmp_path.iterdir()] == [source.path.rsplit("/", 1)[-1]]
+    assert bytes(source.view()) == data and source.digest == pdf_digest(data)
+    # Alt süreçlere yalnızca yol gider; dosyayı silme sorumluluğu gönderende kalır.
+    copy = pickle.loads(pickle.dumps(source))
+    assert copy.path == source.path and copy.data is None and bytes(copy.view()) == data
+    copy.close()
+    assert tmp_path.joinpath(source.path.rsplit("/", 1)[-1]).exists()
+    source.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_declared_size_is_checked_before_reading(tmp_path):
+    upload = _Upload(b"%PDF-" + b"0" * 4096)
+    with pytest.raises(UploadTooLarge):
+        PdfSource.spool(upload, 4101, spool_threshold=1024, max_bytes=2048, tmp_dir=str(tmp_path))
+    assert upload.read_bytes == 0 and list(tmp_path.iterdir()) == []
+
+def test_stream_longer_than_declared_size_is_cut(tmp_path):
+    upload = _Upload(b"%PDF-" + b"0" * (3 * 1024 * 1024))
+    with pytest.raises(UploadTooLarge):
+        PdfSource.spool(upload, None, spool_threshold=1024, max_bytes=1024 * 1024, tmp_dir=str(tmp_path))
+    assert upload.read_bytes <= 2 * 1024 * 1024 and list(tmp_path.iterdir()) == []
+
+def test_spooled_source_validates_like_bytes(proposal, tmp_path):
+    pdf_bytes = proposal(pages=8)
+    validator = TubitakFormValidator()
+    with PdfSource.spool(_Upload(pdf_bytes), len(pdf_bytes), spool_threshold=1024, tmp_dir=str(tmp_path)) as source:
+        from_source = {key: result.to_dict() for key, result in validator.validate_document(source).items()}
+    assert from_source == {key: result.to_dict() for key, result in validator.validate_document(pdf_bytes).items()}
@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+
+from validator import RULES, RULESET_VERSION, ValidationResult, format_results_as_csv, format_results_as_json
+
+def _results() -> dict:
+    butce = ValidationResult("Bütçe")
+    butce.add("butce.limit_asimi", toplam=21000.0, limit=9000)
+    butce.add("butce.yasakli_kalem", kalem="tablet")
+    kaynaklar = ValidationResult("Kaynaklar")
+    kaynaklar.add("kaynaklar.eksik_kaynak", numaralar=(5, 7))
+    return {"butce": butce, "kaynaklar": kaynaklar, "ozet": ValidationResult("Özet")}
+
+def test_is_valid_depends_on_error_findings_only():
+    results = _results()
+    assert not results["butce"].is_valid and results["butce"].has("error")
+    assert results["kaynaklar"].is_valid and results["kaynaklar"].warnings
+    assert results["ozet"].is_valid and not results["ozet"].findings
+
+def test_dict_round_trip():
+    for result in _results().values():
+        data = json.loads(json.dumps(result.to_dict(), ensure_ascii=False))
+        restored = ValidationResult.from_dict(data)
+        assert restored == result and restored.to_dict() == result.to_dict()
+    data = _results()["butce"].to_dict()
+    assert data["is_valid"] is False and data["errors"] == _results()["butce"].errors
+    assert [f["rule"] for f in data["findings"]] == ["butce.limit_asimi", "butce.yasakli_kalem"]
+    assert data["findings"][0]["params"] == {"toplam": 21000.0, "limit": 9000}
+
+def test_json_export():
+    data = json.loads(format_results_as_json(_results()))
+    assert data["ruleset_version"] == RULESET_VERSION
+    assert data["counts"] == {severity: sum(1 for r in _results().values() for f in r.findings if f.severity == severity)
+                              for severity in ("error", "warning", "suggestion")}
+    assert {key: ValidationResult.from_dict(section) for key, section in data["sections"].items()} == _results()
+
+def test_csv_export():
+    rows = list(csv.DictReader(io.StringIO(format_results_as_csv(_results()))))
+    assert [(row["section"], row["rule"]) for row in rows] == [("butce", "butce.limit_asimi"), ("butce", "butce.yasakli_kalem"),
+                                                               ("kaynaklar", "kaynaklar.eksik_kaynak")]
+    assert all(row["severity"] == RULES[row["rule"]].severity for row in rows)
+    assert json.loads(rows[2]["params"]) == {"numaralar": [5, 7]}
+    assert all(row["message"] in _results()[row["section"]].messages(row["severity"]) for row in rows)
@@ -0,0 +1,64 @@
+import os
+
+import validator
+from validator import PdfSource, ResultCache, ValidationResult, document_cache_key
+
+def _results(rule: str = "butce.toplam_bulunamadi", **params) -> dict:
+    result = ValidationResult("Bütçe")
+    result.add(rule, **params)
+    return {"butce": result}
+
+def test_key_depends_on_bytes_ruleset_and_engine():
+    key = document_cache_key(b"%PDF-a")
+    assert key != document_cache_key(b"%PDF-b")
+    assert key != document_cache_key(b"%PDF-a", "2209A-eski")
+    assert key != document_cache_key(b"%PDF-a", engine="pdfplumber")
+    assert key == document_cache_key(b"%PDF-a")
+
+def test_key_is_same_for_source_and_bytes(tmp_path):
+    path = tmp_path / "oneri.pdf"
+    path.write_bytes(b"%PDF-a")
+    with PdfSource.from_path(str(path)) as source:
+        assert document_cache_key(source) == document_cache_key(b"%PDF-a")
+
+def test_get_returns_copy():
+    cache = ResultCache()
+    cache.put("k", _results())
+    cache.get("k")["butce"].add("butce.yasakli_kalem", kalem="tablet")
+    assert len(cache.get("k")["butce"].findings) == 1
+    assert (cache.hits, cache.misses) == (2, 0)
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", _results()); cache.put("b", _results())
+    cache.get("a")  # "b" en eski olur.
+    cache.put("c", _results())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+def test_memory_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(validator.time, "time", lambda: now[0])
+    cache = ResultCache(ttl_seconds=60)
+    cache.put("k", _results())
+    now[0] += 59
+    assert cache.get("k") is not None
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.misses == 1
+
+def test_disk_round_trip(tmp_path):
+    ResultCache(disk_dir=str(tmp_path)).put("k", _results("butce.limit_asimi", toplam=21000.0, limit=9000))
+    results = ResultCache(disk_dir=str(tmp_path)).get("k")
+    assert results["butce"].to_dict() == _results("butce.limit_asimi", toplam=21000.0, limit=9000)["butce"].to_dict()
+    assert not results["butce"].is_valid
+
+def test_disk_ttl_uses_file_age(tmp_path):
+    cache = ResultCache(ttl_seconds=60, disk_dir=str(tmp_path))
+    cache.put("k", _results())
+    path = tmp_path / "k.json"
+    old = path.stat().st_mtime - 120
+    os.utime(path, (old, old))
+    cache.clear()
+    assert cache.get("k") is None
+    assert not path.exists()
@@ -0,0 +1,78 @@
+import pytest
+
+from validator import (DocumentRevision, PageExtractionCache, ResultCache, TubitakFormValidator, ValidationExecutor,
+                       ValidationResult, diff_results)
+
+def _result(*rules) -> ValidationResult:
+    result = ValidationResult("Özet")
+    for rule, params in rules: result.add(rule, **params)
+    return result
+
+def _as_dicts(results) -> dict:
+    return {key: result.to_dict() for key, result in results}
+
+def test_diff_results():
+    missing = ("ozet.anahtar_kelime_eksik", {})
+    short = ("ozet.kelime_sayisi", {"kelime": 40})
+    old = {"ozet": _result(missing, short), "yontem": _result()}
+    new = {"ozet": _result(short, ("ozet.kelime_sayisi", {"kelime": 80})), "yontem": _result()}
+    diffs = diff_results(old, new)
+    assert list(diffs) == ["ozet"]
+    assert [f.rule for f in diffs["ozet"].added] == ["ozet.kelime_sayisi"] and diffs["ozet"].added[0].params == (80,)
+    assert [f.rule for f in diffs["ozet"].resolved] == ["ozet.anahtar_kelime_eksik"]
+    assert list(diff_results({}, {"ozet": _result(missing)})) == ["ozet"]
+    assert diff_results(old, old) == {}
+
+@pytest.mark.parametrize("tables", [False, True])
+def test_revision_revalidates_changed_section_only(proposal, tables):
+    before, after = proposal(pages=12, tables=tables), proposal(pages=12, tables=tables, malformed=("butce",))
+    validator = TubitakFormValidator(page_cache=PageExtractionCache())
+    revisions = []
+    first = _as_dicts(validator.iter_validate_revision(before, None, revisions.append))
+    assert first == _as_dicts(TubitakFormValidator().validate_document(before).items())
+    assert revisions[0].changed_pages == list(range(len(revisions[0].page_keys)))
+
+    misses = validator.page_cache.misses
+    second = _as_dicts(validator.iter_validate_revision(after, revisions[0], revisions.append))
+    assert second == _as_dicts(TubitakFormValidator().validate_document(after).items())
+    assert revisions[1].revalidated == ["butce"]
+    assert 0 < len(revisions[1].changed_pages) < len(revisions[1].page_keys)
+    assert validator.page_cache.misses - misses == len(revisions[1].changed_pages)
+    assert validator.page_cache.hits >= len(revisions[1].page_keys) - len(revisions[1].changed_pages)
+
+def test_streaming_first_revision_matches_revision_path(proposal):
+    # İlk sürüm akışlı yoldan gelir; özeti, önceki sürümden artımlı hesaplananla aynı olmalıdır.
+    before, after = proposal(pages=12), proposal(pages=12, malformed=("butce",))
+    streamed = []
+    list(TubitakFormValidator(page_cache=PageExtractionCache()).iter_validate_document(before, streamed.append))
+    other = TubitakFormValidator(page_cache=PageExtractionCache())
+    revisions = []
+    list(other.iter_validate_revision(after, None, revisions.append))
+    list(other.iter_validate_revision(before, revisions[0], revisions.append))
+    expected, actual = revisions[1], streamed[0]
+    assert (actual.document_key, actual.page_keys, actual.section_pages, actual.section_digests, actual.page_scores) == \
+           (expected.document_key, expected.page_keys, expected.section_pages, expected.section_digests, expected.page_scores)
+    assert _as_dicts(actual.results.items()) == _as_dicts(expected.results.items())
+
+def test_same_document_returns_previous_revision(proposal):
+    pdf_bytes = proposal(pages=4)
+    validator = TubitakFormValidator()
+    revisions = []
+    list(validator.iter_validate_document(pdf_bytes, revisions.append))
+    list(validator.iter_validate_revision(pdf_bytes, revisions[0], revisions.append))
+    assert revisions[1] is revisions[0]
+
+def test_executor_cache_hit_reports_stored_revision(proposal):
+    before, after = proposal(pages=6), proposal(pages=6, malformed=("butce",))
+    executor = ValidationExecutor(TubitakFormValidator(result_cache=ResultCache(), page_cache=PageExtractionCache()), isolate=False)
+    revisions = []
+    list(executor.iter_validate(before, on_revision=revisions.append))
+    list(executor.iter_validate(after, previous=revisions[0], on_revision=revisions.append))
+    assert revisions[1].revalidated == ["butce"]
+    # İkinci yükleme sonuç önbelleğinden gelir; özet saklanan sürümdür ve hiçbir bölüm yeniden doğrulanmaz.
+    list(executor.iter_validate(before, previous=revisions[1], on_revision=revisions.append))
+    cached = revisions[2]
+    assert isinstance(cached, DocumentRevision) and cached.document_key == revisions[0].document_key
+    assert cached.page_keys == revisions[0].page_keys and cached.revalidated == []
+    assert cached.changed_pages == revisions[1].changed_pages
+    assert executor.validator.result_cache.hits == 1
@@ -0,0 +1,103 @@
+import asyncio
+import signal
+import time
+
+import pytest
+
+import service
+from service import HttpError, Request, ValidationService, read_request
+
+@pytest.fixture
+def validation_service():
+    validation_service = ValidationService(workers=1, queue_size=0, deadline=30, cache_entries=0)
+    yield validation_service
+    validation_service.shutdown()
+
+def _post(body: bytes, content_type: str = "application/pdf", **headers) -> Request:
+    return Request("POST", "/validate", {"content-type": content_type, **headers}, body)
+
+def _multipart(pdf_bytes: bytes) -> tuple:
+    boundary = "sinir"
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"oneri.pdf\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n").encode() + pdf_bytes + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+def _stuck_validate(pdf_bytes, submitted_at, deadline):
+    # "%PDF takili" belgesi, süre sınırı sinyali engellenmiş (C kodunda takılı kalmış) bir işçiyi taklit eder.
+    if pdf_bytes.startswith(b"%PDF takili") or deadline < 1:
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(60)
+    time.sleep(1)
+    return {"status": "ok", "error": None, "pages": 1, "bytes": len(pdf_bytes), "results": {}, "timings": {}}
+
+def test_multipart_upload_is_validated(validation_service, proposal):
+    body, content_type = _multipart(proposal(pages=8))
+    status, payload, _ = asyncio.run(validation_service.dispatch(_post(body, content_type)))
+    assert status == 200 and payload["status"] == "ok" and payload["pages"] == 8 and payload["results"]
+    assert "timings" not in payload
+
+def test_full_service_is_rejected_with_retry_after(validation_service, proposal):
+    validation_service.in_flight = validation_service.capacity
+    status, payload, headers = asyncio.run(validation_service.dispatch(_post(proposal(pages=8))))
+    assert status == 429 and payload["status"] == "rejected"
+    assert int(headers["Retry-After"]) == payload["retry_after"] >= 1
+
+def test_upload_size_is_checked_before_reading_body():
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"POST /validate HTTP/1.1\r\nContent-Length: 2048\r\n\r\n")
+        return await read_request(reader, max_body=1024)
+    with pytest.raises(HttpError) as error:
+        asyncio.run(read())
+    assert error.value.status == 413
+
+def test_non_pdf_body_is_unsupported(validation_service):
+    with pytest.raises(HttpError) as error:
+        asyncio.run(validation_service.dispatch(_post(b"merhaba", "text/plain")))
+    assert error.value.status == 415
+
+def test_unreadable_pdf_is_unprocessable(validation_service):
+    status, payload, _ = asyncio.run(validation_service.dispatch(_post(b"%PDF-1.7 bozuk")))
+    assert status == 422 and payload["status"] == "error" and payload["error"]
+
+def test_deadline_header_limits_request(validation_service, proposal):
+    status, payload, _ = asyncio.run(validation_service.dispatch(_post(proposal(pages=200), **{"x-deadline-seconds": "0.1"})))
+    assert status == 504 and payload["status"] == "timeout" and "0.1 saniyelik" in payload["error"]
+    with pytest.raises(HttpError) as error:
+        asyncio.run(validation_service.dispatch(_post(proposal(pages=8), **{"x-deadline-seconds": "yarın"})))
+    assert error.value.status == 400
+
+def test_stuck_worker_is_killed_before_slot_is_released(validation_service, proposal, monkeypatch):
+    monkeypatch.setattr(service, "_validate_bytes", _stuck_validate)
+    monkeypatch.setattr(service, "DEADLINE_GRACE", 0.2)
+    status, payload, _ = asyncio.run(validation_service.validate(proposal(pages=8), 0.5))
+    assert status == 504 and "durduruldu" in payload["error"]
+    assert validation_service.in_flight == 0 and validation_service._pool is None and validation_service._generation == 1
+    monkeypatch.undo()
+    status, payload, _ = asyncio.run(validation_service.validate(proposal(pages=8), 30))
+    assert status == 200 and payload["status"] == "ok"
+
+def test_requests_sharing_a_recycled_pool_are_retried(proposal, monkeypatch):
+    monkeypatch.setattr(service, "_validate_bytes", _stuck_validate)
+    monkeypatch.setattr(service, "DEADLINE_GRACE", 0.2)
+    validation_service = ValidationService(workers=2, queue_size=0, deadline=30, cache_entries=0)
+    async def run():
+        return await asyncio.gather(validation_service.validate(b"%PDF takili", 0.5), validation_service.validate(proposal(pages=8), 30))
+    try:
+        (stuck_status, _, _), (status, payload, _) = asyncio.run(run())
+    finally:
+        validation_service.shutdown()
+    assert stuck_status == 504 and status == 200 and payload["status"] == "ok" and validation_service._generation == 1
+
+def test_health_and_metrics(validation_service, proposal):
+    asyncio.run(validation_service.dispatch(_post(proposal(pages=8))))
+    validation_service.responses[200] += 1
+    status, health, _ = asyncio.run(validation_service.dispatch(Request("GET", "/healthz", {}, b"")))
+    assert status == 200 and health["status"] == "ok" and health["capacity"] == 1 and health["in_flight"] == 0
+    status, metrics, _ = asyncio.run(validation_service.dispatch(Request("GET", "/metrics", {}, b"")))
+    assert status == 200
+    assert 'tubitak_service_responses_total{code="200"} 1' in metrics and "tubitak_service_capacity 1" in metrics
+    assert "tubitak_stage_duration_seconds" in metrics
+    validation_service.in_flight = validation_service.capacity
+    status, health, _ = asyncio.run(validation_service.dispatch(Request("GET", "/healthz", {}, b"")))
+    assert status == 503 and health["status"] == "saturated"
@@ -0,0 +1,42 @@
+import json
+import threading
+
+from validator import StageTimer
+
+def test_percentiles_use_nearest_rank():
+    timer = StageTimer()
+    for ms in range(1, 101): timer.record("extract", ms / 1000, pages=2, size=10)
+    stats = timer.summary()["extract"]
+    assert (stats["p50_ms"], stats["p95_ms"], stats["max_ms"]) == (50.0, 95.0, 100.0)
+    assert (stats["count"], stats["pages"], stats["bytes"]) == (100, 200, 1000)
+    assert stats["total_seconds"] == 5.05
+
+def test_window_limits_percentiles_not_totals():
+    timer = StageTimer(window=2)
+    for seconds in (10.0, 0.001, 0.003): timer.record("validate", seconds)
+    stats = timer.summary()["validate"]
+    assert stats["p95_ms"] == 3.0 and stats["count"] == 3 and stats["total_seconds"] == 10.004
+
+def test_trace_collects_only_its_own_thread():
+    timer = StageTimer()
+    with timer.trace() as samples:
+        with timer.span("extract", pages=3, size=42): pass
+        other = threading.Thread(target=timer.record, args=("validate", 0.5)); other.start(); other.join()
+    assert [(s.stage, s.pages, s.size) for s in samples] == [("extract", 3, 42)]
+    assert set(timer.summary()) == {"extract", "validate"}
+
+def test_json_and_prometheus_export(tmp_path):
+    timer = StageTimer()
+    timer.record("extract", 0.25, pages=4, size=2048)
+    timer.record("validate.ozet", 0.01)
+    data = json.loads(timer.to_json())
+    assert data["window"] == 1024 and data["stages"]["extract"]["p50_ms"] == 250.0
+    text = timer.to_prometheus()
+    assert '# TYPE tubitak_stage_duration_seconds summary' in text
+    assert 'tubitak_stage_duration_seconds{stage="extract",quantile="0.95"} 0.250000' in text
+    assert 'tubitak_stage_duration_seconds_count{stage="validate.ozet"} 1' in text
+    assert 'tubitak_stage_pages_total{stage="extract"} 4' in text and 'tubitak_stage_pages_total{stage="validate.ozet"}' not in text
+    timer.export(str(tmp_path / "metrics.prom")); timer.export(str(tmp_path / "metrics.json"))
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == text
+    assert json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))["stages"].keys() == {"extract", "validate.ozet"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
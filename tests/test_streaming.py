@@ -0,0 +1,22 @@
+import pytest
+
+from validator import ResultCache, TubitakFormValidator
+
+SPECS = [dict(pages=3), dict(pages=12, citations=30), dict(pages=10, tables=True),
+         dict(pages=8, malformed=("butce", "ozet", "genel_bilgiler")), dict(pages=12, tables=True, malformed=("butce", "is_zaman_cizelgesi"))]
+
+def _as_dicts(results) -> dict:
+    return {key: result.to_dict() for key, result in results}
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_streaming_matches_batch(proposal, spec):
+    pdf_bytes = proposal(**spec)
+    streamed = _as_dicts(TubitakFormValidator().iter_validate_document(pdf_bytes))
+    assert streamed == _as_dicts(TubitakFormValidator().validate_document(pdf_bytes).items())
+
+def test_streaming_fills_and_uses_result_cache(proposal):
+    pdf_bytes = proposal(pages=6)
+    validator = TubitakFormValidator(result_cache=ResultCache())
+    first = _as_dicts(validator.iter_validate_document(pdf_bytes))
+    assert _as_dicts(validator.iter_validate_document(pdf_bytes)) == first
+    assert validator.result_cache.hits == 1
@@ -0,0 +1,55 @@
+from validator import BudgetRow, TubitakFormValidator, WorkPackageRow, parse_budget_rows, parse_work_plan_rows
+
+BUDGET = [["No", "Bütçe Kalemi", "Birim Fiyat (TL)", "Toplam (TL)"],
+          ["1", "Sarf malzeme", "500,00 TL", "1.000,00 TL"],
+          ["2", "Seyahat", "750,00", "1.500,00"],
+          [None, None, None, None],
+          ["", "TOPLAM", "", "2.500,00 TL"]]
+
+def test_budget_amount_column_is_total_not_unit_price():
+    assert parse_budget_rows([BUDGET]) == [BudgetRow("Sarf malzeme", 1000.0), BudgetRow("Seyahat", 1500.0), BudgetRow("TOPLAM", 2500.0, True)]
+
+def test_budget_continuation_table_uses_previous_columns():
+    continued = [["3", "Analiz\nhizmeti", "250,00", "250,00 TL"], ["", "GENEL TOPLAM", "", "2.750,00 TL"]]
+    rows = parse_budget_rows([BUDGET[:3], continued])
+    assert rows[2:] == [BudgetRow("Analiz hizmeti", 250.0), BudgetRow("GENEL TOPLAM", 2750.0, True)]
+
+def test_budget_ignores_unrelated_tables():
+    assert parse_budget_rows([[["Risk", "B Planı"], ["Gecikme", "Takvim kaydırılır"]]]) == []
+
+def test_work_plan_rows():
+    table = [["İP No", "İş Paketinin Adı", "Zaman Aralığı (Ay)", "Sorumlu"],
+             ["İP1", "Numune üretimi", "1-3", "Bursiyer"],
+             ["İP 2", "Modelleme", "4 – 6", "Bursiyer"],
+             ["İP-3", "Ölçüm", "7", "Danışman"],
+             ["", "Ara rapor", "", ""]]
+    assert parse_work_plan_rows([table]) == [WorkPackageRow("İP1", "Numune üretimi", (1, 3)), WorkPackageRow("İP2", "Modelleme", (4, 6)),
+                                             WorkPackageRow("İP3", "Ölçüm", (7, 7))]
+
+def test_work_plan_continuation_and_unreadable_months():
+    header = [["İP No", "İş Paketinin Adı", "Zaman Aralığı (Ay)"], ["İP1", "Tarama", "1-2"]]
+    rows = parse_work_plan_rows([header, [["İP2", "Deney", "üçüncü ay"]]])
+    assert rows[1] == WorkPackageRow("İP2", "Deney", None)
+
+def _tables(pdf_bytes: bytes):
+    validator = TubitakFormValidator()
+    document = validator.extract_document(pdf_bytes)
+    _, bounds = validator._split_sections(document.text, document.spans)
+    return validator._table_loader(pdf_bytes, document.text, document.page_offsets, bounds)
+
+def test_synthetic_tables_are_read_from_pdf(proposal):
+    load = _tables(proposal(pages=10, tables=True))
+    budget = load("butce")
+    # Birim fiyat sütunu (700 TL) toplama karışmaz: 6 × 1.400 TL = 8.400 TL.
+    assert [row.amount for row in budget] == [1400.0] * 6 + [8400.0]
+    assert budget[-1].is_total
+    assert [(row.package, row.months) for row in load("is_zaman_cizelgesi")] == [("İP1", (1, 3)), ("İP2", (3, 6)), ("İP3", (6, 10)), ("İP4", (10, 12))]
+
+def test_synthetic_table_findings(proposal):
+    validator = TubitakFormValidator()
+    results = validator.validate_document(proposal(pages=10, tables=True))
+    assert results["butce"].findings == [] and results["is_zaman_cizelgesi"].findings == []
+    results = validator.validate_document(proposal(pages=10, tables=True, malformed=("butce", "is_zaman_cizelgesi")))
+    assert ("butce.limit_asimi", (12000.0, 9000.0)) in results["butce"].findings
+    assert ("is_zaman_cizelgesi.sure_asimi", ("İP3", 14, 12)) in results["is_zaman_cizelgesi"].findings
+    assert not results["butce"].is_valid
@@ -0,0 +1,2363 @@
+# ==============================================================================
+# TÜBİTAK 2209-A DOĞRULAMA ÇEKİRDEĞİ
+# Streamlit'ten bağımsızdır; arayüz, komut satırı ve toplu işlem tarafından ortak kullanılır.
+# ==============================================================================
+import re
+import csv
+import string
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, NamedTuple, Tuple, Iterator, Callable, Iterable, Union
+import os
+from io import BytesIO, StringIO
+from collections import Counter, OrderedDict, deque
+import datetime
+import hashlib
+import json
+import threading
+import time
+import copy
+import bisect
+import contextlib
+import signal
+import functools
+import importlib
+import importlib.util
+import math
+import mmap
+import tempfile
+import weakref
+import sys
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+# ==============================================================================
+# KÜTÜPHANE KONTROLLERİ
+# ==============================================================================
+# PDF kütüphaneleri modül yüklenirken içe aktarılmaz, yalnızca kurulu olup olmadıkları kontrol edilir; ilk analizde
+# (veya `preload_pdf_libraries` ile önceden) yüklenirler. Arayüzün ilk çizimi böylece bu maliyeti beklemez.
+class _LazyModule:
+    """İlk öznitelik erişiminde içe aktarılan modül vekili."""
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self):
+        if self._module is None: self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+PDFPLUMBER_AVAILABLE = importlib.util.find_spec("pdfplumber") is not None
+PYMUPDF_AVAILABLE = importlib.util.find_spec("fitz") is not None
+pdfplumber = _LazyModule("pdfplumber")
+fitz = _LazyModule("fitz")  # PyMuPDF
+
+def preload_pdf_libraries(extraction_engine: str = "pymupdf") -> Dict[str, float]:
+    """Motorun ihtiyaç duyduğu PDF kütüphanelerini şimdi yükler; yeni yüklenenlerin içe aktarma süresini (saniye) döndürür."""
+    wanted = [("fitz", fitz, PYMUPDF_AVAILABLE)]
+    if extraction_engine == "pdfplumber": wanted.append(("pdfplumber", pdfplumber, PDFPLUMBER_AVAILABLE))
+    timings = {}
+    for name, module, available in wanted:
+        if not available or module.loaded: continue
+        started = time.perf_counter()
+        module.load()
+        timings[name] = time.perf_counter() - started
+    return timings
+
+# ==============================================================================
+# KURAL KATALOĞU (KARARLI KURAL KİMLİKLERİ)
+# ==============================================================================
+class Rule(NamedTuple):
+    """Bir bulgu türü: önem derecesi ("error" | "warning" | "suggestion"), Türkçe mesaj şablonu ve şablon parametrelerinin adları."""
+    severity: str
+    template: str
+    params: Tuple[str, ...] = ()
+
+class _MessageFormatter(string.Formatter):
+    # Şablonlarda ham değerler saklanır; "tl" tutarı, "atif" kaynak numaralarını, "title" metni başlık biçiminde yazar.
+    def format_field(self, value, format_spec):
+        if format_spec == "tl": return format_turkish_amount(value)
+        if format_spec == "atif": return ", ".join(f"[{n}]" for n in value)
+        if format_spec == "title": return str(value).title()
+        return super().format_field(value, format_spec)
+
+_MESSAGE_FORMATTER = _MessageFormatter()
+
+# Kimlikler "<bölüm anahtarı>.<kural>" biçimindedir ve değiştirilmez; yalnızca yeni kural eklenir.
+# Mesaj metni değişse de kimlik aynı kaldığı için raporlar metin ayrıştırmadan toplulaştırılabilir.
+RULES: Dict[str, Rule] = {
+    "belge.bolum_eksik": Rule("error", "Bu zorunlu bölüm belgede bulunamadı veya başlığı ('{desen}') tanınamadı.", ("desen",)),
+    "genel_bilgiler.ogrenci_adi_eksik": Rule("warning", "Başvuru Sahibinin Adı Soyadı alanı bulunamadı veya boş."),
+    "genel_bilgiler.ogrenci_adi_kelime_sayisi": Rule("warning", "Başvuru Sahibinin Adı Soyadı '{ad}' olarak algılandı. Genellikle 2 veya 3 kelimeden oluşmalıdır.", ("ad",)),
+    "genel_bilgiler.baslik_eksik": Rule("warning", "Araştırma Önerisinin Başlığı alanı bulunamadı veya çok kısa."),
+    "genel_bilgiler.danisman_adi_eksik": Rule("warning", "Danışmanın Adı Soyadı alanı bulunamadı veya boş."),
+    "genel_bilgiler.birden_fazla_danisman": Rule("warning", "Danışman Adı Soyadı '{ad}' olarak algılandı. Birden fazla danışman ismi yazılmış olabilir. Sadece bir danışman belirtilmelidir.", ("ad",)),
+    "genel_bilgiler.kurum_eksik": Rule("warning", "Araştırmanın Yürütüleceği Kurum/Kuruluş alanı bulunamadı."),
+    "genel_bilgiler.kurum_universite_yok": Rule("error", "Kurum/Kuruluş alanında 'Üniversitesi' ifadesi geçmiyor. Sadece üniversitenizin tam adı yazılmalıdır."),
+    "genel_bilgiler.kurum_alt_birim": Rule("warning", "Kurum/Kuruluş alanında '{ifade}' kelimesi algılandı. Bu alana fakülte/bölüm gibi detaylar yazılmamalıdır.", ("ifade",)),
+    "ozet.kelime_sayisi": Rule("warning", "Özet bölümü {kelime} kelime. Genellikle 100-250 kelime arasında olması beklenir. Çok kısa veya çok uzun özetler projenin ana hatlarını etkili bir şekilde yansıtmayabilir.", ("kelime",)),
+    "ozet.anahtar_kelime_eksik": Rule("error", "Anahtar Kelimeler bölümü bulunamadı."),
+    "ozet.anahtar_kelime_sayisi": Rule("error", "Anahtar kelime sayısı ({sayi}) ideal aralıkta değil. 3 ila 5 anahtar kelime belirtilmelidir.", ("sayi",)),
+    "ozgun_deger.kisa": Rule("warning", "Özgün Değer bölümü nispeten kısa ({kelime} kelime). Konunun önemini, literatürdeki boşluğu ve projenizin bu boşluğu nasıl dolduracağını detaylı referanslarla açıklamanız beklenir.", ("kelime",)),
+    "ozgun_deger.az_atif": Rule("warning", "Bu bölümde {atif} adet referans [1] formatında bulundu. Literatürdeki mevcut durumu ve eksiklikleri göstermek için daha fazla atıf yapılması genellikle beklenir.", ("atif",)),
+    "ozgun_deger.ozgunluk_ifadeleri": Rule("suggestion", "Bu bölümde 'literatürdeki eksiklik', 'bu çalışmanın farkı', 'özgünlüğü', 'araştırma sorusu', 'hipotez' gibi ifadelere yer vererek projenizin yenilikçi yönünü vurguladığınızdan emin olun."),
+    "amac_ve_hedefler.amac_ifadesi_yok": Rule("warning", "Projenin genel amacı net bir şekilde 'Projenin amacı...' ifadesiyle belirtilmemiş olabilir."),
+    "amac_ve_hedefler.az_hedef": Rule("warning", "Hedefler maddeler halinde belirtilmemiş veya az sayıda ({madde} adet) hedef belirtilmiş. Hedeflerinizi ölçülebilir ve net adımlar olarak maddelendirmeniz önerilir.", ("madde",)),
+    "yontem.kisa": Rule("warning", "Yöntem bölümü çok kısa ({kelime} kelime). Proje hedeflerine ulaşmak için izlenecek yolu, kullanılacak teknikleri, materyalleri ve veri analiz süreçlerini detaylı bir şekilde açıklamanız beklenir.", ("kelime",)),
+    "yontem.atif_yok": Rule("suggestion", "Yöntem bölümünde kullandığınız spesifik metotlara veya yaklaşımlara referans vermek, metodolojinizin sağlamlığını artırabilir."),
+    "yontem.teori_yazilim_standart": Rule("suggestion", "Kullanacağınız spesifik teorileri (örn: DFT, FEM), yazılımları (örn: VASP, SPSS, MATLAB) ve standartları (örn: ISO, ASTM) açıkça belirttiğinizden emin olun."),
+    "is_zaman_cizelgesi.yasakli_is_paketi": Rule("error", "'{ifade:title}' gibi ifadeler tek başına bir iş paketi olarak kabul edilmez. İş paketleri projenin bilimsel/teknik adımları olmalıdır.", ("ifade",)),
+    "is_zaman_cizelgesi.ters_ay_araligi": Rule("warning", "{paket} için zaman aralığı ({baslangic}-{bitis}. ay) ters yazılmış görünüyor.", ("paket", "baslangic", "bitis")),
+    "is_zaman_cizelgesi.sure_asimi": Rule("warning", "{paket} {bitis}. aya kadar sürüyor. Proje süresi en fazla {azami} aydır.", ("paket", "bitis", "azami")),
+    "risk_yonetimi.b_plani_yok": Rule("warning", "Riskler için bir 'B Planı' belirtilmemiş. Her olası risk için alternatif bir çözüm yolu (B Planı) sunulmalıdır."),
+    "risk_yonetimi.kisa": Rule("warning", "Risk Yönetimi bölümü çok kısa. Her iş paketi için potansiyel bir risk ve bu riske yönelik bir B planı tanımlanmalıdır."),
+    "yaygin_etki.kisa": Rule("warning", "Yaygın Etki bölümü yeterince detaylı değil. Proje çıktılarının (makale, bildiri, patent, sosyal katkı vb.) neler olabileceğini belirtmeniz beklenir."),
+    "yaygin_etki.cikti_belirtilmemis": Rule("suggestion", "Akademik çıktılar (makale, bildiri vb.) beklenmiyorsa bile bunu 'proje kapsamında akademik bir yayın hedeflenmemektedir' şeklinde açıkça belirtmeniz faydalı olabilir."),
+    "butce.toplam_uyusmazligi": Rule("warning", "Bütçe tablosundaki TOPLAM ({toplam:tl}) kalemlerin toplamıyla ({kalemler:tl}) uyuşmuyor.", ("toplam", "kalemler")),
+    "butce.toplam_bulunamadi": Rule("warning", "'TOPLAM' bütçe değeri bulunamadı veya '0' olarak hesaplandı."),
+    "butce.limit_asimi": Rule("error", "Toplam talep ({toplam:tl}) program limiti olan {limit:tl}'yi aşıyor.", ("toplam", "limit")),
+    "butce.sayilar_okunamadi": Rule("warning", "Bütçe tablosundaki sayılar okunamadı. Formatı kontrol edin. Hata: {hata}", ("hata",)),
+    "butce.yasakli_kalem": Rule("warning", "Bütçede '{kalem:title}' algılandı. Genel amaçlı demirbaşlar genellikle desteklenmez.", ("kalem",)),
+    "kaynaklar.az_kaynak": Rule("warning", "Kaynaklar listesi çok kısa ({kaynak} adet). Özgün Değer bölümünde yapılan atıflarla tutarlı, yeterli sayıda kaynak listelenmelidir.", ("kaynak",)),
+    "kaynaklar.eksik_kaynak": Rule("warning", "Özgün Değer bölümünde atıf yapılan {numaralar:atif} numaralı kaynak(lar) Kaynaklar listesinde bulunamadı.", ("numaralar",)),
+    "format.pymupdf_yok": Rule("warning", "Format analizi için `PyMuPDF` kütüphanesi kurulamamış."),
+    "format.sayfa_siniri": Rule("warning", "Belge toplam {sayfa} sayfa. Ekler hariç 20 sayfa sınırı olduğunu unutmayın.", ("sayfa",)),
+    "format.metin_katmani_yok": Rule("error", "Belgeden metin formatı bilgisi alınamadı. Belge taranmış bir resim olabilir veya metin katmanı içermiyor olabilir."),
+    "format.punto": Rule("warning", "Metnin genel punto boyutu '{punto}' olarak algılandı. Tavsiye edilen '9' puntodur.", ("punto",)),
+    "format.yazi_tipi": Rule("warning", "Metnin genel yazı tipi '{yazi_tipi}' olarak algılandı. Tavsiye edilen 'Arial'dir.", ("yazi_tipi",)),
+    "format.dominant_format": Rule("suggestion", "Algılanan dominant format: {yazi_tipi:title}, {punto} punto ({incelenen}/{sayfa} sayfa incelendi, güven: %{guven:.1f}).",
+                                   ("yazi_tipi", "punto", "incelenen", "sayfa", "guven")),
+    "format.analiz_hatasi": Rule("error", "Format analizi sırasında bir hata oluştu: {hata}", ("hata",)),
+    "format.proje_tipi": Rule("suggestion", "Projenizin '{tip}' alanında olduğu tahmin edilmektedir. Değerlendirmelerinizin bu alanın dinamiklerine uygun olduğundan emin olun.", ("tip",)),
+}
+
+class Finding(NamedTuple):
+    """Tek bir bulgu: kural kimliği ve şablon parametrelerinin değerleri (Rule.params sırasıyla). Mesaj metni saklanmaz, şablondan üretilir."""
+    rule: str
+    params: tuple = ()
+
+    @property
+    def severity(self) -> str:
+        return RULES[self.rule].severity
+
+    @property
+    def named_params(self) -> Dict[str, object]:
+        return dict(zip(RULES[self.rule].params, self.params))
+
+    @property
+    def message(self) -> str:
+        return _MESSAGE_FORMATTER.format(RULES[self.rule].template, **self.named_params)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"rule": self.rule, "severity": self.severity, "params": self.named_params}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Finding":
+        # JSON'dan gelen listeler, bulgular kümelerde karşılaştırılabilsin diye demete çevrilir.
+        params = data.get("params") or {}
+        return cls(data["rule"], tuple(tuple(v) if isinstance(v, list) else v for v in (params[name] for name in RULES[data["rule"]].params)))
+
+SEVERITIES = ("error", "warning", "suggestion")
+
+# ==============================================================================
+# VERİ YAPISI
+# ==============================================================================
+class DocumentValidationError(Exception):
+    """Belgenin analiz edilemediğini (bozuk PDF, metin katmanı yok vb.) bildiren hata."""
+
+class DocumentLimitExceeded(DocumentValidationError):
+    """Belge yalıtılmış alt süreçte süre veya bellek sınırını aştı ya da alt süreç çöktü."""
+
+class DocumentTimeout(BaseException):
+    """Belge süre sınırını aştı. Doğrulayıcıdaki `except Exception` blokları tarafından yutulmaması için BaseException'dan türetilir."""
+
+def _raise_timeout(signum, frame):
+    raise DocumentTimeout()
+
+@contextlib.contextmanager
+def document_deadline(seconds: Optional[float]):
+    """Blok `seconds` saniyede bitmezse (SIGALRM ile) `DocumentTimeout` fırlatır; yalnızca ana iş parçacığında kullanılabilir."""
+    # SIGALRM yalnızca POSIX'te vardır; diğer platformlarda süre sınırı uygulanmaz.
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield; return
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def kill_process_pool(pool: ProcessPoolExecutor):
+    """Havuzdaki işçi süreçleri öldürür ve havuzu beklemeden kapatır. Süre sınırı (SIGALRM) C kodunda takılı kalan bir
+    işçiyi durduramayabilir; yönetici süreç bu durumda havuzu bu şekilde bırakıp yenisini açar."""
+    for process in list((pool._processes or {}).values()):
+        if process.is_alive(): process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+@dataclass
+class ValidationResult:
+    """Bir doğrulama bölümünün sonuçlarını tutan veri yapısı. Bulgular kural kimliği ve parametreleriyle saklanır;
+    errors/warnings/suggestions mesaj listeleri bunlardan üretilir (her erişimde yeniden; sık kullanılacaksa bir kez alınmalıdır)."""
+    section_name: str
+    findings: List[Finding] = field(default_factory=list)
+
+    def add(self, rule: str, **params):
+        """Kataloğdaki bir kuralı parametreleriyle ekler; eksik veya fazla parametre KeyError/TypeError verir."""
+        names = RULES[rule].params
+        if len(params) != len(names): raise TypeError(f"{rule} kuralı {names} parametrelerini bekler, verilen: {tuple(params)}")
+        self.findings.append(Finding(rule, tuple(params[name] for name in names)))
+
+    def messages(self, severity: str) -> List[str]:
+        return [f.message for f in self.findings if f.severity == severity]
+
+    def has(self, severity: str) -> bool:
+        """Bu önem derecesinde bulgu var mı (mesaj üretmeden)."""
+        return any(f.severity == severity for f in self.findings)
+
+    @property
+    def is_valid(self) -> bool:
+        """Bölümde hata düzeyinde bulgu yoksa True."""
+        return not self.has("error")
+
+    @property
+    def errors(self) -> List[str]: return self.messages("error")
+    @property
+    def warnings(self) -> List[str]: return self.messages("warning")
+    @property
+    def suggestions(self) -> List[str]: return self.messages("suggestion")
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON kaydı: eski düz mesaj listeleri korunur, yanına kural kimlikli bulgular eklenir."""
+        return {"section_name": self.section_name, "is_valid": self.is_valid,
+                **{f"{severity}s": self.messages(severity) for severity in SEVERITIES},
+                "findings": [f.to_dict() for f in self.findings]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ValidationResult":
+        return cls(data["section_name"], [Finding.from_dict(f) for f in data.get("findings", ())])
+
+class TextSpan(NamedTuple):
+    """PyMuPDF span'inin format bilgisi ve metin içindeki konumu."""
+    page: int
+    font: str
+    size: float
+    flags: int
+    start: int
+    end: int
+
+@dataclass
+class ExtractedDocument:
+    """Belgenin tek geçişte çıkarılmış metni, span format bilgisi ve sayfa sınırları."""
+    text: str
+    spans: List[TextSpan] = field(default_factory=list)
+    page_offsets: List[int] = field(default_factory=list)
+    engine: str = "pymupdf"
+    # Tablo çıkarma gibi sonradan PDF'e dönmesi gereken aşamalar için belgenin kaynağı.
+    source: "Optional[PdfInput]" = field(default=None, repr=False, compare=False)
+
+    @property
+    def page_count(self) -> int:
+        return max(len(self.page_offsets) - 1, 0)
+
+    def page_text(self, page_no: int) -> str:
+        return self.text[self.page_offsets[page_no]:self.page_offsets[page_no + 1]]
+
+    def spans_on_page(self, page_no: int) -> List[TextSpan]:
+        """Sayfanın span'leri (span'ler sayfa sırasında olduğundan ikili arama ile, kopya liste oluşturmadan sınırlar bulunur)."""
+        return self.spans[self._first_span_index(page_no):self._first_span_index(page_no + 1)]
+
+    def iter_page_spans(self, page_no: int) -> Iterator[TextSpan]:
+        spans = self.spans
+        for i in range(self._first_span_index(page_no), self._first_span_index(page_no + 1)): yield spans[i]
+
+    def _first_span_index(self, page_no: int) -> int:
+        lo, hi = 0, len(self.spans)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.spans[mid].page < page_no: lo = mid + 1
+            else: hi = mid
+        return lo
+
+# ==============================================================================
+# RAPOR ÇIKTISI
+# ==============================================================================
+def format_results_for_download(results: Dict[str, ValidationResult]) -> str:
+    """Analiz sonuçlarını .txt dosyası için formatlar."""
+    report_lines = []
+    report_lines.append("TÜBİTAK 2209-A PROJE ÖN DEĞERLENDİRME RAPORU")
+    report_lines.append(f"Rapor Tarihi: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report_lines.append("="*50)
+    
+    for result in results.values():
+        report_lines.append(f"\n--- {result.section_name.upper()} ---")
+        if not result.errors and not result.warnings:
+            report_lines.append(">> Bu bölümde önemli bir sorun veya uyarı tespit edilmedi.")
+        
+        if result.errors:
+            report_lines.append("\n[KRİTİK HATALAR]")
+            for e in result.errors: report_lines.append(f"  - {e}")
+        
+        if result.warnings:
+            report_lines.append("\n[ÖNEMLİ UYARILAR]")
+            for w in result.warnings: report_lines.append(f"  - {w}")
+            
+        if result.suggestions:
+            report_lines.append("\n[İYİLEŞTİRME ÖNERİLERİ]")
+            for s in result.suggestions: report_lines.append(f"  - {s}")
+            
+    report_lines.append("\n\n" + "="*50)
+    report_lines.append("Yasal Uyarı: Bu rapor, resmi bir TÜBİTAK değerlendirmesi değildir. Yalnızca başvuru sahiplerine yardımcı olmak amacıyla hazırlanmış bir ön kontrol sistemidir.")
+    return "\n".join(report_lines)
+
+def format_results_as_json(results: Dict[str, ValidationResult]) -> str:
+    """Sonuçları kural kimlikli bulgularla JSON olarak dışa aktarır; toplulaştırma `findings[].rule` üzerinden yapılır."""
+    counts = Counter(f.severity for result in results.values() for f in result.findings)
+    return json.dumps({"ruleset_version": RULESET_VERSION, "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "counts": {severity: counts[severity] for severity in SEVERITIES},
+                       "sections": {key: result.to_dict() for key, result in results.items()}}, ensure_ascii=False, indent=2)
+
+CSV_COLUMNS = ("section", "section_name", "rule", "severity", "params", "message")
+
+def format_results_as_csv(results: Dict[str, ValidationResult]) -> str:
+    """Her bulgu bir satır: bölüm, kural kimliği, önem derecesi, JSON parametreler ve okunabilir mesaj."""
+    out = StringIO()
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    for key, result in results.items():
+        for f in result.findings:
+            writer.writerow((key, result.section_name, f.rule, f.severity, json.dumps(f.named_params, ensure_ascii=False), f.message))
+    return out.getvalue()
+
+# ==============================================================================
+# PDF KAYNAĞI (KOPYASIZ YÜKLEME YOLU)
+# ==============================================================================
+class UploadTooLarge(DocumentValidationError):
+    """Yüklenen dosya izin verilen en büyük boyutu aşıyor; belge hiç ayrıştırılmaz."""
+
+# Bu boyutun üzerindeki yüklemeler bellekte tutulmaz, bir kez geçici dosyaya yazılıp mmap ile okunur.
+DEFAULT_SPOOL_THRESHOLD = 4 * 1024 * 1024
+
+class PdfSource:
+    """Bir PDF'in tek kopyası: küçük belgeler bellekteki baytlarıyla, büyükleri diskteki dosyalarıyla (mmap) tutulur.
+
+    Okuyucular (PyMuPDF, pdfplumber, özet hesabı) aynı belleği `view()` ile kopyasız paylaşır. Alt süreçlere dosyada
+    tutulan kaynağın yalnızca yolu gönderilir; alt süreç dosyayı kendisi eşler. Sahip olunan geçici dosya `close()` ile
+    (veya nesne toplandığında) silinir.
+    """
+    def __init__(self, data: Optional[bytes] = None, path: Optional[str] = None, owned: bool = False):
+        self.data = data
+        self.path = path
+        self._mmap: Optional[mmap.mmap] = None
+        self._digest: Optional[str] = None
+        self._size = len(data) if data is not None else os.path.getsize(path)
+        self._finalizer = weakref.finalize(self, _remove_file, path) if owned and path else None
+
+    @classmethod
+    def spool(cls, stream, size: Optional[int] = None, spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+              max_bytes: Optional[int] = None, tmp_dir: Optional[str] = None) -> "PdfSource":
+        """Yükleme akışından kaynak oluşturur; `max_bytes` aşılırsa okuma yarıda kesilir ve `UploadTooLarge` fırlatılır."""
+        if max_bytes is not None and size is not None and size > max_bytes: raise UploadTooLarge(_too_large_message(size, max_bytes))
+        stream.seek(0)
+        if size is not None and size <= spool_threshold:
+            # Streamlit'in yükleme tamponu (BytesIO) getvalue() ile kopyalanmadan paylaşılır.
+            data = stream.getvalue() if hasattr(stream, "getvalue") else stream.read(size + 1)
+            if max_bytes is not None and len(data) > max_bytes: raise UploadTooLarge(_too_large_message(len(data), max_bytes))
+            return cls(data=data)
+        fd, path = tempfile.mkstemp(prefix="tubitak-", suffix=".pdf", dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                written = 0
+                for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                    written += len(chunk)
+                    if max_bytes is not None and written > max_bytes: raise UploadTooLarge(_too_large_message(written, max_bytes))
+                    f.write(chunk)
+        except BaseException:
+            _remove_file(path); raise
+        return cls(path=path, owned=True)
+
+    @classmethod
+    def from_path(cls, path: str) -> "PdfSource":
+        return cls(path=path)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def view(self) -> memoryview:
+        if self.data is not None: return memoryview(self.data)
+        if not self._size: return memoryview(b"")
+        if self._mmap is None:
+            with open(self.path, "rb") as f: self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None: self._digest = hashlib.sha256(self.view()).hexdigest()
+        return self._digest
+
+    def close(self):
+        if self._mmap is not None:
+            try: self._mmap.close()
+            except BufferError: pass  # Açık bir belge hâlâ görünümü kullanıyor; eşleme nesneyle birlikte kapanır.
+            self._mmap = None
+        if self._finalizer is not None: self._finalizer()
+
+    def __enter__(self) -> "PdfSource":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # Alt süreçlere eşleme değil, yol (veya küçük belgelerde baytlar) gönderilir; dosyayı silme sorumluluğu gönderende kalır.
+        return {"data": self.data, "path": self.path, "size": self._size, "digest": self._digest}
+
+    def __setstate__(self, state):
+        self.data, self.path, self._size, self._digest = state["data"], state["path"], state["size"], state["digest"]
+        self._mmap = None
+        self._finalizer = None
+
+def _remove_file(path: str):
+    try: os.remove(path)
+    except OSError: pass
+
+def _too_large_message(size: int, max_bytes: int) -> str:
+    return f"Dosya çok büyük ({size / (1024 * 1024):.1f} MB). En fazla {max_bytes / (1024 * 1024):.3g} MB boyutunda PDF yüklenebilir."
+
+PdfInput = Union[bytes, memoryview, PdfSource]
+
+def pdf_buffer(pdf: PdfInput):
+    return pdf.view() if isinstance(pdf, PdfSource) else pdf
+
+def open_pdf(pdf: PdfInput):
+    """Belgeyi kopyasız açar: PyMuPDF baytları veya `memoryview`ı doğrudan kullanır."""
+    return fitz.open(stream=pdf_buffer(pdf), filetype="pdf")
+
+def pdf_digest(pdf: PdfInput) -> str:
+    return pdf.digest if isinstance(pdf, PdfSource) else hashlib.sha256(pdf).hexdigest()
+
+# ==============================================================================
+# METİN VE FORMAT ÇIKARMA (TEK GEÇİŞ)
+# ==============================================================================
+# fitz.TEXT_PRESERVE_LIGATURES | TEXT_PRESERVE_WHITESPACE | TEXT_MEDIABOX_CLIP; sabit yazılır ki modül yüklenirken fitz içe aktarılmasın.
+SPAN_TEXT_FLAGS = 1 | 2 | 64
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_font_name(font: str) -> str:
+    return font.split('-')[0].split('+')[-1].lower()
+
+def _extract_page_content(page, page_no: int, offset: int = 0) -> tuple:
+    """Sayfanın span sözlüğünü bir kez dolaşır; sayfa metnini ve `offset`e göre konumlanmış span listesini döndürür."""
+    parts: List[str] = []
+    spans: List[TextSpan] = []
+    pos = offset
+    for block in page.get_text("dict", flags=SPAN_TEXT_FLAGS, sort=True)["blocks"]:
+        for line in block.get("lines", ()):
+            for s in line["spans"]:
+                span_text = s["text"]
+                # Yazı tipi adları binlerce span'de tekrarlandığından tek bir dize nesnesi paylaşılır.
+                spans.append(TextSpan(page_no, sys.intern(s["font"]), s["size"], s["flags"], pos, pos + len(span_text)))
+                parts.append(span_text)
+                pos += len(span_text)
+            parts.append("\n")
+            pos += 1
+    return "".join(parts), spans
+
+def _extract_pages(doc, start: int, stop: int) -> Tuple[List[str], List[TextSpan]]:
+    """[start, stop) sayfalarını çıkarır; span konumları bu aralığın birleştirilmiş metnine göredir."""
+    texts: List[str] = []
+    spans: List[TextSpan] = []
+    pos = 0
+    for page_no in range(start, stop):
+        page_text, page_spans = _extract_page_content(doc[page_no], page_no, pos)
+        texts.append(page_text)
+        spans.extend(page_spans)
+        pos += len(page_text) + 1
+    return texts, spans
+
+def _extract_page_range(pdf_bytes: PdfInput, start: int, stop: int) -> Tuple[List[str], List[TextSpan]]:
+    """İşçi süreç girişi: belgeyi kendi tanıtıcısıyla açar ve yalnızca verilen sayfa aralığını çıkarır."""
+    with open_pdf(pdf_bytes) as doc:
+        return _extract_pages(doc, start, stop)
+
+def _split_page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    parts = max(1, min(parts, page_count))
+    bounds = [page_count * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+def _assemble_document(chunks: List[Tuple[List[str], List[TextSpan]]], engine: str = "pymupdf") -> ExtractedDocument:
+    """Sayfa sırasına göre gelen aralık sonuçlarını birleştirir; span konumlarını tam metne göre kaydırır."""
+    texts: List[str] = []
+    spans: List[TextSpan] = []
+    page_offsets: List[int] = []
+    pos = 0
+    for chunk_texts, chunk_spans in chunks:
+        if pos: spans.extend(s._replace(start=s.start + pos, end=s.end + pos) for s in chunk_spans)
+        else: spans.extend(chunk_spans)
+        for page_text in chunk_texts:
+            page_offsets.append(pos)
+            pos += len(page_text) + 1
+        texts.extend(chunk_texts)
+    text = "\n".join(texts)
+    page_offsets.append(len(text))
+    return ExtractedDocument(text=text, spans=spans, page_offsets=page_offsets, engine=engine)
+
+def _iter_page_contents(pdf_bytes: PdfInput, page_keys: Optional[List[str]] = None,
+                        page_cache: Optional["PageExtractionCache"] = None) -> Iterator[Tuple[str, List[TextSpan]]]:
+    """Sayfaları sırayla çıkarır; span konumları, sayfaların "\\n" ile birleştirilmiş tam metnine göredir.
+
+    `page_keys` verilirse her sayfanın içerik özeti listeye eklenir ve sayfa, özetiyle sayfa önbelleğinden alınır
+    (önbellekte yoksa eklenir); sonraki sürüm bu sayfaları yeniden çıkarmaz. `extract_document_incremental` de bu döngüyü kullanır.
+    """
+    if not PYMUPDF_AVAILABLE: raise ImportError("`PyMuPDF` kütüphanesi gerekli.")
+    pos = 0
+    try:
+        with open_pdf(pdf_bytes) as doc:
+            for page_no in range(len(doc)):
+                page = doc[page_no]
+                if page_keys is None:
+                    page_text, page_spans = _extract_page_content(page, page_no, pos)
+                else:
+                    key = page_content_key(doc, page)
+                    page_keys.append(key)
+                    content = page_cache.get(key) if page_cache is not None else None
+                    if content is None:
+                        content = _extract_page_content(page, 0)
+                        if page_cache is not None: page_cache.put(key, content)
+                    page_text, relative_spans = content
+                    page_spans = [s._replace(page=page_no, start=s.start + pos, end=s.end + pos) for s in relative_spans]
+                pos += len(page_text) + 1
+                yield page_text, page_spans
+    except Exception as e:
+        raise DocumentValidationError(f"PDF'ten metin çıkarılırken hata oluştu: {e}") from e
+
+# Bu sayfa sayısının altındaki belgelerde süreçler arası aktarım maliyeti kazançtan büyüktür.
+PARALLEL_PAGE_THRESHOLD = 30
+
+def extract_document_pymupdf(pdf_bytes: PdfInput, executor: Optional[Executor] = None, workers: int = 0,
+                             page_threshold: int = PARALLEL_PAGE_THRESHOLD) -> ExtractedDocument:
+    """Belgeyi bir kez açar, her sayfanın span sözlüğünü bir kez dolaşarak metin, format ve sayfa sınırlarını birlikte üretir.
+
+    `executor` verilmişse ve belge `page_threshold` sayfadan uzunsa sayfa aralıkları işçi süreçlere dağıtılır;
+    her işçi belgeyi kendisi açar. Sonuç seri yol ile birebir aynıdır.
+    """
+    with open_pdf(pdf_bytes) as doc:
+        page_count = len(doc)
+        if executor is None or workers < 2 or page_count < page_threshold:
+            return _assemble_document([_extract_pages(doc, 0, page_count)])
+    futures = [executor.submit(_extract_page_range, pdf_bytes, start, stop) for start, stop in _split_page_ranges(page_count, workers)]
+    return _assemble_document([future.result() for future in futures])
+
+def extract_document_pdfplumber(pdf_bytes: PdfInput) -> ExtractedDocument:
+    """Eski pdfplumber motoru: metni pdfplumber'dan alır, format bilgisi için (varsa) PyMuPDF span geçişini kullanır."""
+    on_disk = isinstance(pdf_bytes, PdfSource) and pdf_bytes.data is None
+    with pdfplumber.open(pdf_bytes.path if on_disk else BytesIO(pdf_buffer(pdf_bytes))) as pdf:
+        texts = [page.extract_text(x_tolerance=1, y_tolerance=1) or "" for page in pdf.pages]
+    page_offsets: List[int] = []
+    pos = 0
+    for page_text in texts:
+        page_offsets.append(pos)
+        pos += len(page_text) + 1
+    text = "\n".join(texts)
+    page_offsets.append(len(text))
+    spans = extract_document_pymupdf(pdf_bytes).spans if PYMUPDF_AVAILABLE else []
+    return ExtractedDocument(text=text, spans=spans, page_offsets=page_offsets, engine="pdfplumber")
+
+def page_content_key(doc, page) -> str:
+    """Sayfanın içerik akışlarının (ve çizdiği form nesnelerinin) ham baytlarından, yazı tiplerinden ve boyutundan üretilen özet.
+
+    Düzenlenmemiş sayfaların içerik akışı yeni sürümde aynı kalır; yazı tipi alt küme önekleri (ABCDEF+Arial) her dışa
+    aktarmada değişebildiğinden özete katılmaz.
+    """
+    contents = page.read_contents()
+    digest = hashlib.blake2b(contents, digest_size=16)
+    xobjects = page.get_xobjects()
+    for xobject in xobjects: digest.update(doc.xref_stream_raw(xobject[0]) or b"")
+    # Sayfalar kaynak sözlüğünü paylaşabildiğinden (form nesnesi yoksa) yalnızca içerik akışında adı geçen yazı tipleri hesaba katılır.
+    fonts = sorted((f[4], f[3].split("+")[-1], f[2], f[5]) for f in page.get_fonts() if xobjects or f"/{f[4]}".encode() in contents)
+    digest.update(repr((tuple(page.rect), page.rotation, fonts)).encode())
+    return digest.hexdigest()
+
+def extract_document_incremental(pdf_bytes: PdfInput, page_cache: Optional["PageExtractionCache"] = None) -> Tuple[ExtractedDocument, List[str]]:
+    """`extract_document_pymupdf` ile aynı belgeyi üretir; içerik özeti önbellekte bulunan sayfalar yeniden çıkarılmaz.
+
+    Sayfalar akışlı yolla aynı döngüden (`_iter_page_contents`) gelir; sayfa özetleri de döndürülür (sürümler arası hangi
+    sayfaların değiştiğini bulmak için).
+    """
+    keys: List[str] = []
+    texts: List[str] = []
+    spans: List[TextSpan] = []
+    page_offsets: List[int] = []
+    pos = 0
+    for page_text, page_spans in _iter_page_contents(pdf_bytes, keys, page_cache):
+        texts.append(page_text)
+        spans.extend(page_spans)
+        page_offsets.append(pos)
+        pos += len(page_text) + 1
+    text = "\n".join(texts)
+    page_offsets.append(len(text))
+    return ExtractedDocument(text=text, spans=spans, page_offsets=page_offsets), keys
+
+# ==============================================================================
+# FORMAT ANALİZİ (AKIŞLI, ÖRNEKLEMELİ HİSTOGRAM)
+# ==============================================================================
+@dataclass
+class FormatSampling:
+    """Format analizi için sayfa örnekleme bütçesi.
+
+    `full_scan_pages` sayfaya kadar olan belgelerin (program sınırı 20 sayfa) her sayfası incelenir; örnekleme yalnızca
+    daha uzun belgelerde uygulanır. Bunlarda `start_page`'ten başlayarak her `page_stride`. sayfa incelenir, en fazla
+    `max_pages` sayfa. En az `min_spans` span görüldükten sonra baskın yazı tipi ve punto `target_confidence` güvenine
+    ulaşırsa tarama erken durdurulur (`target_confidence=None` erken durdurmayı kapatır).
+    """
+    page_stride: int = 1
+    max_pages: Optional[int] = None
+    start_page: int = 0
+    min_spans: int = 400
+    target_confidence: Optional[float] = 0.999
+    full_scan_pages: int = 20
+
+    def sampled(self, page_count: int) -> bool:
+        return page_count > self.full_scan_pages
+
+    def pages(self, page_count: int) -> range:
+        if not self.sampled(page_count): return range(page_count)
+        stop = page_count
+        if self.max_pages is not None: stop = min(page_count, self.start_page + self.max_pages * max(self.page_stride, 1))
+        return range(min(self.start_page, page_count), stop, max(self.page_stride, 1))
+
+def _leader_confidence(counter: Counter) -> float:
+    """Baskın değerin ikinciden gerçekten fazla olduğuna dair güven (işaret testi, normal yaklaşım)."""
+    top = counter.most_common(2)
+    if not top: return 0.0
+    c1 = top[0][1]
+    c2 = top[1][1] if len(top) > 1 else 0
+    return 0.5 * (1 + math.erf((c1 - c2) / math.sqrt(2 * (c1 + c2))))
+
+class FormatHistogram:
+    """Yazı tipi ve punto sayaçlarını yerinde güncelleyen akışlı histogram; span listeleri oluşturmaz."""
+    __slots__ = ("fonts", "sizes", "span_count", "pages_seen")
+
+    def __init__(self):
+        self.fonts: Counter = Counter()
+        self.sizes: Counter = Counter()
+        self.span_count = 0
+        self.pages_seen = 0
+
+    def add_spans(self, spans: Iterable[TextSpan]):
+        fonts, sizes = self.fonts, self.sizes
+        n = 0
+        for s in spans:
+            fonts[_normalize_font_name(s.font)] += 1
+            sizes[round(s.size)] += 1
+            n += 1
+        self.span_count += n
+        self.pages_seen += 1
+
+    @property
+    def dominant_font(self) -> Optional[str]:
+        return self.fonts.most_common(1)[0][0] if self.fonts else None
+
+    @property
+    def dominant_size(self) -> Optional[int]:
+        return self.sizes.most_common(1)[0][0] if self.sizes else None
+
+    def confidence(self) -> float:
+        return min(_leader_confidence(self.fonts), _leader_confidence(self.sizes))
+
+    def settled(self, sampling: FormatSampling) -> bool:
+        return sampling.target_confidence is not None and self.span_count >= sampling.min_spans and self.confidence() >= sampling.target_confidence
+
+def build_format_histogram(document: ExtractedDocument, sampling: FormatSampling) -> FormatHistogram:
+    """Örnekleme bütçesindeki sayfaları sırayla histograma ekler; uzun belgelerde baskın format netleşince durur."""
+    histogram = FormatHistogram()
+    early_stop = sampling.sampled(document.page_count)
+    for page_no in sampling.pages(document.page_count):
+        histogram.add_spans(document.iter_page_spans(page_no))
+        if early_stop and histogram.settled(sampling): break
+    return histogram
+
+# ==============================================================================
+# SONUÇ ÖNBELLEĞİ (İÇERİK ADRESLİ)
+# ==============================================================================
+# Doğrulama kuralları değiştiğinde artırılmalıdır; eski önbellek kayıtları böylece geçersiz olur.
+RULESET_VERSION = "2209A-2025.5"
+
+def document_cache_key(pdf_bytes: PdfInput, ruleset_version: str = RULESET_VERSION, engine: str = "pymupdf") -> str:
+    return f"{pdf_digest(pdf_bytes)}-{ruleset_version}-{engine}"
+
+def _results_to_json(results: Dict[str, ValidationResult]) -> str:
+    return json.dumps({key: result.to_dict() for key, result in results.items()}, ensure_ascii=False)
+
+def _results_from_json(payload: str) -> Dict[str, ValidationResult]:
+    return {key: ValidationResult.from_dict(data) for key, data in json.loads(payload).items()}
+
+class ResultCache:
+    """Bellek içi LRU (boyut/TTL tahliyeli) ve isteğe bağlı disk katmanından oluşan, iş parçacığı güvenli sonuç önbelleği."""
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = 24 * 3600, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir: os.makedirs(disk_dir, exist_ok=True)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, ValidationResult]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, results = entry
+                if not self._expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(results)
+                del self._entries[key]
+        results = self._disk_get(key)
+        with self._lock:
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, results)
+        return copy.deepcopy(results)
+
+    def put(self, key: str, results: Dict[str, ValidationResult]):
+        results = copy.deepcopy(results)
+        with self._lock: self._store(key, results)
+        self._disk_put(key, results)
+
+    def _store(self, key: str, results: Dict[str, ValidationResult]):
+        self._entries[key] = (time.time(), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, ValidationResult]]:
+        if not self.disk_dir: return None
+        path = self._disk_path(key)
+        try:
+            if self._expired(os.path.getmtime(path)):
+                os.remove(path); return None
+            with open(path, "r", encoding="utf-8") as f:
+                return _results_from_json(f.read())
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _disk_put(self, key: str, results: Dict[str, ValidationResult]):
+        if not self.disk_dir: return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f: f.write(_results_to_json(results))
+            os.replace(tmp_path, path)
+        except OSError:
+            try: os.remove(tmp_path)
+            except OSError: pass
+
+    def clear(self):
+        with self._lock: self._entries.clear()
+
+# ==============================================================================
+# ARTIMLI YENİDEN DOĞRULAMA (SAYFA ÖNBELLEĞİ VE SÜRÜM FARKI)
+# ==============================================================================
+class PageExtractionCache:
+    """Sayfa içerik özetine göre anahtarlanan, sayfa başına çıkarma sonucunu (metin, göreli span'ler) tutan LRU önbellek."""
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, List[TextSpan]]]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1; return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def put(self, key: str, content: Tuple[str, List[TextSpan]]):
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock: self._entries.clear()
+
+def _text_digest(*texts: Optional[str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for text in texts: digest.update((text or "").encode("utf-8", "surrogatepass") + b"\0")
+    return digest.hexdigest()
+
+@dataclass
+class DocumentRevision:
+    """Bir belge sürümünün, sonraki sürüm artımlı doğrulanırken kullanılan özeti ve sonuçları."""
+    document_key: str
+    page_keys: List[str]
+    section_pages: Dict[str, Tuple[int, int]]
+    section_digests: Dict[str, str]
+    results: Dict[str, ValidationResult]
+    ruleset_version: str = RULESET_VERSION
+    engine: str = "pymupdf"
+    changed_pages: List[int] = field(default_factory=list)
+    revalidated: List[str] = field(default_factory=list)
+    page_scores: List[Dict[str, int]] = field(default_factory=list)
+
+    @classmethod
+    def from_results(cls, document_key: str, results: Dict[str, ValidationResult], engine: str) -> "DocumentRevision":
+        """Sayfa ve bölüm özeti olmayan sürüm (ör. sonuç önbellekten geldiyse); sonraki sürüm bununla tamamen yeniden doğrulanır."""
+        return cls(document_key, [], {}, {}, results, RULESET_VERSION, engine)
+
+class FindingDiff(NamedTuple):
+    """Bir bölümde önceki sürüme göre yeni çıkan ve giderilen bulgular (kural kimliği ve parametreleriyle karşılaştırılır)."""
+    added: List[Finding]
+    resolved: List[Finding]
+
+def _findings(result: Optional[ValidationResult]) -> List[Finding]:
+    # Hatalar önce, öneriler sonra; aynı önem derecesindekiler üretilme sırasında kalır.
+    if result is None: return []
+    return sorted(result.findings, key=lambda f: SEVERITIES.index(f.severity))
+
+def diff_results(old: Dict[str, ValidationResult], new: Dict[str, ValidationResult]) -> Dict[str, FindingDiff]:
+    """İki sürümün bulgularını bölüm bölüm karşılaştırır; yalnızca değişen bölümleri (yeni sonuç sırasıyla) döndürür."""
+    diffs = {}
+    for key in [*new, *(k for k in old if k not in new)]:
+        old_findings, new_findings = _findings(old.get(key)), _findings(new.get(key))
+        old_set, new_set = set(old_findings), set(new_findings)
+        added = [f for f in new_findings if f not in old_set]
+        resolved = [f for f in old_findings if f not in new_set]
+        if added or resolved: diffs[key] = FindingDiff(added, resolved)
+    return diffs
+
+# ==============================================================================
+# AŞAMA ZAMANLAMASI VE METRİK DIŞA AKTARIMI
+# ==============================================================================
+class StageSample(NamedTuple):
+    stage: str
+    seconds: float
+    pages: Optional[int]
+    size: Optional[int]
+
+class _StageSpan:
+    __slots__ = ("_timer", "stage", "pages", "size", "_started")
+
+    def __init__(self, timer: "StageTimer", stage: str, pages: Optional[int], size: Optional[int]):
+        self._timer, self.stage, self.pages, self.size = timer, stage, pages, size
+
+    def set(self, pages: Optional[int] = None, size: Optional[int] = None):
+        if pages is not None: self.pages = pages
+        if size is not None: self.size = size
+
+    def __enter__(self) -> "_StageSpan":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._timer.record(self.stage, time.perf_counter() - self._started, self.pages, self.size)
+        return False
+
+class _NullSpan:
+    """Zamanlama kapalıyken kullanılan, hiçbir şey kaydetmeyen paylaşılan span."""
+    __slots__ = ()
+    def set(self, pages: Optional[int] = None, size: Optional[int] = None): pass
+    def __enter__(self) -> "_NullSpan": return self
+    def __exit__(self, exc_type, exc, tb): return False
+
+NULL_SPAN = _NullSpan()
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    # En yakın sıra yöntemi: örneklerden biri döndürülür, ara değer üretilmez.
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+class StageTimer:
+    """Aşama başına süre, sayfa ve girdi boyutu kaydeden iş parçacığı güvenli ölçer.
+
+    Her aşama için son `window` örnek yüzdelikler (p50/p95) için tutulur; sayaç ve toplamlar süreç ömrü boyunca birikir.
+    `trace()` bloğu içinde aynı iş parçacığındaki örnekler ayrıca o çalıştırmaya ait bir listeye yazılır.
+    """
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._samples: Dict[str, deque] = {}
+        self._totals: Dict[str, List[float]] = {}  # aşama -> [adet, toplam saniye, toplam sayfa, toplam bayt]
+
+    def span(self, stage: str, pages: Optional[int] = None, size: Optional[int] = None) -> _StageSpan:
+        return _StageSpan(self, stage, pages, size)
+
+    def record(self, stage: str, seconds: float, pages: Optional[int] = None, size: Optional[int] = None):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._totals[stage] = [0, 0.0, 0, 0]
+            samples.append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1; totals[1] += seconds; totals[2] += pages or 0; totals[3] += size or 0
+        trace = getattr(self._local, "trace", None)
+        if trace is not None: trace.append(StageSample(stage, seconds, pages, size))
+
+    @contextlib.contextmanager
+    def trace(self) -> Iterator[List[StageSample]]:
+        """Blok süresince bu iş parçacığında kaydedilen örnekleri toplar (ör. tek bir analizin döküm tablosu için)."""
+        previous = getattr(self._local, "trace", None)
+        samples: List[StageSample] = []
+        self._local.trace = samples
+        try:
+            yield samples
+        finally:
+            self._local.trace = previous
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {stage: (sorted(samples), list(self._totals[stage])) for stage, samples in self._samples.items()}
+        return {stage: {"count": int(count), "p50_ms": round(_percentile(values, 0.5) * 1000, 3), "p95_ms": round(_percentile(values, 0.95) * 1000, 3),
+                        "max_ms": round(values[-1] * 1000, 3), "total_seconds": round(seconds, 6), "pages": int(pages), "bytes": int(size)}
+                for stage, (values, (count, seconds, pages, size)) in sorted(snapshot.items())}
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear(); self._totals.clear()
+
+    def to_json(self) -> str:
+        return json.dumps({"generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                           "window": self.window, "stages": self.summary()}, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix: str = "tubitak") -> str:
+        """Prometheus metin biçimi (ör. node_exporter textfile toplayıcısı için)."""
+        lines = [f"# HELP {prefix}_stage_duration_seconds Doğrulama aşamalarının süresi.", f"# TYPE {prefix}_stage_duration_seconds summary"]
+        summary = self.summary()
+        for stage, stats in summary.items():
+            lines.append(f'{prefix}_stage_duration_seconds{{stage="{stage}",quantile="0.5"}} {stats["p50_ms"] / 1000:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds{{stage="{stage}",quantile="0.95"}} {stats["p95_ms"] / 1000:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {stats["total_seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        for metric, field_name, help_text in (("stage_pages_total", "pages", "Aşamalarda işlenen toplam sayfa."),
+                                              ("stage_input_bytes_total", "bytes", "Aşamalara verilen toplam girdi boyutu.")):
+            lines += [f"# HELP {prefix}_{metric} {help_text}", f"# TYPE {prefix}_{metric} counter"]
+            lines += [f'{prefix}_{metric}{{stage="{stage}"}} {stats[field_name]}' for stage, stats in summary.items() if stats[field_name]]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Özeti dosyaya atomik olarak yazar; uzantı `.prom` ise Prometheus metni, değilse JSON üretilir."""
+        payload = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f: f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
+
+# ==============================================================================
+# DERLENMİŞ DÜZENLİ İFADELER VE BAŞLIK BULUCU
+# ==============================================================================
+# Doğrulayıcılar ham desen dizeleri yerine bu önceden derlenmiş nesneleri kullanır.
+_MULTI_SPACE_RE = re.compile(r' +')
+_BLANK_LINES_RE = re.compile(r'(\n\s*){2,}')
+_OGRENCI_ADI_RE = re.compile(r"Adı\s*Soyadı\s*:\s*(.+)", re.IGNORECASE)
+_BASLIK_RE = re.compile(r"Başlığı\s*:\s*(.+)", re.IGNORECASE)
+_DANISMAN_ADI_RE = re.compile(r"Danışmanın\s*Adı\s*Soyadı\s*:\s*(.+)", re.IGNORECASE)
+_KURUM_RE = re.compile(r"Kurum/Kuruluş\s*:\s*(.+)", re.IGNORECASE)
+_ANAHTAR_KELIME_RE = re.compile(r"Anahtar\s*Kelimeler\s*:\s*(.+)", re.IGNORECASE)
+_ANAHTAR_KELIME_SATIRI_RE = re.compile(r"Anahtar\s*Kelimeler\s*:.*", re.IGNORECASE)
+_KELIME_AYRACI_RE = re.compile(r'[,;]')
+_ATIF_RE = re.compile(r'\[\d+(?:,\s*\d+)*\]')
+_ATIF_NUMARA_RE = re.compile(r'\d+')
+_TOKEN_RE = re.compile(r'\S+')
+_NEWLINE_RE = re.compile(r'\n')
+_PROJE_AMACI_RE = re.compile(r"projenin\s*amac(ı|i)", re.IGNORECASE)
+_MADDE_RE = re.compile(r'^\s*[●*-]\s+', re.MULTILINE)
+
+# PyMuPDF span bayraklarında kalın yazıyı gösteren bit (fitz.TEXT_FONT_BOLD).
+_SPAN_FLAG_BOLD = 16
+
+class HeaderCandidate(NamedTuple):
+    """Desenle eşleşen başlık adayı; `standalone` satırında tek başına durduğunu, `first` ilk harfinin konumunu belirtir."""
+    key: str
+    start: int
+    end: int
+    standalone: bool
+    first: int
+
+class HeaderMatcher:
+    """Bölüm başlığı desenlerini adlandırılmış gruplardan oluşan tek bir ifadeye derler ve tüm başlıkları tek geçişte bulur.
+
+    Span bilgisi verilirse, aynı başlığın birden fazla adayı arasından kalın / gövde metninden büyük puntolu ya da kendi
+    satırında tek başına duranlar tercih edilir; böylece gövde metninde satır başına denk gelen "Kaynaklar ..." gibi
+    ifadeler bölüm sınırı sayılmaz.
+    """
+    def __init__(self, patterns: Dict[str, str]):
+        alternatives = "|".join(f"(?P<{key}>{pattern})" for key, pattern in patterns.items())
+        self._regex = re.compile(r"^\s*(?:" + alternatives + ")", re.IGNORECASE | re.MULTILINE)
+
+    def find(self, text: str, spans: Optional[List[TextSpan]] = None) -> List[Tuple[str, int, int]]:
+        """Başlıkları metindeki sıralarıyla `(anahtar, başlangıç, bitiş)` olarak döndürür."""
+        return self.select(self.candidates(text), spans)
+
+    def candidates(self, text: str, pos: int = 0, offset: int = 0) -> List[HeaderCandidate]:
+        """`text[pos:]` içindeki başlık adayları; konumlar `offset` kadar kaydırılır (akışlı yolda yalnızca yeni metin taranır)."""
+        found = []
+        for match in self._regex.finditer(text, pos):
+            start, end = match.span()
+            first = start
+            while first < end and text[first].isspace(): first += 1
+            found.append(HeaderCandidate(match.lastgroup, start + offset, end + offset, self._is_standalone(text, end), first + offset))
+        return found
+
+    def select(self, candidates: List[HeaderCandidate], spans: Optional[List[TextSpan]] = None,
+               sizes: Optional[Counter] = None, starts: Optional[List[int]] = None) -> List[Tuple[str, int, int]]:
+        """Adaylardan bölüm sınırı sayılanları seçer; `sizes` (punto başına karakter) ve `starts` verilmezse span'lerden hesaplanır."""
+        if not candidates: return []
+        if spans:
+            if sizes is None: sizes = span_size_histogram(spans)
+            if starts is None: starts = [s.start for s in spans]
+            body_size = sizes.most_common(1)[0][0]
+            confirmed = [c.standalone or self._is_styled(c.first, spans, starts, body_size) for c in candidates]
+        else:
+            confirmed = [c.standalone for c in candidates]
+        keys_with_confirmed = {c.key for c, ok in zip(candidates, confirmed) if ok}
+        return [(c.key, c.start, c.end) for c, ok in zip(candidates, confirmed) if ok or c.key not in keys_with_confirmed]
+
+    @staticmethod
+    def _is_standalone(text: str, end: int) -> bool:
+        line_end = text.find("\n", end)
+        return not text[end:line_end if line_end != -1 else len(text)].strip(" \t:.-")
+
+    @staticmethod
+    def _is_styled(first: int, spans: List[TextSpan], starts: List[int], body_size: int) -> bool:
+        i = bisect.bisect_right(starts, first) - 1
+        if i < 0: return False
+        span = spans[i]
+        return bool(span.flags & _SPAN_FLAG_BOLD) or "bold" in span.font.lower() or round(span.size) > body_size
+
+def span_size_histogram(spans: Iterable[TextSpan]) -> Counter:
+    """Yuvarlanmış punto başına karakter sayısı; en sık punto gövde metninin puntosudur."""
+    sizes = Counter()
+    for s in spans: sizes[round(s.size)] += s.end - s.start
+    return sizes
+
+# ==============================================================================
+# BELGE DİZİNİ (BÖLÜM BAŞINA BİR KEZ HESAPLANAN METİN YAPISI)
+# ==============================================================================
+class Citation(NamedTuple):
+    offset: int
+    numbers: Tuple[int, ...]
+
+class SectionIndex:
+    """Bir bölüm metninin bir kez çıkarılan yapısı: kelime sayısı, atıflar, madde işaretleri ve satırlar.
+
+    Doğrulayıcılar aynı metni tekrar tekrar bölmek veya aynı düzenli ifadeyi yeniden çalıştırmak yerine bu nesneyi sorgular.
+    Kelime konumları ve satır başları yalnızca istendiğinde hesaplanır.
+    """
+    __slots__ = ("text", "word_count", "citations", "bullet_offsets", "_token_offsets", "_line_starts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.word_count = len(text.split())
+        self.citations = [Citation(m.start(), tuple(int(n) for n in _ATIF_NUMARA_RE.findall(m.group()))) for m in _ATIF_RE.finditer(text)]
+        self.bullet_offsets = [m.start() for m in _MADDE_RE.finditer(text)]
+        self._token_offsets: Optional[List[int]] = None
+        self._line_starts: Optional[List[int]] = None
+
+    @property
+    def token_offsets(self) -> List[int]:
+        if self._token_offsets is None: self._token_offsets = [m.start() for m in _TOKEN_RE.finditer(self.text)]
+        return self._token_offsets
+
+    @property
+    def line_starts(self) -> List[int]:
+        if self._line_starts is None: self._line_starts = [0, *(m.end() for m in _NEWLINE_RE.finditer(self.text))]
+        return self._line_starts
+
+    @property
+    def citation_count(self) -> int:
+        return len(self.citations)
+
+    @property
+    def cited_numbers(self) -> set:
+        return {n for c in self.citations for n in c.numbers}
+
+    @property
+    def reference_numbers(self) -> List[int]:
+        """Kaynak listesi girdileri: tek numaralı `[n]` biçimindeki köşeli parantezler."""
+        return [c.numbers[0] for c in self.citations if len(c.numbers) == 1]
+
+class DocumentIndex:
+    """Belgenin bölüm dizinleri; her bölümün dizini ilk sorgulandığında bir kez oluşturulur ve paylaşılır.
+
+    `table_loader` verilirse bölüm tabloları da (bütçe, iş-zaman çizelgesi) ilk istendiğinde bir kez çıkarılır.
+    """
+    def __init__(self, sections: Dict[str, str], table_loader: Optional[Callable[[str], Optional[list]]] = None):
+        self._texts = sections
+        self._indexes: Dict[str, SectionIndex] = {}
+        self._table_loader = table_loader
+        self._tables: Dict[str, Optional[list]] = {}
+
+    def tables(self, key: str, section_text: str) -> Optional[list]:
+        """Bölümün tablo satırları; tablo bulunamazsa veya metin bu belgenin bölümü değilse None."""
+        if self._table_loader is None or self._texts.get(key) != section_text: return None
+        if key not in self._tables: self._tables[key] = self._table_loader(key) or None
+        return self._tables[key]
+
+    def section(self, key: str) -> SectionIndex:
+        index = self._indexes.get(key)
+        if index is None: index = self._indexes[key] = SectionIndex(self._texts.get(key) or "")
+        return index
+
+    def word_counts(self) -> Dict[str, int]:
+        return {key: self.section(key).word_count for key, text in self._texts.items() if text}
+
+# ==============================================================================
+# ÇOK ANAHTAR KELİMELİ TARAYICI (AHO–CORASICK)
+# ==============================================================================
+_TURKISH_UPPER_I = str.maketrans({"I": "ı", "İ": "i"})
+
+def turkish_casefold(text: str) -> str:
+    """Türkçe'ye duyarlı küçük harfe çevirme: 'I' → 'ı', 'İ' → 'i' (uzunluk korunur, konumlar değişmez)."""
+    return text.translate(_TURKISH_UPPER_I).lower()
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+class KeywordMatches:
+    """Bir taramanın sonucu: her anahtar kelimenin (katlanmış) metindeki başlangıç konumları."""
+    __slots__ = ("text", "positions")
+
+    def __init__(self, text: str, positions: Dict[str, List[int]]):
+        self.text = text
+        self.positions = positions
+
+    def count(self, keyword: str) -> int:
+        return len(self.positions.get(keyword, ()))
+
+    def total(self, keywords: Iterable[str]) -> int:
+        return sum(self.count(k) for k in keywords)
+
+    def contains(self, keyword: str) -> bool:
+        return keyword in self.positions
+
+    def contains_word(self, keyword: str) -> bool:
+        """`\\b` sınırlı eşleşme: anahtar kelimenin önünde ve arkasında harf/rakam olmamalı."""
+        text, length = self.text, len(turkish_casefold(keyword))
+        for start in self.positions.get(keyword, ()):
+            end = start + length
+            if (start == 0 or not _is_word_char(text[start - 1])) and (end >= len(text) or not _is_word_char(text[end])):
+                return True
+        return False
+
+class KeywordScanner:
+    """Tüm kural anahtar kelimelerinden bir kez kurulan Aho–Corasick otomatı.
+
+    Metin tek doğrusal geçişte taranır; maliyet anahtar kelime sayısından bağımsızdır. Eşleştirme, Türkçe'ye duyarlı
+    küçük harfe çevrilmiş metin üzerinde alt dize olarak yapılır (iç içe ve çakışan eşleşmeler dahil).
+    """
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[str, int], ...]] = [()]
+        for keyword in dict.fromkeys(keywords):
+            folded = turkish_casefold(keyword)
+            if not folded: continue
+            state = 0
+            for ch in folded:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({}); self._fail.append(0); self._out.append(())
+                state = nxt
+            self._out[state] += ((keyword, len(folded)),)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]: f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if state else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> KeywordMatches:
+        folded = turkish_casefold(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        positions: Dict[str, List[int]] = {}
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]: state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for keyword, length in out[state]:
+                    positions.setdefault(keyword, []).append(i - length + 1)
+        return KeywordMatches(folded, positions)
+
+# ==============================================================================
+# TÜRKÇE TUTAR AYRIŞTIRMA VE BİÇİMLENDİRME (LOCALE'DEN BAĞIMSIZ)
+# ==============================================================================
+# `locale.setlocale` süreç genelinde durum değiştirdiği ve kapsayıcılarda tr_TR yerel ayarı bulunmayabildiği için
+# tutarlar burada, iş parçacığı ve süreç güvenli saf fonksiyonlarla ayrıştırılır.
+_SAYI = r"\d{1,3}(?:[ \u00a0\u202f.]\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)*"
+_TUTAR_RE = re.compile(r"₺\s*(?P<once>" + _SAYI + r")|(?P<sonra>" + _SAYI + r")\s*(?:tl|₺|try)(?!\w)", re.IGNORECASE)
+_SATIR_SAYI_RE = re.compile(_SAYI)
+_BOSLUK_AYRACI_RE = re.compile(r"[ \u00a0\u202f]")
+
+def _amount_text(line: str, match: "re.Match") -> str:
+    """Eşleşen tutarın metni. Düz boşlukla iki gruba ayrılmış sayı, kalem satırında miktarla tutarın yan yana yazılmış hali
+    olabilir ("Kimyasal 3 200 TL" = 3 adet, 200 TL). Boşluk binlik ayracı yalnızca ₺ ön eki, ondalık kısım veya sıfırla
+    başlayan son grup ("9 000") varsa ya da sayı satırın (hücrenin) ilk sözcüğüyse kabul edilir; aksi halde son grup alınır.
+    """
+    name = match.lastgroup or 0
+    number, start = match.group(name), match.start(name)
+    groups = number.split(" ")
+    if len(groups) != 2 or name == "once" or "," in number or groups[1].startswith("0") or not line[:start].strip():
+        return number
+    return groups[1]
+
+def parse_turkish_amount(raw: str) -> float:
+    """"9.000,00", "9 000", "9000", "9,5" gibi Türkçe yazılmış bir tutarı sayıya çevirir; okunamazsa ValueError fırlatır.
+
+    Hem nokta hem virgül varsa sondaki ondalık ayracıdır. Tek virgül ondalık, tek nokta ardından tam üç hane geliyorsa
+    binlik ayracı kabul edilir; birden fazla tekrar eden ayraç her zaman binlik ayracıdır.
+    """
+    value = _BOSLUK_AYRACI_RE.sub("", raw.strip().replace("₺", "").upper().replace("TL", "")).strip()
+    if not value or not any(ch.isdigit() for ch in value):
+        raise ValueError(f"'{raw}' bir tutar değil")
+    if "," in value and "." in value:
+        decimal = "," if value.rfind(",") > value.rfind(".") else "."
+        thousands = "." if decimal == "," else ","
+        value = value.replace(thousands, "").replace(decimal, ".")
+    elif "," in value:
+        value = value.replace(",", "") if value.count(",") > 1 else value.replace(",", ".")
+    elif "." in value:
+        integer, _, fraction = value.rpartition(".")
+        if value.count(".") > 1 or len(fraction) == 3: value = value.replace(".", "")
+    return float(value)
+
+def format_turkish_amount(amount: float, currency: str = "TL") -> str:
+    """Tutarı Türkçe biçimde yazar: 9000.0 -> "9.000,00 TL"."""
+    text = f"{amount:,.2f}".replace(",", "\0").replace(".", ",").replace("\0", ".")
+    return f"{text} {currency}" if currency else text
+
+class BudgetTotal(NamedTuple):
+    total: float
+    source: str  # "toplam_satiri" | "kalem_toplami" | "yok"
+    line_items: Tuple[float, ...]
+
+def extract_budget_total(section_text: str) -> BudgetTotal:
+    """Bütçe tablosundan toplamı satır satır çıkarır.
+
+    Tutarı olan "toplam" satırları (varsa "genel toplam") açık toplam kabul edilir ve satırdaki son tutar alınır;
+    yalnızca sütun başlığı olarak geçen "Toplam" (tutarsız satır) yok sayılır. Açık toplam yoksa her kalem satırındaki
+    son TL tutarı (birim fiyat değil satır toplamı) toplanır.
+    """
+    explicit: List[Tuple[bool, float]] = []
+    items: List[float] = []
+    for line in section_text.splitlines():
+        folded = turkish_casefold(line)
+        currency_matches = list(_TUTAR_RE.finditer(line))
+        if "toplam" in folded:
+            # Toplam satırında miktar sütunu yoktur; boşlukla gruplanmış sayı olduğu gibi okunur.
+            tail = line[folded.index("toplam"):]
+            amounts = [m.group("once") or m.group("sonra") for m in currency_matches] or _SATIR_SAYI_RE.findall(tail)
+            if amounts: explicit.append(("genel toplam" in folded, parse_turkish_amount(amounts[-1])))
+        elif currency_matches:
+            items.append(parse_turkish_amount(_amount_text(line, currency_matches[-1])))
+    if explicit:
+        grand = [amount for is_grand, amount in explicit if is_grand]
+        return BudgetTotal(grand[-1] if grand else explicit[-1][1], "toplam_satiri", tuple(items))
+    if items:
+        return BudgetTotal(sum(items), "kalem_toplami", tuple(items))
+    return BudgetTotal(0.0, "yok", ())
+
+# ==============================================================================
+# TABLO ÇIKARMA (BÜTÇE VE İŞ-ZAMAN ÇİZELGESİ, YALNIZCA İLGİLİ SAYFALAR)
+# ==============================================================================
+class BudgetRow(NamedTuple):
+    """Bütçe tablosunun bir satırı: kalem adı ve satırın toplam tutarı (okunamadıysa None)."""
+    item: str
+    amount: Optional[float]
+    is_total: bool = False
+
+class WorkPackageRow(NamedTuple):
+    """İş-zaman çizelgesinin bir satırı: iş paketi numarası, adı ve (başlangıç, bitiş) ayı."""
+    package: str
+    title: str
+    months: Optional[Tuple[int, int]]
+
+class SectionRegion(NamedTuple):
+    """Bölümün PDF'teki yeri: ilk ve son sayfa, bölüm başlığı ve (varsa) son sayfadaki bir sonraki başlığın satırı."""
+    first_page: int
+    last_page: int
+    header: str
+    next_header: Optional[str]
+
+_IP_RE = re.compile(r"[İI]P\s*-?\s*(\d+)", re.IGNORECASE)
+_AY_ARALIGI_RE = re.compile(r"(\d{1,2})\s*\.?\s*(?:[-–—]|ile)\s*(\d{1,2})|(\d{1,2})")
+
+def find_section_tables(pdf: PdfInput, region: SectionRegion) -> List[List[List[Optional[str]]]]:
+    """Yalnızca bölümün sayfalarında (ilk/son sayfada bölüm sınırlarına kırpılarak) PyMuPDF tablo tespiti çalıştırır."""
+    tables = []
+    with open_pdf(pdf) as doc:
+        for page_no in range(region.first_page, min(region.last_page, len(doc) - 1) + 1):
+            page = doc[page_no]
+            clip = fitz.Rect(page.rect)
+            # Başlık satırları kırpma alanına dahil edilir: tablo başlığın hemen altından başlayıp
+            # sonraki başlığa bitişik bitebilir; çizgisiz başlık metni tabloya karışmaz.
+            if page_no == region.first_page:
+                found = page.search_for(region.header)
+                if found: clip.y0 = found[0].y0
+            if page_no == region.last_page and region.next_header:
+                below = [r for r in page.search_for(region.next_header) if r.y0 > clip.y0]
+                if below: clip.y1 = below[0].y1
+            # Çizgi stratejisi vektör çizim ister; çizimsiz sayfada pahalı tespit hiç çalıştırılmaz.
+            if clip.is_empty or not any(clip.intersects(d["rect"]) for d in page.get_cdrawings()): continue
+            tables.extend(table.extract() for table in page.find_tables(clip=clip).tables)
+    return tables
+
+def _cell(value: Optional[str]) -> str:
+    return " ".join((value or "").split())
+
+def _column(header: List[str], *needles: str) -> Optional[int]:
+    for needle in needles:
+        for i in range(len(header) - 1, -1, -1):
+            if needle in header[i]: return i
+    return None
+
+def _try_amount(text: str) -> Optional[float]:
+    match = _TUTAR_RE.search(text) or _SATIR_SAYI_RE.search(text)
+    if match is None: return None
+    try: return parse_turkish_amount(_amount_text(text, match))
+    except ValueError: return None
+
+def parse_budget_rows(tables: List[List[List[Optional[str]]]]) -> List[BudgetRow]:
+    """Bütçe tablolarını satırlara çevirir. Tutar sütunu başlıktaki "Toplam"/"Tutar" sütunudur (yoksa son sütun);
+    birim fiyat sütunu böylece toplama karışmaz. Sayfa sonunda bölünen tablonun başlıksız devamı aynı sütunlarla okunur.
+    """
+    rows: List[BudgetRow] = []
+    amount_col = item_col = None
+    for table in tables:
+        cells = [[_cell(c) for c in row] for row in table if any(row)]
+        if not cells: continue
+        header = [turkish_casefold(c) for c in cells[0]]
+        found = _column(header, "toplam", "tutar", "bütçe miktarı", "tl")
+        if found is not None and _try_amount(cells[0][found]) is None:
+            amount_col, item_col = found, _column(header, "kalem", "malzeme", "tür", "açıklama", "ad") or 0
+            cells = cells[1:]
+        elif amount_col is None:
+            continue  # Başlığı bütçe tablosuna benzemeyen ve önceki bir bütçe tablosunun devamı olmayan tablo.
+        for row in cells:
+            if amount_col >= len(row): continue
+            labels = [c for i, c in enumerate(row) if i != amount_col and c]
+            folded = turkish_casefold(" ".join(labels))
+            is_total = folded.startswith(("toplam", "genel toplam"))
+            item = row[item_col] if item_col < len(row) and row[item_col] else (labels[0] if labels else "")
+            amount = _try_amount(row[amount_col])
+            if not item and amount is None: continue
+            rows.append(BudgetRow(item, amount, is_total and amount is not None))
+    return rows
+
+def _parse_months(text: str) -> Optional[Tuple[int, int]]:
+    match = _AY_ARALIGI_RE.search(text)
+    if match is None: return None
+    if match.group(3): return int(match.group(3)), int(match.group(3))
+    return int(match.group(1)), int(match.group(2))
+
+def parse_work_plan_rows(tables: List[List[List[Optional[str]]]]) -> List[WorkPackageRow]:
+    """İş-zaman çizelgesi tablolarını satırlara çevirir; iş paketi numarası olmayan satırlar (başlıklar) atlanır."""
+    rows: List[WorkPackageRow] = []
+    package_col = title_col = months_col = None
+    for table in tables:
+        cells = [[_cell(c) for c in row] for row in table if any(row)]
+        if not cells: continue
+        header = [turkish_casefold(c) for c in cells[0]]
+        months_found = _column(header, "zaman", "ay")
+        if months_found is not None and not _IP_RE.search(" ".join(cells[0])):
+            months_col = months_found
+            package_col = _column(header, "ip no", "no", "ip") or 0
+            title_col = _column(header, "adı", "ad", "iş paket", "tanım")
+            if title_col in (None, package_col): title_col = package_col + 1
+            cells = cells[1:]
+        elif months_col is None:
+            continue
+        for row in cells:
+            package_match = _IP_RE.search(" ".join(row[:max(package_col, title_col) + 1]))
+            if package_match is None: continue
+            title = row[title_col] if title_col < len(row) else ""
+            if title_col == package_col or not title: title = _IP_RE.sub("", title or row[package_col]).strip()
+            months = _parse_months(row[months_col]) if months_col < len(row) else None
+            rows.append(WorkPackageRow(f"İP{package_match.group(1)}", title, months))
+    return rows
+
+# ==============================================================================
+# ANA DOĞRULAYICI SINIFI (MANTIKSAL HATALAR DÜZELTİLDİ)
+# ==============================================================================
+class TubitakFormValidator:
+    def __init__(self, extraction_engine: str = "pymupdf", result_cache: Optional[ResultCache] = None,
+                 parallel_workers: int = 0, parallel_page_threshold: int = PARALLEL_PAGE_THRESHOLD,
+                 format_sampling: Optional[FormatSampling] = None, timer: Optional[StageTimer] = None,
+                 page_cache: Optional[PageExtractionCache] = None):
+        # Varsayılan motor PyMuPDF; pdfplumber yalnızca açıkça istenirse (veya PyMuPDF yoksa) kullanılır.
+        if extraction_engine == "pymupdf" and not PYMUPDF_AVAILABLE and PDFPLUMBER_AVAILABLE: extraction_engine = "pdfplumber"
+        self.extraction_engine = extraction_engine
+        self.result_cache = result_cache
+        # parallel_workers >= 2 ise uzun belgeler sayfa aralıklarına bölünüp paylaşılan bir süreç havuzunda çıkarılır. Doğrudan
+        # API'ye (`extract_document` / `validate_document`) yöneliktir; arayüz ve komut satırı belge düzeyinde paralellik kullanır.
+        self.parallel_workers = parallel_workers
+        self.parallel_page_threshold = parallel_page_threshold
+        self._extraction_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.format_sampling = format_sampling or FormatSampling()
+        # Aşama zamanlaması isteğe bağlıdır; verilmezse her aşama paylaşılan boş span'i kullanır.
+        self.timer = timer
+        # Artımlı doğrulamada sayfa çıkarma sonuçları içerik özetine göre bu önbellekten alınır.
+        self.page_cache = page_cache
+
+        self.MAIN_PATTERNS = {
+            "genel_bilgiler": r"A\.\s*GENEL\s*BİLGİLER", "ozet": r"ÖZET", "ozgun_deger": r"1\.\s*ÖZGÜN\s*DEĞER",
+            "amac_ve_hedefler": r"1\.2\.\s*Amaç\s*ve\s*Hedefler", "yontem": r"2\.\s*YÖNTEM",
+            "is_zaman_cizelgesi": r"İŞ-ZAMAN\s*ÇİZELGESİ", "risk_yonetimi": r"RİSK\s*YÖNETİMİ\s*TABLOSU",
+            "arastirma_olanaklari": r"3\.3\.\s*Araştırma\s*Olanakları", "yaygin_etki": r"4\.\s*YAYGIN\s*ETKİ",
+            "butce": r"5\.\s*BÜTÇE\s*TALEP\s*ÇİZELGESİ", "diger_konular": r"6\.\s*BELİRTMEK\s*İSTEDİĞİNİZ\s*DİĞER\s*KONULAR",
+            "kaynaklar": r"(?:EK-1\s*:\s*)?KAYNAKLAR", "ekler": r"7\.\s*EKLER"
+        }
+        self.REQUIRED_SECTIONS = [
+            "genel_bilgiler", "ozet", "ozgun_deger", "amac_ve_hedefler", 
+            "yontem", "is_zaman_cizelgesi", "risk_yonetimi", "yaygin_etki", "butce", "kaynaklar"
+        ]
+        # Doğrulaması başka bölümlerin metnine de bakan bölümler (ör. atıf-kaynak çapraz kontrolü).
+        self.SECTION_DEPENDENCIES = {"kaynaklar": ("ozgun_deger",)}
+        self.MAX_BUDGET = 9000.0
+        self.MAX_PROJECT_MONTHS = 12
+        self.BANNED_BUDGET_ITEMS = ["tablet", "bilgisayar", "yazıcı", "telefon", "hard disk", "harici disk", "fotoğraf makinesi", "kamera", "monitör"]
+        self.BANNED_WORK_PACKAGES = ["literatür tarama", "malzeme temini", "rapor yazımı", "makale yazımı", "hazırlık"]
+        self.OUTPUT_KEYWORDS = ["makale", "bildiri", "konferans", "tez", "patent"]
+        self.PROJECT_TYPE_KEYWORDS = {
+            "Fen/Mühendislik": ["dft", "vasp", "simülasyon", "deney", "matlab", "algoritma", "yazılım", "prototip", "malzeme", "kimyasal", "teori"],
+            "Sağlık Bilimleri": ["hasta", "hücre", "klinik", "tedavi", "genetik", "biyolojik", "ilaç", "sağlık", "prevalans"],
+            "Sosyal Bilimler": ["anket", "katılımcı", "nitel", "nicel", "görüşme", "sosyal", "ekonomik", "algı", "tutum", "spss"],
+        }
+        # Anahtar kelime kuralları tek bir otomatı paylaşır; yeni kelime eklemek tarama maliyetini artırmaz.
+        self.keyword_scanner = KeywordScanner([
+            *self.BANNED_BUDGET_ITEMS, *self.BANNED_WORK_PACKAGES, *self.OUTPUT_KEYWORDS, "b planı",
+            *(k for keywords in self.PROJECT_TYPE_KEYWORDS.values() for k in keywords),
+        ])
+        self.header_matcher = HeaderMatcher(self.MAIN_PATTERNS)
+
+    def _span(self, stage: str, pages: Optional[int] = None, size: Optional[int] = None):
+        return self.timer.span(stage, pages, size) if self.timer is not None else NULL_SPAN
+
+    def _normalize_text(self, text: str) -> str:
+        text = text.replace('-\n', '')
+        text = _MULTI_SPACE_RE.sub(' ', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+        return text
+
+    def extract_document(self, pdf_bytes: PdfInput) -> ExtractedDocument:
+        """Tek çıkarma aşaması: metin, span format bilgisi ve sayfa sınırları birlikte üretilir."""
+        if self.extraction_engine == "pdfplumber":
+            if not PDFPLUMBER_AVAILABLE: raise ImportError("`pdfplumber` kütüphanesi gerekli.")
+            extractor = extract_document_pdfplumber
+        else:
+            if not PYMUPDF_AVAILABLE: raise ImportError("`PyMuPDF` kütüphanesi gerekli.")
+            extractor = lambda data: extract_document_pymupdf(data, self._get_extraction_pool(), self.parallel_workers, self.parallel_page_threshold)
+        try:
+            with self._span(f"extract.{self.extraction_engine}", size=len(pdf_bytes)) as span:
+                document = extractor(pdf_bytes)
+                span.set(pages=document.page_count)
+            document.source = pdf_bytes
+            return document
+        except Exception as e:
+            raise DocumentValidationError(f"PDF'ten metin çıkarılırken hata oluştu: {e}") from e
+
+    def _get_extraction_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.parallel_workers < 2: return None
+        with self._pool_lock:
+            if self._extraction_pool is None:
+                # Streamlit gibi çok iş parçacıklı süreçlerde fork güvenli olmadığından "spawn" kullanılır.
+                self._extraction_pool = ProcessPoolExecutor(max_workers=self.parallel_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._extraction_pool
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._extraction_pool is not None:
+                self._extraction_pool.shutdown(wait=False, cancel_futures=True)
+                self._extraction_pool = None
+
+    def extract_page_count(self, pdf_bytes: PdfInput) -> int:
+        if not PYMUPDF_AVAILABLE: raise ImportError("`PyMuPDF` kütüphanesi gerekli.")
+        with open_pdf(pdf_bytes) as doc:
+            return len(doc)
+
+    def extract_text_from_pdf_bytes(self, pdf_bytes: PdfInput) -> str:
+        return self.extract_document(pdf_bytes).text
+
+    def parse_document_sections(self, text: str, spans: Optional[List[TextSpan]] = None) -> Dict[str, str]:
+        return self._split_sections(text, spans)[0]
+
+    def _split_sections(self, text: str, spans: Optional[List[TextSpan]] = None,
+                        normalized: Optional[Dict[Tuple[int, int], str]] = None) -> Tuple[Dict[str, str], List[Tuple[str, int, int, int]]]:
+        """Bölüm metinlerini ve her bölümün özgün metindeki `(anahtar, başlık başı, içerik başı, içerik sonu)` sınırlarını döndürür.
+
+        Başlıklar özgün metin üzerinde aranır ve yine özgün metinden kesilir; böylece konumlar (ve span'ler) birbirini tutar.
+        Normalizasyon her bölümün içeriğine ayrıca uygulanır. `normalized` verilirse `(içerik başı, içerik sonu)` aralığı
+        daha önce normalize edilmiş bölümler yeniden işlenmez.
+        """
+        with self._span("sections.headers", size=len(text)):
+            found_headers = self.header_matcher.find(text, spans)
+        with self._span("sections.normalize", size=len(text)):
+            return self._sections_from_headers(text, found_headers, len(text), normalized)
+
+    def _sections_from_headers(self, text: Union[str, Callable[[], str]], found_headers: List[Tuple[str, int, int]], length: int,
+                               normalized: Optional[Dict[Tuple[int, int], str]] = None,
+                               open_last: bool = False) -> Tuple[Dict[str, str], List[Tuple[str, int, int, int]]]:
+        """Başlık konumlarından bölüm metinlerini keser. `text` çağrılabilir ise tam metin yalnızca önbellekte olmayan bir bölüm
+        normalize edilirken istenir. `open_last` açıksa son bölüm henüz büyüdüğünden normalize edilmez (boş bırakılır)."""
+        sections = {key: "" for key in self.MAIN_PATTERNS.keys()}
+        bounds = []
+        for i, (key, header_start, content_start) in enumerate(found_headers):
+            content_end = found_headers[i + 1][1] if i + 1 < len(found_headers) else length
+            bounds.append((key, header_start, content_start, content_end))
+            if open_last and i + 1 == len(found_headers):
+                sections[key] = ""; continue
+            section = normalized.get((content_start, content_end)) if normalized is not None else None
+            if section is None:
+                if callable(text): text = text()
+                section = self._normalize_text(text[content_start:content_end]).strip()
+                if normalized is not None: normalized[content_start, content_end] = section
+            sections[key] = section
+        return sections, bounds
+
+    def _create_result(self, section_name: str) -> ValidationResult:
+        return ValidationResult(section_name=section_name.replace("_", " ").title())
+
+    def _get_field(self, text: str, pattern: "re.Pattern") -> Optional[str]:
+        match = pattern.search(text)
+        return match.group(1).strip() if match and match.group(1) else None
+
+    # --- BÖLÜM BAZLI DOĞRULAMA FONKSİYONLARI (DÜZELTİLDİ) ---
+
+    def _section_index(self, section_key: str, section_text: str, index: Optional[DocumentIndex]) -> SectionIndex:
+        if index is not None:
+            section_index = index.section(section_key)
+            if section_index.text == section_text: return section_index
+        return SectionIndex(section_text)
+
+    def _table_loader(self, pdf: Optional[PdfInput], text: str, page_offsets: List[int],
+                      bounds: List[Tuple[str, int, int, int]]) -> Optional[Callable[[str], Optional[list]]]:
+        """Bütçe ve iş-zaman tablolarını ilk istendiğinde, başlık konumlarından bulunan sayfalarda çıkaran yükleyici."""
+        if pdf is None or not PYMUPDF_AVAILABLE: return None
+        parsers = {"butce": parse_budget_rows, "is_zaman_cizelgesi": parse_work_plan_rows}
+        # Aynı başlık iki kez geçtiyse bölüm metni gibi sonuncusu geçerlidir.
+        positions = {key: i for i, (key, *_) in enumerate(bounds)}
+        page_of = lambda offset: max(bisect.bisect_right(page_offsets, offset) - 1, 0)
+        first_line = lambda start, end: (text[start:end].strip().splitlines() or [""])[0].strip()
+
+        def load(key: str) -> Optional[list]:
+            if key not in parsers or key not in positions: return None
+            i = positions[key]
+            _, header_start, content_start, content_end = bounds[i]
+            next_header = first_line(bounds[i + 1][1], bounds[i + 1][2]) if i + 1 < len(bounds) else None
+            region = SectionRegion(page_of(header_start), page_of(max(content_end - 1, content_start)), first_line(header_start, content_start), next_header)
+            with self._span(f"tables.{key}", pages=region.last_page - region.first_page + 1):
+                try:
+                    return parsers[key](find_section_tables(pdf, region))
+                except Exception:
+                    return None  # Tablo okunamazsa doğrulayıcılar metin tabanlı yönteme döner.
+        return load
+
+    def validate_genel_bilgiler(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Genel Bilgiler")
+        ogrenci_adi = self._get_field(section_text, _OGRENCI_ADI_RE)
+        if not ogrenci_adi: result.add("genel_bilgiler.ogrenci_adi_eksik")
+        elif len(ogrenci_adi.split()) not in [2, 3]: result.add("genel_bilgiler.ogrenci_adi_kelime_sayisi", ad=ogrenci_adi)
+        
+        baslik = self._get_field(section_text, _BASLIK_RE)
+        if not baslik or len(baslik.split()) < 3: result.add("genel_bilgiler.baslik_eksik")
+
+        danisman_adi = self._get_field(section_text, _DANISMAN_ADI_RE)
+        if not danisman_adi: result.add("genel_bilgiler.danisman_adi_eksik")
+        elif len(danisman_adi.split()) > 4: result.add("genel_bilgiler.birden_fazla_danisman", ad=danisman_adi)
+        
+        kurum_adi = self._get_field(section_text, _KURUM_RE)
+        if not kurum_adi: result.add("genel_bilgiler.kurum_eksik")
+        else:
+            if "üniversitesi" not in kurum_adi.lower(): result.add("genel_bilgiler.kurum_universite_yok")
+            for ifade in ["fakülte", "enstitü", "yüksekokul", "bölüm"]:
+                if ifade in kurum_adi.lower(): result.add("genel_bilgiler.kurum_alt_birim", ifade=ifade)
+        return result
+
+    def validate_ozet(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Özet")
+        section_index = self._section_index("ozet", section_text, index)
+        anahtar_kelime_match = _ANAHTAR_KELIME_RE.search(section_text)
+        # "Anahtar Kelimeler: ..." satırı hariç kelime sayısı; satırın önüne bitişik kelime parçası kelime olarak kalır.
+        kelime_sayisi = section_index.word_count
+        for m in _ANAHTAR_KELIME_SATIRI_RE.finditer(section_text):
+            kelime_sayisi -= len(m.group().split()) - (1 if m.start() > 0 and not section_text[m.start() - 1].isspace() else 0)
+
+        if kelime_sayisi < 75 or kelime_sayisi > 250:
+            result.add("ozet.kelime_sayisi", kelime=kelime_sayisi)
+        
+        if not anahtar_kelime_match:
+            result.add("ozet.anahtar_kelime_eksik")
+        else:
+            kelimeler = [k.strip() for k in _KELIME_AYRACI_RE.split(anahtar_kelime_match.group(1)) if k.strip()]
+            if len(kelimeler) < 3 or len(kelimeler) > 5:
+                result.add("ozet.anahtar_kelime_sayisi", sayi=len(kelimeler))
+        return result
+
+    def validate_ozgun_deger(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Özgün Değer")
+        section_index = self._section_index("ozgun_deger", section_text, index)
+        kelime_sayisi = section_index.word_count
+        if kelime_sayisi < 250:
+            result.add("ozgun_deger.kisa", kelime=kelime_sayisi)
+        
+        atif_sayisi = section_index.citation_count
+        if atif_sayisi < 5:
+            result.add("ozgun_deger.az_atif", atif=atif_sayisi)
+
+        result.add("ozgun_deger.ozgunluk_ifadeleri")
+        return result
+
+    def validate_amac_ve_hedefler(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Amaç ve Hedefler")
+        if not _PROJE_AMACI_RE.search(section_text):
+            result.add("amac_ve_hedefler.amac_ifadesi_yok")
+        
+        madde_sayisi = len(self._section_index("amac_ve_hedefler", section_text, index).bullet_offsets)
+        if madde_sayisi < 3:
+            result.add("amac_ve_hedefler.az_hedef", madde=madde_sayisi)
+        return result
+
+    def validate_yontem(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Yöntem")
+        section_index = self._section_index("yontem", section_text, index)
+        kelime_sayisi = section_index.word_count
+        if kelime_sayisi < 200:
+            result.add("yontem.kisa", kelime=kelime_sayisi)
+        
+        if section_index.citation_count == 0:
+            result.add("yontem.atif_yok")
+
+        result.add("yontem.teori_yazilim_standart")
+        return result
+
+    def validate_is_zaman_cizelgesi(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("İş-Zaman Çizelgesi")
+        # Tablo okunabildiyse yalnızca iş paketi adları taranır (başarı ölçütü gibi sütunlardaki ifadeler iş paketi değildir).
+        rows: Optional[List[WorkPackageRow]] = index.tables("is_zaman_cizelgesi", section_text) if index is not None else None
+        matches = self.keyword_scanner.scan("\n".join(row.title for row in rows) if rows else section_text)
+        for ifade in self.BANNED_WORK_PACKAGES:
+            if matches.contains(ifade):
+                result.add("is_zaman_cizelgesi.yasakli_is_paketi", ifade=ifade)
+        for row in rows or ():
+            if row.months is None: continue
+            start, end = row.months
+            if start > end:
+                result.add("is_zaman_cizelgesi.ters_ay_araligi", paket=row.package, baslangic=start, bitis=end)
+            elif end > self.MAX_PROJECT_MONTHS:
+                result.add("is_zaman_cizelgesi.sure_asimi", paket=row.package, bitis=end, azami=self.MAX_PROJECT_MONTHS)
+        return result
+
+    def validate_risk_yonetimi(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Risk Yönetimi")
+        if not self.keyword_scanner.scan(section_text).contains("b planı"):
+            result.add("risk_yonetimi.b_plani_yok")
+        if self._section_index("risk_yonetimi", section_text, index).word_count < 20:
+             result.add("risk_yonetimi.kisa")
+        return result
+
+    def validate_yaygin_etki(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Yaygin Etki")
+        if self._section_index("yaygin_etki", section_text, index).word_count < 15:
+            result.add("yaygin_etki.kisa")
+        matches = self.keyword_scanner.scan(section_text)
+        if not any(matches.contains(keyword) for keyword in self.OUTPUT_KEYWORDS):
+            result.add("yaygin_etki.cikti_belirtilmemis")
+        return result
+
+    def validate_kaynaklar(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Kaynaklar")
+        kaynak_numaralari = self._section_index("kaynaklar", section_text, index).reference_numbers
+        kaynak_sayisi = len(kaynak_numaralari)
+        if kaynak_sayisi < 3:
+            result.add("kaynaklar.az_kaynak", kaynak=kaynak_sayisi)
+        if index is not None and kaynak_numaralari:
+            eksik = sorted(index.section("ozgun_deger").cited_numbers - set(kaynak_numaralari))
+            if eksik:
+                result.add("kaynaklar.eksik_kaynak", numaralar=tuple(eksik))
+        return result
+
+    def validate_formatting(self, document: ExtractedDocument, project_scores: Optional[Dict[str, int]] = None) -> ValidationResult:
+        result = self._create_result("Genel Format ve Biçim")
+        if not PYMUPDF_AVAILABLE:
+            result.add("format.pymupdf_yok")
+            return result
+        try:
+            if document.page_count > 20:
+                result.add("format.sayfa_siniri", sayfa=document.page_count)
+
+            histogram = build_format_histogram(document, self.format_sampling)
+            if not histogram.span_count:
+                result.add("format.metin_katmani_yok")
+            else:
+                dominant_size = histogram.dominant_size
+                dominant_font = histogram.dominant_font
+                if dominant_size != 9: result.add("format.punto", punto=dominant_size)
+                if "arial" not in dominant_font and "helvetica" not in dominant_font: result.add("format.yazi_tipi", yazi_tipi=dominant_font)
+                result.add("format.dominant_format", yazi_tipi=dominant_font, punto=dominant_size, incelenen=histogram.pages_seen,
+                           sayfa=document.page_count, guven=histogram.confidence() * 100)
+        except Exception as e:
+            result.add("format.analiz_hatasi", hata=str(e))
+
+        # Proje Tipi Tespiti
+        project_type = self._detect_project_type(document.text, project_scores)
+        if project_type:
+            result.add("format.proje_tipi", tip=project_type)
+        return result
+
+    def validate_butce(self, section_text: str, index: Optional[DocumentIndex] = None) -> ValidationResult:
+        result = self._create_result("Bütçe")
+        rows: Optional[List[BudgetRow]] = index.tables("butce", section_text) if index is not None else None
+        try:
+            if rows:
+                # Tablo satırlarından: açık TOPLAM satırı varsa o, yoksa kalem satırlarının tutarları toplanır.
+                totals = [row.amount for row in rows if row.is_total]
+                items = [row.amount for row in rows if not row.is_total and row.amount is not None]
+                total_budget = totals[-1] if totals else sum(items)
+                if totals and items and abs(totals[-1] - sum(items)) >= 1:
+                    result.add("butce.toplam_uyusmazligi", toplam=totals[-1], kalemler=sum(items))
+            else:
+                total_budget = extract_budget_total(section_text).total
+            if not total_budget:
+                result.add("butce.toplam_bulunamadi")
+            elif total_budget > self.MAX_BUDGET:
+                result.add("butce.limit_asimi", toplam=total_budget, limit=self.MAX_BUDGET)
+        except ValueError as e:
+            result.add("butce.sayilar_okunamadi", hata=str(e))
+        matches = self.keyword_scanner.scan(section_text)
+        for item in self.BANNED_BUDGET_ITEMS:
+            if matches.contains_word(item):
+                result.add("butce.yasakli_kalem", kalem=item)
+        return result
+
+    def _project_type_scores(self, text: str) -> Dict[str, int]:
+        # Anahtar kelimeler satır sonu içermediğinden sayfa sayfa hesaplanan puanların toplamı tüm metnin puanına eşittir.
+        matches = self.keyword_scanner.scan(text)
+        return {project_type: matches.total(keywords) for project_type, keywords in self.PROJECT_TYPE_KEYWORDS.items()}
+
+    def _detect_project_type(self, text: str, scores: Optional[Dict[str, int]] = None) -> Optional[str]:
+        if scores is None: scores = self._project_type_scores(text)
+        if sum(scores.values()) < 5: return None
+        return max(scores, key=scores.get)
+
+    def render_page_image(self, pdf_bytes: PdfInput, page_no: int, zoom: float = 0.8, image_format: str = "png",
+                          highlight_sections: Optional[Dict[str, str]] = None) -> bytes:
+        """Tek bir sayfayı düşük çözünürlüklü görüntü olarak çizer (önizleme için).
+
+        `highlight_sections` verilirse ({bölüm anahtarı: "error" | "warning"}), bu sayfada bulunan ilgili bölüm
+        başlıkları renkli bir çerçeveyle işaretlenir. "webp" biçimi Pillow kuruluysa kullanılır, değilse PNG üretilir.
+        """
+        if not PYMUPDF_AVAILABLE: raise ImportError("`PyMuPDF` kütüphanesi gerekli.")
+        with open_pdf(pdf_bytes) as doc:
+            page = doc[page_no]
+            if highlight_sections:
+                page_text, _ = _extract_page_content(page, page_no)
+                for key, start, end in self.header_matcher.find(page_text):
+                    severity = highlight_sections.get(key)
+                    if severity is None: continue
+                    color = (0.86, 0.15, 0.15) if severity == "error" else (1.0, 0.6, 0.0)
+                    for rect in page.search_for(page_text[start:end].strip()):
+                        page.draw_rect(rect + (-3, -2, 3, 2), color=color, width=1.5)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        if image_format == "webp":
+            try:
+                from PIL import Image
+                buffer = BytesIO()
+                Image.frombytes("RGB", (pix.width, pix.height), pix.samples).save(buffer, "WEBP", quality=70)
+                return buffer.getvalue()
+            except ImportError:
+                pass
+        return pix.tobytes("png")
+
+    def validate_document(self, pdf_bytes: PdfInput) -> Dict[str, ValidationResult]:
+        """Belgeyi doğrular; analiz edilemeyen belgeler için `DocumentValidationError` fırlatır."""
+        if self.result_cache is None: return self._validate_document(pdf_bytes)
+        cache_key = document_cache_key(pdf_bytes, RULESET_VERSION, self.extraction_engine)
+        with self._span("cache.lookup", size=len(pdf_bytes)):
+            results = self.result_cache.get(cache_key)
+        if results is None:
+            results = self._validate_document(pdf_bytes)
+            self.result_cache.put(cache_key, results)
+        return results
+
+    def iter_validate_document(self, pdf_bytes: PdfInput, on_revision: Optional[Callable[[DocumentRevision], None]] = None) -> Iterator[Tuple[str, ValidationResult]]:
+        """`validate_document`ın akışlı sürümü: her bölümün sonucunu metni hazır olur olmaz `(anahtar, sonuç)` olarak üretir.
+
+        Sayfalar sırayla çıkarılır; bir bölümden sonra yeni bir başlık görüldüğünde o bölüm tamamlanmış sayılır ve
+        belgenin geri kalanı beklenmeden doğrulanır. Aynı anahtar daha sonra yeniden üretilirse (ör. başlık belgede
+        ikinci kez geçtiyse) yeni sonuç öncekinin yerine geçer. Üretilen son değerler `validate_document` ile aynıdır.
+        `on_revision` verilirse bitişte belgenin sürüm özeti verilir (sonraki sürüm `iter_validate_revision` ile doğrulanabilir).
+        """
+        cache_key = document_cache_key(pdf_bytes, RULESET_VERSION, self.extraction_engine)
+        cached = self.result_cache.get(cache_key) if self.result_cache is not None else None
+        if cached is not None:
+            yield from cached.items()
+            if on_revision is not None: on_revision(DocumentRevision.from_results(cache_key, cached, self.extraction_engine))
+            return
+        if self.extraction_engine != "pymupdf":
+            if on_revision is not None:
+                yield from self.iter_validate_revision(pdf_bytes, None, on_revision); return
+            results = self._validate_document(pdf_bytes)
+            if self.result_cache is not None: self.result_cache.put(cache_key, results)
+            yield from results.items(); return
+
+        results: Dict[str, ValidationResult] = {}
+        for key, result in self._iter_validate_pages(pdf_bytes, cache_key if on_revision is not None else None, on_revision):
+            results[key] = result
+            yield key, result
+        if self.result_cache is not None: self.result_cache.put(cache_key, self._ordered_results(results))
+
+    def _iter_validate_pages(self, pdf_bytes: PdfInput, document_key: Optional[str] = None,
+                             on_revision: Optional[Callable[[DocumentRevision], None]] = None) -> Iterator[Tuple[str, ValidationResult]]:
+        # Her sayfadan sonra yalnızca yeni metin başlık için taranır. Sonraki başlığı görülen bölümlerin normalize metni
+        # saklanır; büyüyen son bölüm belge bitene kadar normalize edilmez. Böylece toplam iş sayfa sayısıyla doğrusal kalır.
+        # Her bölüm için doğrulamada kullanılan metinler (bağımlı bölümler dahil) saklanır; değişmeyen bölüm yeniden doğrulanmaz.
+        validated: Dict[str, tuple] = {}
+        normalized: Dict[Tuple[int, int], str] = {}
+        candidates: List[HeaderCandidate] = []
+        texts: List[str] = []
+        spans: List[TextSpan] = []
+        starts: List[int] = []
+        sizes = Counter()
+        page_offsets: List[int] = []
+        # Sürüm özeti istenirse sayfa özetleri ve sayfa başına proje tipi puanları sayfalar geldikçe toplanır.
+        page_keys: Optional[List[str]] = [] if on_revision is not None else None
+        page_scores: List[Dict[str, int]] = []
+        results: Dict[str, ValidationResult] = {}
+        pos = 0
+        pages = _iter_page_contents(pdf_bytes, page_keys, self.page_cache)
+        while True:
+            with self._span("extract.page", pages=1):
+                page = next(pages, None)
+            if page is None: break
+            page_text, page_spans = page
+            # Başlık sayfa sınırını aşabileceğinden önceki sayfa da yeniden taranır; o sayfadaki adaylar yeniden bulunur.
+            window_start = page_offsets[-1] if page_offsets else 0
+            while candidates and candidates[-1].start >= window_start: candidates.pop()
+            texts.append(page_text)
+            spans.extend(page_spans)
+            starts.extend(s.start for s in page_spans)
+            sizes.update(span_size_histogram(page_spans))
+            page_offsets.append(pos)
+            pos += len(page_text) + 1
+            if page_keys is not None: page_scores.append(self._project_type_scores(page_text))
+            scan_from = max(window_start, candidates[-1].end if candidates else 0)
+            candidates.extend(self.header_matcher.candidates("\n".join(texts[-2:]), scan_from - window_start, window_start))
+
+            full_text = lambda: "\n".join(texts)
+            found_headers = self.header_matcher.select(candidates, spans, sizes, starts)
+            sections, bounds = self._sections_from_headers(full_text, found_headers, pos - 1, normalized, open_last=True)
+            growing_key = bounds[-1][0] if bounds else None
+            index = None
+            for key in self._section_validators():
+                if growing_key in (key, *self.SECTION_DEPENDENCIES.get(key, ())): continue
+                inputs = self._section_inputs(key, sections)
+                if not sections.get(key) or validated.get(key) == inputs: continue
+                if index is None:
+                    text = full_text()
+                    index = DocumentIndex(sections, self._table_loader(pdf_bytes, text, page_offsets, bounds))
+                validated[key] = inputs
+                results[key] = self._validate_section(key, sections[key], index)
+                yield key, results[key]
+
+        document = _assemble_document([(texts, spans)])
+        if not document.text:
+            raise DocumentValidationError("PDF dosyasından metin alınamadı. Dosyanın bozuk olmadığını veya metin tabanlı olduğunu kontrol edin.")
+        project_scores = {project_type: sum(scores[project_type] for scores in page_scores) for project_type in self.PROJECT_TYPE_KEYWORDS} if page_keys else None
+        with self._span("validate.format", document.page_count, len(document.text)):
+            results["format"] = self.validate_formatting(document, project_scores)
+        yield "format", results["format"]
+        # Son bölümler tam metin üzerinde yeniden bulunur (sonuçlar `validate_document` ile aynı kalır); normalize edilmiş
+        # bölümler yeniden işlenmez.
+        sections, bounds = self._split_sections(document.text, document.spans, normalized)
+        index = DocumentIndex(sections, self._table_loader(pdf_bytes, document.text, document.page_offsets, bounds))
+        for key in self._section_validators():
+            if validated.get(key) == self._section_inputs(key, sections): continue
+            result = self._validate_section(key, sections.get(key), index)
+            if result is None: continue
+            results[key] = result
+            yield key, result
+        if on_revision is not None:
+            section_pages, digests = self._section_layout(document, sections, bounds)
+            on_revision(DocumentRevision(document_key, page_keys, section_pages, digests, self._ordered_results(results), RULESET_VERSION,
+                                         self.extraction_engine, list(range(document.page_count)), list(self._section_validators()), page_scores))
+
+    def iter_validate_revision(self, pdf_bytes: PdfInput, previous: Optional[DocumentRevision] = None,
+                               on_revision: Optional[Callable[[DocumentRevision], None]] = None) -> Iterator[Tuple[str, ValidationResult]]:
+        """Aynı belgenin önceki sürümüne (`previous`) göre artımlı doğrulama; `iter_validate_document` gibi sonuç üretir.
+
+        Sayfalar içerik özetiyle sayfa önbelleğinden alınır. Metni (ve bağımlı olduğu bölümlerin metni) değişmeyen
+        bölümlerin önceki sonuçları hemen üretilir, yalnızca değişenler yeniden doğrulanır. Bitince yeni sürümün özeti
+        `on_revision`a verilir; bir sonraki yüklemede `previous` olarak kullanılabilir.
+        """
+        document_key = document_cache_key(pdf_bytes, RULESET_VERSION, self.extraction_engine)
+        if previous is not None and (previous.ruleset_version != RULESET_VERSION or previous.engine != self.extraction_engine): previous = None
+        if previous is not None and previous.document_key == document_key:
+            yield from previous.results.items()
+            if on_revision is not None: on_revision(previous)
+            return
+        if previous is None and self.extraction_engine == "pymupdf":
+            # Karşılaştırılacak sürüm yoksa sonuçlar akışlı yoldan sayfa sayfa gelir; sürüm özeti yol boyunca toplanır.
+            yield from self.iter_validate_document(pdf_bytes, on_revision); return
+
+        if self.extraction_engine == "pymupdf":
+            with self._span("extract.incremental", size=len(pdf_bytes)) as span:
+                document, page_keys = extract_document_incremental(pdf_bytes, self.page_cache)
+                span.set(pages=document.page_count)
+        else:
+            document, page_keys = self.extract_document(pdf_bytes), []
+        if not document.text:
+            raise DocumentValidationError("PDF dosyasından metin alınamadı. Dosyanın bozuk olmadığını veya metin tabanlı olduğunu kontrol edin.")
+
+        sections, bounds = self._split_sections(document.text, document.spans if document.engine == "pymupdf" else None)
+        section_pages, digests = self._section_layout(document, sections, bounds)
+        old_scores = dict(zip(previous.page_keys, previous.page_scores)) if previous is not None else {}
+        changed_pages = [page_no for page_no, key in enumerate(page_keys) if key not in old_scores] if page_keys else list(range(document.page_count))
+        # Proje tipi puanları sayfa başına tutulur; yalnızca değişen sayfalar yeniden taranır.
+        page_scores = [old_scores[key] if key in old_scores else self._project_type_scores(document.page_text(page_no)) for page_no, key in enumerate(page_keys)]
+        project_scores = {project_type: sum(scores[project_type] for scores in page_scores) for project_type in self.PROJECT_TYPE_KEYWORDS} if page_keys else None
+
+        results: Dict[str, ValidationResult] = {}
+        stale: List[str] = []
+        for key in self._section_validators():
+            if previous is not None and previous.section_digests.get(key) == digests[key] and key in previous.results:
+                results[key] = previous.results[key]
+                yield key, results[key]
+            else:
+                stale.append(key)
+        with self._span("validate.format", document.page_count, len(document.text)):
+            results["format"] = self.validate_formatting(document, project_scores)
+        yield "format", results["format"]
+        index = DocumentIndex(sections, self._table_loader(pdf_bytes, document.text, document.page_offsets, bounds))
+        for key in stale:
+            result = self._validate_section(key, sections.get(key), index)
+            if result is None: continue
+            results[key] = result
+            yield key, result
+
+        results = self._ordered_results(results)
+        if self.result_cache is not None: self.result_cache.put(document_key, results)
+        if on_revision is not None:
+            on_revision(DocumentRevision(document_key, page_keys, section_pages, digests, results, RULESET_VERSION, self.extraction_engine,
+                                         changed_pages, stale, page_scores))
+
+    def _section_layout(self, document: ExtractedDocument, sections: Dict[str, str],
+                        bounds: List[Tuple[str, int, int, int]]) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, str]]:
+        """Sürüm özeti için bölümlerin sayfa aralıkları ve doğrulama girdilerinin (bağımlı bölümler dahil) özetleri."""
+        # Bölüm sınırları sayfa aralıklarına çevrilir (aynı başlık iki kez geçtiyse sonuncusu geçerlidir, bölüm metni gibi).
+        page_of = lambda offset: max(bisect.bisect_right(document.page_offsets, offset) - 1, 0)
+        section_pages = {key: (page_of(start), page_of(max(end - 1, start))) for key, _, start, end in bounds}
+        digests = {key: _text_digest(*self._section_inputs(key, sections)) for key in self._section_validators()}
+        return section_pages, digests
+
+    def _section_inputs(self, section_key: str, sections: Dict[str, str]) -> tuple:
+        return tuple(sections.get(key) for key in (section_key, *self.SECTION_DEPENDENCIES.get(section_key, ())))
+
+    def result_keys(self) -> List[str]:
+        """Sonuç sözlüğündeki anahtarların gösterim sırası."""
+        return ["format", *self._section_validators()]
+
+    def _ordered_results(self, results: Dict[str, ValidationResult]) -> Dict[str, ValidationResult]:
+        return {key: results[key] for key in self.result_keys() if key in results}
+
+    def _validate_document(self, pdf_bytes: PdfInput) -> Dict[str, ValidationResult]:
+        with self._span("document", size=len(pdf_bytes)) as span:
+            document = self.extract_document(pdf_bytes)
+            span.set(pages=document.page_count)
+            return self.validate_extracted(document)
+
+    def _section_validators(self) -> Dict[str, Callable[[str, Optional[DocumentIndex]], ValidationResult]]:
+        return {
+            "genel_bilgiler": self.validate_genel_bilgiler, "ozet": self.validate_ozet, "ozgun_deger": self.validate_ozgun_deger,
+            "amac_ve_hedefler": self.validate_amac_ve_hedefler, "yontem": self.validate_yontem, "is_zaman_cizelgesi": self.validate_is_zaman_cizelgesi,
+            "risk_yonetimi": self.validate_risk_yonetimi, "yaygin_etki": self.validate_yaygin_etki, "butce": self.validate_butce, "kaynaklar": self.validate_kaynaklar
+        }
+
+    def _validate_section(self, section_key: str, section_text: Optional[str], index: Optional[DocumentIndex] = None) -> Optional[ValidationResult]:
+        if section_key in self.REQUIRED_SECTIONS and not section_text:
+            pattern_str = self.MAIN_PATTERNS.get(section_key, "Bilinmeyen Desen")
+            result = self._create_result(section_key)
+            result.add("belge.bolum_eksik", desen=pattern_str)
+            return result
+        if section_text:
+            with self._span(f"validate.{section_key}", size=len(section_text)):
+                return self._section_validators()[section_key](section_text, index)
+        return None
+
+    def validate_extracted(self, document: ExtractedDocument) -> Dict[str, ValidationResult]:
+        full_text = document.text
+        if not full_text:
+            raise DocumentValidationError("PDF dosyasından metin alınamadı. Dosyanın bozuk olmadığını veya metin tabanlı olduğunu kontrol edin.")
+
+        sections, bounds = self._split_sections(full_text, document.spans if document.engine == "pymupdf" else None)
+        index = DocumentIndex(sections, self._table_loader(document.source, full_text, document.page_offsets, bounds))
+        results = {}
+
+        # Önce Genel Format'ı kontrol et
+        with self._span("validate.format", document.page_count, len(document.text)):
+            results["format"] = self.validate_formatting(document)
+
+        # Her bölüm için ilgili doğrulama fonksiyonunu çalıştır
+        for section_key in self._section_validators():
+            result = self._validate_section(section_key, sections.get(section_key), index)
+            if result is not None: results[section_key] = result
+
+        return results
+
+# ==============================================================================
+# SÜREÇ HAVUZU İŞÇİSİ (KOMUT SATIRI VE HTTP SERVİSİ)
+# ==============================================================================
+_pool_validator: Optional[TubitakFormValidator] = None
+
+def init_pool_worker(extraction_engine: str = "pymupdf", format_sampling: Optional[FormatSampling] = None, collect_stages: bool = False):
+    """`ProcessPoolExecutor` başlatıcısı: işçi başına bir doğrulayıcı kurar ve PDF kütüphanelerini yükler
+    (yönetici süreçte önceden yüklendiyse ve işçi fork ile başladıysa maliyetsizdir)."""
+    global _pool_validator
+    _pool_validator = TubitakFormValidator(extraction_engine=extraction_engine, format_sampling=format_sampling,
+                                           timer=StageTimer(window=1) if collect_stages else None)
+    preload_pdf_libraries(extraction_engine)
+
+def validate_record(pdf: Union[PdfInput, str], timeout: Optional[float] = None, extraction_engine: str = "pymupdf") -> Dict:
+    """Tek bir belgeyi doğrular; her durumda (hata ve zaman aşımı dahil) bir kayıt sözlüğü döndürür.
+
+    `pdf` dosya yolu olabilir; dosya belleğe okunmaz, PyMuPDF onu mmap üzerinden kopyasız açar. Uzun ömürlü havuz
+    işçisinde eşleme ve dosya tanıtıcısı çöp toplayıcıyı beklemeden belge bitince kapatılır.
+    """
+    validator = _pool_validator or TubitakFormValidator(extraction_engine=extraction_engine)
+    record = {"status": "ok", "error": None, "pages": None, "bytes": None, "results": None, "timings": {}}
+    started = time.perf_counter()
+    # Aşama örnekleri kayda eklenir; yönetici süreç bunları tek bir StageTimer'da birleştirir.
+    trace = validator.timer.trace() if validator.timer is not None else contextlib.nullcontext()
+    source = PdfSource.from_path(pdf) if isinstance(pdf, str) else contextlib.nullcontext(pdf)
+    stages = None
+    try:
+        with trace as stages, document_deadline(timeout), source as pdf_bytes:
+            record["bytes"] = len(pdf_bytes)
+            t0 = time.perf_counter()
+            document = validator.extract_document(pdf_bytes)
+            t1 = time.perf_counter()
+            results = validator.validate_extracted(document)
+            t2 = time.perf_counter()
+        record["pages"] = document.page_count
+        record["results"] = {key: result.to_dict() for key, result in results.items()}
+        record["timings"] = {"read": round(t0 - started, 4), "extract": round(t1 - t0, 4), "validate": round(t2 - t1, 4)}
+    except DocumentTimeout:
+        record.update(status="timeout", error=f"Belge {timeout:g} saniyelik süre sınırını aştı.")
+    except DocumentValidationError as e:
+        record.update(status="error", error=str(e))
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["timings"]["total"] = round(time.perf_counter() - started, 4)
+    if stages is not None: record["timings"]["stages"] = [list(sample) for sample in stages]
+    return record
+
+# ==============================================================================
+# PAYLAŞILAN YÜRÜTÜCÜ (KABUL DENETİMİ VE YALITILMIŞ ALT SÜREÇ)
+# ==============================================================================
+class AdmissionQueue:
+    """Aynı anda en fazla `limit` işe izin veren, gelen sırayla (FIFO) kabul eden süreç geneli kuyruk."""
+    def __init__(self, limit: int):
+        self.limit = max(limit, 1)
+        self._cond = threading.Condition()
+        self._waiting: deque = deque()
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    @contextlib.contextmanager
+    def slot(self, on_wait: Optional[Callable[[int], None]] = None, poll: float = 0.5):
+        """Sıra gelene kadar bekler. Beklerken sıradaki yer değiştikçe `on_wait(yer)` çağrılır (1 = sıradaki)."""
+        ticket = object()
+        last_position = None
+        with self._cond: self._waiting.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    if self._waiting[0] is ticket and self._active < self.limit:
+                        self._waiting.popleft(); self._active += 1
+                        break
+                    position = self._waiting.index(ticket) + 1
+                    if position == last_position: self._cond.wait(poll)
+                # Geri çağırma (ör. arayüz güncellemesi) kilit dışında yapılır.
+                if position != last_position:
+                    last_position = position
+                    if on_wait is not None: on_wait(position)
+        except BaseException:
+            with self._cond:
+                if ticket in self._waiting: self._waiting.remove(ticket)
+                self._cond.notify_all()
+            raise
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+def _isolated_worker_main(conn, extraction_engine: str, format_sampling: FormatSampling, collect_stages: bool, page_cache_entries: int = 0):
+    """Alt süreç döngüsü: bağlantıdan gelen her belgeyi doğrular ve sonuçları üretildikçe geri yazar.
+
+    İş `(pdf_bytes, önceki sürüm, sürüm özeti istendi mi)` biçimindedir; önceki sürüm varsa artımlı yol, yoksa akışlı yol
+    kullanılır (sürüm özeti istendiyse bitişte gönderilir).
+    PDF kütüphaneleri ilk iş beklenirken yüklenir; önceden başlatılan (`warm_up`) süreçte ilk belge bu maliyeti ödemez.
+    """
+    preload_pdf_libraries(extraction_engine)
+    validator = TubitakFormValidator(extraction_engine=extraction_engine, format_sampling=format_sampling,
+                                     timer=StageTimer(window=1) if collect_stages else None,
+                                     page_cache=PageExtractionCache(page_cache_entries) if page_cache_entries else None)
+    on_revision = lambda revision: conn.send(("revision", revision))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None: return
+        pdf_bytes, previous, want_revision = job
+        try:
+            trace = validator.timer.trace() if collect_stages else contextlib.nullcontext()
+            with trace as stages:
+                if previous is not None: results = validator.iter_validate_revision(pdf_bytes, previous, on_revision if want_revision else None)
+                else: results = validator.iter_validate_document(pdf_bytes, on_revision if want_revision else None)
+                for key, result in results:
+                    conn.send(("result", key, result))
+            conn.send(("done", [tuple(sample) for sample in stages or ()]))
+        except MemoryError:
+            conn.send(("memory", None))
+        except DocumentValidationError as e:
+            conn.send(("error", str(e)))
+        except Exception as e:
+            conn.send(("error", f"Belge analiz edilirken beklenmeyen bir hata oluştu: {type(e).__name__}: {e}"))
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+class _IsolatedWorker:
+    """Belgeleri sırayla doğrulayan, gerektiğinde öldürülüp yenisiyle değiştirilen alt süreç."""
+    def __init__(self, context, args: tuple):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_isolated_worker_main, args=(child_conn, *args), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def rss_bytes(self) -> Optional[int]:
+        # Yalnızca Linux'ta (/proc) ölçülebilir; diğer platformlarda bellek sınırı uygulanmaz. Dosya destekli sayfalar
+        # (mmap ile okunan PDF, paylaşılan kütüphaneler) çekirdek tarafından geri alınabildiğinden sınıra sayılmaz.
+        try:
+            with open(f"/proc/{self.process.pid}/statm") as f: fields = f.read().split()
+            return (int(fields[1]) - int(fields[2])) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def kill(self):
+        self.conn.close()
+        if self.process.is_alive(): self.process.kill()
+        self.process.join(1)
+
+    def close(self):
+        try: self.conn.send(None)
+        except OSError: pass
+        self.conn.close()
+        self.process.join(1)
+        if self.process.is_alive(): self.process.kill()
+
+class ValidationExecutor:
+    """Oturumlar arasında paylaşılan, eşzamanlılığı sınırlı doğrulama yürütücüsü.
+
+    En fazla `max_concurrent` belge aynı anda işlenir; diğerleri sırayla bekler. `isolate` açıkken belgeler yeniden
+    kullanılan alt süreçlerde doğrulanır; süre (`time_limit`) sınırını aşan alt süreç öldürülür ve yerine yenisi başlatılır.
+    `memory_limit_mb` yumuşak bir sınırdır: alt sürecin yerleşik belleği `MEMORY_POLL_SECONDS` aralıklarla ölçülür ve
+    sınırın üzerinde görülürse süreç öldürülür; iki ölçüm arasındaki kısa tepeler fark edilmeyebilir. Sonuçlar yine bölüm
+    bölüm akar; sonuç önbelleği ve aşama zamanlayıcısı `validator`dan alınır.
+    """
+    MEMORY_POLL_SECONDS = 0.25
+
+    def __init__(self, validator: "TubitakFormValidator", max_concurrent: int = 2, time_limit: Optional[float] = 120.0,
+                 memory_limit_mb: Optional[int] = 1024, isolate: bool = True, max_jobs_per_worker: int = 50, max_revisions: int = 64):
+        self.validator = validator
+        self.admission = AdmissionQueue(max_concurrent)
+        self.time_limit = time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.isolate = isolate
+        self.max_jobs_per_worker = max_jobs_per_worker
+        # Streamlit çok iş parçacıklı olduğundan alt süreçler fork ile değil "spawn" ile başlatılır.
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: List[_IsolatedWorker] = []
+        self._idle_lock = threading.Lock()
+        # Sonuç önbelleğinden gelen belgelerin sürüm özetleri; önbellek isabetinde de `on_revision` gerçek özeti alır.
+        self._revisions: "OrderedDict[str, DocumentRevision]" = OrderedDict()
+        self._revisions_lock = threading.Lock()
+        self.max_revisions = max_revisions
+
+    def warm_up(self, workers: Optional[int] = None) -> int:
+        """Alt süreçleri ilk belge gelmeden başlatıp boşta bekletir (varsayılan: `max_concurrent` kadar); süreçler PDF
+        kütüphanelerini açılışta yükler. Yalıtım kapalıysa kütüphaneler bu süreçte arka planda yüklenir. Başlatılan süreç sayısını döndürür.
+        """
+        if not self.isolate:
+            threading.Thread(target=preload_pdf_libraries, args=(self.validator.extraction_engine,), daemon=True).start()
+            return 0
+        with self._idle_lock: missing = (workers or self.admission.limit) - len(self._idle)
+        started = [self._spawn_worker() for _ in range(max(missing, 0))]
+        with self._idle_lock: self._idle.extend(started)
+        return len(started)
+
+    def iter_validate(self, pdf_bytes: PdfInput, on_queue: Optional[Callable[[int], None]] = None, previous: Optional[DocumentRevision] = None,
+                      on_revision: Optional[Callable[[DocumentRevision], None]] = None) -> Iterator[Tuple[str, ValidationResult]]:
+        """`iter_validate_document` gibi sonuç üretir. Beklerken `on_queue(sıra)`, işleme başlarken `on_queue(0)` çağrılır.
+
+        Sonuç önbelleğindeki belgeler sıraya girmeden döner. `previous` verilirse belge o sürüme göre artımlı doğrulanır
+        (`iter_validate_revision`), verilmezse akışlı yol kullanılır. `on_revision` verilirse yeni sürüm özeti ona verilir.
+        """
+        validator = self.validator
+        cache_key = document_cache_key(pdf_bytes, RULESET_VERSION, validator.extraction_engine)
+        cached = validator.result_cache.get(cache_key) if validator.result_cache is not None else None
+        if cached is not None:
+            yield from cached.items()
+            if on_revision is not None: on_revision(self._cached_revision(cache_key, cached, previous))
+            return
+        if on_revision is not None: on_revision = self._remember_revision(on_revision)
+        with self.admission.slot(on_queue):
+            if on_queue is not None: on_queue(0)
+            if not self.isolate:
+                if previous is not None: yield from validator.iter_validate_revision(pdf_bytes, previous, on_revision)
+                else: yield from validator.iter_validate_document(pdf_bytes, on_revision)
+                return
+            results: Dict[str, ValidationResult] = {}
+            for key, result in self._run_isolated(pdf_bytes, previous, on_revision):
+                results[key] = result
+                yield key, result
+        if validator.result_cache is not None: validator.result_cache.put(cache_key, validator._ordered_results(results))
+
+    def _cached_revision(self, cache_key: str, results: Dict[str, ValidationResult], previous: Optional[DocumentRevision]) -> DocumentRevision:
+        if previous is not None and previous.document_key == cache_key: return previous
+        with self._revisions_lock:
+            revision = self._revisions.get(cache_key)
+            if revision is not None: self._revisions.move_to_end(cache_key)
+        if revision is not None:
+            # Sonuçlar önbellekten geldiğinden hiçbir bölüm yeniden doğrulanmadı; değişen sayfalar `previous`a göre verilir.
+            old_pages = set(previous.page_keys) if previous is not None else set()
+            return replace(revision, changed_pages=[page_no for page_no, key in enumerate(revision.page_keys) if key not in old_pages], revalidated=[])
+        # Özet saklanmadıysa (ör. sonuç disk önbelleğinden geldiyse) yalnızca sonuçlardan oluşan özet verilir.
+        return DocumentRevision.from_results(cache_key, results, self.validator.extraction_engine)
+
+    def _remember_revision(self, on_revision: Callable[[DocumentRevision], None]) -> Callable[[DocumentRevision], None]:
+        def remember(revision: DocumentRevision):
+            with self._revisions_lock:
+                self._revisions[revision.document_key] = revision
+                self._revisions.move_to_end(revision.document_key)
+                while len(self._revisions) > self.max_revisions: self._revisions.popitem(last=False)
+            on_revision(revision)
+        return remember
+
+    def _acquire_worker(self) -> _IsolatedWorker:
+        with self._idle_lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive(): return worker
+                worker.kill()
+        return self._spawn_worker()
+
+    def _spawn_worker(self) -> _IsolatedWorker:
+        validator = self.validator
+        page_cache_entries = validator.page_cache.max_entries if validator.page_cache is not None else 0
+        return _IsolatedWorker(self._context, (validator.extraction_engine, validator.format_sampling, validator.timer is not None, page_cache_entries))
+
+    def _release_worker(self, worker: _IsolatedWorker):
+        if worker.jobs >= self.max_jobs_per_worker:
+            worker.close(); return
+        with self._idle_lock: self._idle.append(worker)
+
+    def _run_isolated(self, pdf_bytes: PdfInput, previous: Optional[DocumentRevision] = None,
+                      on_revision: Optional[Callable[[DocumentRevision], None]] = None) -> Iterator[Tuple[str, ValidationResult]]:
+        worker = self._acquire_worker()
+        worker.jobs += 1
+        memory_limit = self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb else None
+        deadline = time.monotonic() + self.time_limit if self.time_limit else None
+        reusable = False
+        try:
+            worker.conn.send((pdf_bytes, previous, on_revision is not None))
+            while True:
+                remaining = deadline - time.monotonic() if deadline is not None else self.MEMORY_POLL_SECONDS
+                if remaining <= 0:
+                    raise DocumentLimitExceeded(f"Belge analizi {self.time_limit:g} saniyelik süre sınırını aştı ve durduruldu.")
+                if not worker.conn.poll(min(remaining, self.MEMORY_POLL_SECONDS)):
+                    rss = worker.rss_bytes() if memory_limit else None
+                    if rss is not None and rss > memory_limit:
+                        raise DocumentLimitExceeded(self._memory_message())
+                    continue
+                try:
+                    message = worker.conn.recv()
+                except EOFError:
+                    worker.process.join(1)
+                    raise DocumentLimitExceeded(self._death_message(worker.process.exitcode))
+                kind = message[0]
+                if kind == "result":
+                    yield message[1], message[2]
+                elif kind == "revision":
+                    on_revision(message[1])
+                elif kind == "done":
+                    if self.validator.timer is not None:
+                        for sample in message[1]: self.validator.timer.record(*sample)
+                    reusable = True
+                    return
+                elif kind == "memory":
+                    raise DocumentLimitExceeded(self._memory_message())
+                else:
+                    reusable = True
+                    raise DocumentValidationError(message[1])
+        finally:
+            # Yarıda kalan (süre/bellek aşımı, çökme veya okuyucunun vazgeçmesi) alt süreç yeniden kullanılmaz.
+            if reusable: self._release_worker(worker)
+            else: worker.kill()
+
+    def _memory_message(self) -> str:
+        if not self.memory_limit_mb: return "Belge analizi sırasında bellek yetersiz kaldı ve analiz durduruldu."
+        return (f"Belge analizi yaklaşık {self.memory_limit_mb:g} MB bellek sınırını aştı ve durduruldu "
+                f"(yerleşik bellek {self.MEMORY_POLL_SECONDS:g} saniyede bir ölçülür).")
+
+    def _death_message(self, exitcode: Optional[int]) -> str:
+        if exitcode is not None and exitcode < 0:
+            return f"Belge analizi sırasında alt süreç {-exitcode} numaralı sinyalle sonlandı (bellek yetersiz kalmış veya PDF bozuk olabilir)."
+        return f"Belge analizi sırasında alt süreç beklenmedik şekilde sonlandı (çıkış kodu: {exitcode})."
+
+    def shutdown(self):
+        with self._idle_lock:
+            workers, self._idle = self._idle, []
+        for worker in workers: worker.close()